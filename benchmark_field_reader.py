@@ -0,0 +1,119 @@
+"""Benchmark do leitor de campos (foam_field).
+
+Gera um volVectorField sintético em ASCII, binário e compactado (.gz) e mede
+a taxa de leitura do internalField, comparando com a leitura ingênua por split().
+
+    python benchmark_field_reader.py --cells 2000000
+"""
+import argparse
+import gzip
+import io
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import foam_field
+
+HEADER = """FoamFile
+{{
+    format      {format};
+    arch        "LSB;label=32;scalar=64";
+    class       volVectorField;
+    object      U;
+}}
+// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //
+
+dimensions      [0 1 -1 0 0 0 0];
+
+internalField   nonuniform List<vector>
+{count}
+("""
+
+FOOTER = b""")
+;
+
+boundaryField
+{
+    walls
+    {
+        type            noSlip;
+    }
+}
+"""
+
+
+def write_field(path, values, fmt, compress=False):
+    buffer = io.BytesIO()
+    buffer.write(HEADER.format(format=fmt, count=len(values)).encode())
+    if fmt == "binary":
+        # No formato binário os dados começam logo após o '('
+        buffer.write(values.astype("<f8").tobytes())
+    else:
+        buffer.write(b"\n")
+        np.savetxt(buffer, values, fmt="(%.10g %.10g %.10g)")
+    buffer.write(FOOTER)
+    data = buffer.getvalue()
+    if compress:
+        path += ".gz"
+        with gzip.open(path, "wb", compresslevel=1) as f:
+            f.write(data)
+    else:
+        with open(path, "wb") as f:
+            f.write(data)
+    return path, len(data)
+
+
+def naive_read(path):
+    """Leitura linha a linha, como era feito para o cloudProperties."""
+    with open(path, "r") as f:
+        lines = f.read().split("\n")
+    start = next(i for i, line in enumerate(lines) if line.startswith("internalField")) + 3
+    count = int(lines[start - 2])
+    return np.array([line.strip("()").split() for line in lines[start:start + count]], dtype=float)
+
+
+def best_time(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cells", type=int, default=2_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--naive", action="store_true", help="inclui a leitura ingênua (lenta) do ASCII")
+    args = parser.parse_args()
+
+    values = np.random.default_rng(0).normal(size=(args.cells, 3))
+    with tempfile.TemporaryDirectory() as folder:
+        cases = [
+            ("ascii", "ascii", False),
+            ("binary (mmap)", "binary", False),
+            ("ascii .gz", "ascii", True),
+            ("binary .gz", "binary", True),
+        ]
+        print(f"{args.cells} células (vector), melhor de {args.repeat}")
+        print(f"{'formato':<16}{'MB':>10}{'s':>10}{'MB/s':>10}{'Mcel/s':>10}")
+        for label, fmt, compress in cases:
+            path, size = write_field(os.path.join(folder, f"U_{fmt}"), values, fmt, compress)
+            result = foam_field.read_field(path)["values"]
+            assert result.shape == values.shape and np.allclose(result, values)
+            # A soma obriga a percorrer os dados: a view sobre o mmap sozinha não lê o arquivo
+            seconds = best_time(lambda: foam_field.read_field(path)["values"].sum(), args.repeat)
+            # Taxa sobre o tamanho descompactado, que é o volume de dados interpretado
+            print(f"{label:<16}{size / 1e6:>10.1f}{seconds:>10.3f}{size / 1e6 / seconds:>10.0f}"
+                  f"{args.cells / 1e6 / seconds:>10.1f}")
+            if args.naive and fmt == "ascii" and not compress:
+                seconds = best_time(lambda: naive_read(path), 1)
+                print(f"{'ascii (split)':<16}{size / 1e6:>10.1f}{seconds:>10.3f}{size / 1e6 / seconds:>10.0f}"
+                      f"{args.cells / 1e6 / seconds:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
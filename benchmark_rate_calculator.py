@@ -0,0 +1,66 @@
+"""Benchmark do calculador de Δy em lote (rate_calculator).
+
+Varre uma grade de (d, n, m, dy_in_0, dy_wall_0) com calculate_increase_rate_grid e compara
+com a chamada escalar (calculate_increase_rate) em laço, medida numa amostra e extrapolada.
+
+    python benchmark_rate_calculator.py --points 16     # 16^5 = 1.048.576 combinações
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+import rate_calculator
+
+
+def grid_axes(points):
+    """Faixas usuais de projeto de malha do jato (em torno do caso padrão da interface)."""
+    return (np.linspace(0.05, 0.2, points),      # d
+            np.linspace(5, 50, points),          # n
+            np.linspace(2, 20, points),          # m
+            np.linspace(0.0005, 0.005, points),  # dy_in_0
+            np.linspace(0.002, 0.02, points))    # dy_wall_0
+
+
+def scalar_loop(results):
+    """Laço com a versão escalar; combinações inválidas levantam exceção e são contadas."""
+    invalid = 0
+    for row in results:
+        try:
+            rate_calculator.calculate_increase_rate(*(float(row[name]) for name in rate_calculator.INPUTS))
+        except (ValueError, ZeroDivisionError, OverflowError):
+            invalid += 1
+    return invalid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=16, help="valores por parâmetro (combinações = points^5)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sample", type=int, default=20000, help="combinações medidas no laço escalar")
+    args = parser.parse_args()
+
+    axes = grid_axes(args.points)
+    combinations = math.prod(len(axis) for axis in axes)
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        results = rate_calculator.calculate_increase_rate_grid(*axes)
+        best = min(best, time.perf_counter() - start)
+    valid = int(results["valid"].sum())
+
+    sample = results[np.random.default_rng(0).choice(len(results), min(args.sample, len(results)), replace=False)]
+    start = time.perf_counter()
+    scalar_loop(sample)
+    scalar = (time.perf_counter() - start) / len(sample) * combinations
+
+    print(f"{combinations} combinações ({valid} válidas), melhor de {args.repeat}")
+    print(f"{'versão':<26}{'s':>10}{'Mcomb/s':>10}")
+    print(f"{'lote (NumPy)':<26}{best:>10.3f}{combinations / 1e6 / best:>10.2f}")
+    print(f"{'escalar (extrapolado)':<26}{scalar:>10.3f}{combinations / 1e6 / scalar:>10.2f}")
+    print(f"aceleração: {scalar / best:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
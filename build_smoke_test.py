@@ -0,0 +1,104 @@
+"""Teste de fumaça dos executáveis do PyInstaller: onefile (main.spec) x onedir (main_onedir.spec).
+
+Gera os dois perfis, abre cada executável com QT_QPA_PLATFORM=offscreen e --profile-startup
+(a interface mede a própria abertura e encerra) e compara tamanho e tempo de abertura.
+Falha se algum executável não abrir ou não chegar ao fim da inicialização.
+
+    python build_smoke_test.py --repeat 5
+    python build_smoke_test.py --skip-build      # só mede o que já está em dist/
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# (perfil, spec, executável relativo a dist/, o que conta no tamanho)
+PROFILES = [
+    ("onefile", "main.spec", "main", "main"),
+    ("onedir", "main_onedir.spec", os.path.join("main_onedir", "main"), "main_onedir"),
+]
+
+FIRST_PAINT_RE = re.compile(r"primeira pintura\s+@\s+([0-9.]+) ms")
+DONE_MARK = "inicialização concluída"
+
+
+def build(spec, dist, work):
+    subprocess.run([sys.executable, "-m", "PyInstaller", "--noconfirm", "--log-level", "WARN",
+                    "--distpath", dist, "--workpath", work, os.path.join(HERE, spec)],
+                   cwd=HERE, check=True)
+
+
+def disk_size(path):
+    """(bytes, arquivos) de um executável ou de um diretório onedir."""
+    if os.path.isfile(path):
+        return os.path.getsize(path), 1
+    total = count = 0
+    for folder, _, files in os.walk(path):
+        for name in files:
+            # lstat: os links simbólicos do onedir não contam o alvo duas vezes
+            total += os.lstat(os.path.join(folder, name)).st_size
+            count += 1
+    return total, count
+
+
+def launch(executable, timeout):
+    """Abre o executável uma vez; retorna (tempo de parede em s, primeira pintura em ms)."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    # Diretório vazio: config.json e o histórico do repositório não são lidos nem alterados
+    with tempfile.TemporaryDirectory() as folder:
+        start = time.perf_counter()
+        result = subprocess.run([executable, "--profile-startup"], cwd=folder, env=env, timeout=timeout,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        wall = time.perf_counter() - start
+    if result.returncode != 0 or DONE_MARK not in result.stdout:
+        raise RuntimeError(f"{executable} falhou (código {result.returncode}):\n{result.stdout[-2000:]}")
+    match = FIRST_PAINT_RE.search(result.stdout)
+    return wall, float(match.group(1)) if match else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-build", action="store_true", help="usa os executáveis já gerados")
+    parser.add_argument("--dist", default=os.path.join(HERE, "dist"))
+    parser.add_argument("--work", default=os.path.join(HERE, "build"))
+    parser.add_argument("--timeout", type=float, default=60.0, help="limite por abertura (s)")
+    args = parser.parse_args()
+
+    rows = []
+    failed = False
+    for name, spec, executable, sized in PROFILES:
+        if not args.skip_build:
+            print(f"Gerando {name} ({spec})...", flush=True)
+            build(spec, args.dist, os.path.join(args.work, name))
+        path = os.path.join(args.dist, executable)
+        if not os.path.exists(path):
+            print(f"{name}: {path} não existe", file=sys.stderr)
+            failed = True
+            continue
+        size, files = disk_size(os.path.join(args.dist, sized))
+        try:
+            runs = [launch(path, args.timeout) for _ in range(args.repeat)]
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"{name}: {e}", file=sys.stderr)
+            failed = True
+            continue
+        walls = [wall for wall, _ in runs]
+        paints = [paint for _, paint in runs]
+        rows.append((name, size, files, statistics.median(walls), min(walls), statistics.median(paints)))
+
+    print(f"\nabertura com --profile-startup, {args.repeat} execuções (mediana)")
+    print(f"{'perfil':<10}{'MB':>9}{'arquivos':>10}{'abertura s':>12}{'mín s':>8}{'1ª pintura ms':>15}")
+    for name, size, files, wall, best, paint in rows:
+        print(f"{name:<10}{size / 1e6:>9.1f}{files:>10}{wall:>12.3f}{best:>8.3f}{paint:>15.0f}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
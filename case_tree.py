@@ -0,0 +1,68 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QTreeView, QFileSystemModel
+from PyQt5.QtCore import QDir, pyqtSignal
+
+# Diretórios de processador e de tempo podem ter milhares de arquivos: o QFileSystemModel
+# lê cada diretório só quando ele é expandido, numa thread própria, e acompanha as mudanças.
+
+
+class CaseTreePanel(QWidget):
+    """Painel opcional com a árvore de arquivos do caso (desligado com --no-tree).
+
+    Duplo clique num arquivo emite fileActivated(caminho).
+    """
+
+    fileActivated = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.searchBar = QLineEdit(self)
+        self.searchBar.setPlaceholderText("Search files...")
+        self.searchBar.textChanged.connect(self.filter)
+        layout.addWidget(self.searchBar)
+
+        self.model = QFileSystemModel(self)
+        self.model.setFilter(QDir.AllEntries | QDir.NoDotAndDotDot | QDir.AllDirs)
+        # Itens que não casam com o filtro são escondidos (e não só desabilitados)
+        self.model.setNameFilterDisables(False)
+
+        self.treeView = QTreeView(self)
+        self.treeView.setModel(self.model)
+        self.treeView.setHeaderHidden(True)
+        for column in range(1, self.model.columnCount()):
+            self.treeView.hideColumn(column)
+        self.treeView.doubleClicked.connect(self.onDoubleClicked)
+        layout.addWidget(self.treeView)
+        self.rootPath = None
+
+    def setRoot(self, path):
+        if not path or path == self.rootPath:
+            return
+        self.rootPath = path
+        self.treeView.setRootIndex(self.model.setRootPath(path))
+
+    def refresh(self, path=None):
+        """Troca a raiz (se indicada) e relê a árvore do disco."""
+        if path and path != self.rootPath:
+            self.setRoot(path)
+            return
+        if self.rootPath:
+            # Trocar a raiz descarta o cache do modelo: os diretórios são relidos ao expandir
+            self.model.setRootPath("")
+            self.treeView.setRootIndex(self.model.setRootPath(self.rootPath))
+
+    def filter(self, text):
+        """Filtra os arquivos pelo nome (curingas do QDir; texto simples vira *texto*)."""
+        text = text.strip()
+        if not text:
+            self.model.setNameFilters([])
+        elif any(char in text for char in "*?["):
+            self.model.setNameFilters([text])
+        else:
+            self.model.setNameFilters([f"*{text}*"])
+
+    def onDoubleClicked(self, index):
+        if not self.model.isDir(index):
+            self.fileActivated.emit(self.model.filePath(index))
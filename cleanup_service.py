@@ -0,0 +1,155 @@
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+TRASH_PREFIX = ".trash-"
+ARCHIVE_DIR = "archive"
+
+
+def directory_size(path):
+    """Soma o tamanho dos arquivos de um diretório (sem seguir links simbólicos)."""
+    total = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+    return total
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(size) < 1024 or unit == "TB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024.0
+
+
+class DeletionService:
+    """Remove (ou arquiva) diretórios do caso em segundo plano.
+
+    Os diretórios são primeiro renomeados para '<caso>/.trash-<data>-<nome>', o que é
+    instantâneo no mesmo sistema de arquivos e libera o caso para uso imediato.
+    Depois são apagados em paralelo por um pool de threads. O progresso é lido por
+    progress(), sem callbacks entre threads.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 2))
+        self.executor = None
+        self._lock = threading.Lock()
+        self._reset_progress()
+
+    def _reset_progress(self):
+        self.total = 0
+        self.done = 0
+        self.bytes_freed = 0
+        self.errors = []
+        self.archives = []
+        self.futures = []
+        self.scheduled = set()
+
+    def busy(self):
+        return any(not future.done() for future in self.futures)
+
+    def progress(self):
+        with self._lock:
+            return {
+                "total": self.total,
+                "done": self.done,
+                "bytes_freed": self.bytes_freed,
+                "errors": list(self.errors),
+                "archives": list(self.archives),
+                "finished": self.done >= self.total,
+            }
+
+    def move_aside(self, case_path, names):
+        """Renomeia os diretórios para nomes '.trash-*'. Retorna os caminhos renomeados."""
+        stamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        moved = []
+        for name in names:
+            source = os.path.join(case_path, name)
+            if not os.path.isdir(source):
+                continue
+            # Pastas dentro de processor* ('processor0/0.1') também vão para a raiz do caso
+            target = os.path.join(case_path, f"{TRASH_PREFIX}{stamp}-{name.replace(os.sep, '_')}")
+            try:
+                os.rename(source, target)
+                moved.append(target)
+            except OSError as e:
+                with self._lock:
+                    self.errors.append(f"{name}: {e}")
+        return moved
+
+    def leftover_trash(self, case_path):
+        """Diretórios '.trash-*' deixados por limpezas interrompidas."""
+        if not os.path.isdir(case_path):
+            return []
+        return [os.path.join(case_path, name) for name in os.listdir(case_path)
+                if name.startswith(TRASH_PREFIX) and os.path.isdir(os.path.join(case_path, name))]
+
+    def remove(self, case_path, names, archive=False):
+        """Renomeia 'names' e agenda a remoção (ou o arquivamento em tar.gz). Retorna os renomeados."""
+        if not self.busy():
+            self._reset_progress()
+        moved = self.move_aside(case_path, names)
+        jobs = [(path, archive) for path in moved]
+        # Sobras de limpezas anteriores são sempre apagadas
+        jobs += [(path, False) for path in self.leftover_trash(case_path)
+                 if path not in moved and path not in self.scheduled]
+        if not jobs:
+            return moved
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cleanup")
+        with self._lock:
+            self.total += len(jobs)
+        archive_dir = os.path.join(case_path, ARCHIVE_DIR)
+        for path, archive_job in jobs:
+            self.scheduled.add(path)
+            self.futures.append(self.executor.submit(self._process, path, archive_job, archive_dir))
+        return moved
+
+    def _process(self, path, archive, archive_dir):
+        try:
+            size = directory_size(path)
+            if archive:
+                # Importado só quando há arquivamento (não pesa na abertura da interface)
+                import tarfile
+                original = os.path.basename(path).split("-", 2)[-1]
+                os.makedirs(archive_dir, exist_ok=True)
+                target = os.path.join(archive_dir, f"{original}.tar.gz")
+                with tarfile.open(target, "w:gz") as tar:
+                    tar.add(path, arcname=original)
+                size -= os.path.getsize(target)
+                with self._lock:
+                    self.archives.append(target)
+            shutil.rmtree(path)
+            with self._lock:
+                self.bytes_freed += size
+        except Exception as e:
+            with self._lock:
+                self.errors.append(f"{os.path.basename(path)}: {e}")
+        finally:
+            with self._lock:
+                self.done += 1
+
+    def wait(self):
+        for future in list(self.futures):
+            future.result()
+
+    def shutdown(self, wait=False):
+        """Encerra o pool; trabalhos ainda na fila são cancelados e os '.trash-*' ficam para a próxima limpeza."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,184 @@
+import re
+
+import numpy as np
+
+CLOUD_RE = re.compile(r'^Cloud: (\S+)')
+NUMBER = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|nan|-?inf'
+VECTOR_RE = re.compile(r'^\((\S+) (\S+) (\S+)\)$')
+
+CLOUD_COLUMNS = {
+    "time": 'd',
+    "cloud": None,
+    "quantity": None,
+    "value": 'd',
+}
+
+# Quantidades mais usadas no painel (nomes normalizados)
+PARCELS = "current_number_of_parcels"
+MASS_IN_SYSTEM = "current_mass_in_system"
+MASS_INJECTED = "mass_injected_total"
+MASS_ESCAPED = "mass_escaped_total"
+PARCELS_ADDED = "parcels_added_total"
+LINEAR_KE = "linear_kinetic_energy"
+ROTATIONAL_KE = "rotational_kinetic_energy"
+MAX_ALPHA = "max_cell_volume_fraction"
+
+
+def normalize_key(text):
+    """'Current number of parcels' -> 'current_number_of_parcels', '|Linear momentum|' -> 'linear_momentum_mag'."""
+    text = text.strip()
+    suffix = ""
+    if text.startswith("|") and text.endswith("|"):
+        text = text.strip("|")
+        suffix = "_mag"
+    key = re.sub(r'[^0-9a-zA-Z]+', '_', text).strip('_').lower()
+    return key + suffix
+
+
+def _to_float(token):
+    try:
+        return float(token)
+    except ValueError:
+        return None
+
+
+class CloudBlockParser:
+    """Lê os blocos 'Cloud: <nome>' do log e extrai todos os campos numéricos.
+
+    Subitens de injetores e de destinos de parcelas ('Parcel fate') recebem o
+    nome do grupo como prefixo. Ao final de cada bloco são somados o total
+    injetado e o total que escapou do domínio (pelo destino 'system', que já soma
+    os patches, ou pelos patches quando ele não aparece).
+    """
+
+    def __init__(self):
+        self.cloud = None
+        self.values = {}
+        self.group = None
+
+    @property
+    def active(self):
+        return self.cloud is not None
+
+    def start(self, line):
+        match = CLOUD_RE.match(line)
+        if not match:
+            return False
+        self.cloud = match.group(1)
+        self.values = {}
+        self.group = None
+        return True
+
+    def feed(self, line):
+        """Processa uma linha dentro do bloco. Retorna False quando a linha não pertence ao bloco."""
+        if not line:
+            return False
+        if line.endswith(":") and "=" not in line:
+            header = line[:-1]
+            if header.lower().startswith("injector"):
+                self.group = "injector_" + normalize_key(header.split(None, 1)[-1])
+            else:
+                self.group = normalize_key(header)
+            return True
+        if line.startswith("Parcel fate:"):
+            self.group = "fate_" + normalize_key(line.split(":", 1)[1])
+            return True
+        if "=" not in line:
+            return False
+
+        name, value = line.split("=", 1)
+        subitem = name.strip().startswith("-")
+        key = normalize_key(name.strip().lstrip("-"))
+        if subitem and self.group:
+            key = f"{self.group}_{key}"
+        elif not subitem:
+            self.group = None
+        value = value.strip()
+
+        vector = VECTOR_RE.match(value)
+        if vector:
+            for axis, token in zip("xyz", vector.groups()):
+                number = _to_float(token)
+                if number is not None:
+                    self.values[f"{key}_{axis}"] = number
+            return True
+        numbers = [_to_float(token) for token in re.findall(NUMBER, value)]
+        numbers = [n for n in numbers if n is not None]
+        if len(numbers) == 1:
+            self.values[key] = numbers[0]
+        elif len(numbers) == 2 and "," in value:
+            # Destinos de parcelas: '<número de parcelas>, <massa>'
+            self.values[f"{key}_parcels"] = numbers[0]
+            self.values[f"{key}_mass"] = numbers[1]
+        return True
+
+    def finish(self):
+        """Encerra o bloco e retorna (nome da nuvem, valores) com os totais calculados."""
+        values = self.values
+        values[MASS_INJECTED] = sum(v for k, v in values.items() if k.startswith("injector_") and k.endswith("mass_introduced"))
+        values[PARCELS_ADDED] = sum(v for k, v in values.items() if k.startswith("injector_") and k.endswith("parcels_added"))
+        escaped = {k: v for k, v in values.items() if k.startswith("fate_") and k.endswith("escape_mass")}
+        system = [v for k, v in escaped.items() if k.startswith("fate_system")]
+        values[MASS_ESCAPED] = sum(system) if system else sum(escaped.values())
+        cloud = self.cloud
+        self.cloud = None
+        self.values = {}
+        self.group = None
+        return cloud, values
+
+
+def parse_cloud_block(lines):
+    """Extrai os valores numéricos do primeiro bloco 'Cloud:' de uma lista de linhas."""
+    parser = CloudBlockParser()
+    for line in lines:
+        line = line.strip()
+        if parser.active:
+            if not parser.feed(line):
+                break
+        else:
+            parser.start(line)
+    if not parser.active:
+        return {}
+    return parser.finish()[1]
+
+
+def cloud_series(table, quantity, cloud=None):
+    """Retorna (tempos, valores) de uma quantidade da tabela 'cloud'."""
+    mask = table.column("quantity") == quantity
+    if cloud is not None:
+        mask &= table.column("cloud") == cloud
+    return table.column("time")[mask], table.column("value")[mask]
+
+
+def cloud_quantities(table):
+    """Lista as quantidades presentes na tabela, na ordem em que apareceram."""
+    return list(dict.fromkeys(table.data["quantity"]))
+
+
+def latest_values(table):
+    """Valores do último bloco lido para cada quantidade."""
+    latest = {}
+    for quantity, value in zip(table.data["quantity"], table.data["value"]):
+        latest[quantity] = value
+    return latest
+
+
+def cost_vs_parcels(store):
+    """Relaciona o custo de parede de cada passo com o número de parcelas no mesmo tempo.
+
+    Retorna (parcelas, segundos por passo) apenas para os tempos presentes nas duas séries.
+    """
+    timing = store.table("timing")
+    times = timing.column("time")
+    clock = timing.column("clock_time")
+    if len(times) < 2 or not store.has_table("cloud"):
+        return np.array([]), np.array([])
+    costs = np.diff(clock)
+    times = times[1:]
+    parcel_times, parcels = cloud_series(store.table("cloud"), PARCELS)
+    lookup = dict(zip(parcel_times.tolist(), parcels.tolist()))
+    pairs = [(lookup[t], c) for t, c in zip(times.tolist(), costs.tolist()) if t in lookup]
+    if not pairs:
+        return np.array([]), np.array([])
+    pairs = np.array(pairs)
+    return pairs[:, 0], pairs[:, 1]
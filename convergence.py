@@ -0,0 +1,77 @@
+import math
+
+
+class ConvergenceMonitor:
+    """Gera alertas de convergência a partir da telemetria dos solvers lineares.
+
+    É avaliado ao final de cada passo de tempo e emite cada alerta uma única vez
+    por (tipo, campo) até que a condição deixe de ocorrer.
+    """
+
+    def __init__(self, window=20, stagnation_steps=10, stagnation_ratio=0.9, stagnation_floor=1e-4,
+                 max_iterations=500, iteration_spike_factor=10.0, divergence_factor=1e3):
+        self.window = window
+        self.stagnation_steps = stagnation_steps
+        self.stagnation_ratio = stagnation_ratio
+        self.stagnation_floor = stagnation_floor
+        self.max_iterations = max_iterations
+        self.iteration_spike_factor = iteration_spike_factor
+        self.divergence_factor = divergence_factor
+        self.history = {}
+        self.active = set()
+
+    def reset(self):
+        self.history = {}
+        self.active = set()
+
+    def record(self, field, initial, final, iterations):
+        """Registra o resultado do primeiro corretor de um campo no passo atual."""
+        entries = self.history.setdefault(field, [])
+        entries.append((initial, final, iterations))
+        if len(entries) > 4 * self.window:
+            del entries[:len(entries) - 4 * self.window]
+
+    def check(self, time):
+        """Avalia os campos e retorna a lista de alertas novos para este passo."""
+        alerts = []
+        for field, entries in self.history.items():
+            found = {}
+            initial, final, iterations = entries[-1]
+
+            if not (math.isfinite(initial) and math.isfinite(final)):
+                found["divergence"] = f"{field}: resíduo não finito (NaN/Inf)"
+            else:
+                window = [entry[0] for entry in entries[-self.window:]]
+                lowest = min(window)
+                if lowest > 0 and initial / lowest > self.divergence_factor:
+                    found["divergence"] = (f"{field}: resíduo inicial cresceu {initial / lowest:.0f}x "
+                                           f"nos últimos {len(window)} passos")
+                elif final >= 1.0:
+                    found["divergence"] = f"{field}: resíduo final = {final:.3g}"
+
+            recent = [entry[2] for entry in entries[-self.window:-1] if entry[2] >= 0]
+            if iterations >= self.max_iterations:
+                found["iterations"] = f"{field}: {iterations} iterações no solver linear"
+            elif recent:
+                median = sorted(recent)[len(recent) // 2]
+                if median > 0 and iterations > self.iteration_spike_factor * median:
+                    found["iterations"] = f"{field}: {iterations} iterações (mediana recente {median})"
+
+            # Estagnação: o solver linear não reduz o resíduo (final ~ inicial) em passos seguidos
+            streak = entries[-self.stagnation_steps:]
+            if len(streak) == self.stagnation_steps and all(
+                    entry[0] > self.stagnation_floor and entry[1] >= self.stagnation_ratio * entry[0]
+                    for entry in streak):
+                found["stagnation"] = (f"{field}: resíduo estagnado em {final:.3g} "
+                                       f"(sem redução em {self.stagnation_steps} passos)")
+
+            for kind in ("divergence", "iterations", "stagnation"):
+                key = (kind, field)
+                if kind in found:
+                    if key not in self.active:
+                        self.active.add(key)
+                        alerts.append({"type": "alert", "kind": kind, "field": field,
+                                       "time": time, "message": found[kind]})
+                else:
+                    self.active.discard(key)
+        return alerts
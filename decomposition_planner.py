@@ -0,0 +1,222 @@
+import itertools
+import os
+import re
+from datetime import datetime
+
+import numpy as np
+import psutil
+
+import foam_dict
+from foam_case import processor_dirs
+from foam_field import load_bytes, read_header, resolve_path
+
+# Faixa usual de células por núcleo para solvers incompressíveis com nuvem Lagrangiana
+MIN_CELLS_PER_CORE = 10000
+MAX_CELLS_PER_CORE = 100000
+
+DECOMPOSE_TEMPLATE = """/*--------------------------------*- C++ -*----------------------------------*\\
+  =========                 |
+  \\\\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox
+   \\\\    /   O peration     | Website:  https://openfoam.org
+    \\\\  /    A nd           |
+     \\\\/     M anipulation  |
+\\*---------------------------------------------------------------------------*/
+FoamFile
+{
+    format      ascii;
+    class       dictionary;
+    object      decomposeParDict;
+}
+// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //
+
+numberOfSubdomains 1;
+
+method          scotch;
+
+
+// ************************************************************************* //
+"""
+
+
+def _owner_cells(owner_path):
+    """nCells da nota do cabeçalho de polyMesh/owner (None se ausente)."""
+    path = resolve_path(owner_path)
+    if not os.path.exists(path):
+        return None
+    note = str(read_header(load_bytes(path)[:4096]).get("note", ""))
+    match = re.search(r'nCells:\s*(\d+)', note)
+    return int(match.group(1)) if match else None
+
+
+def mesh_cell_count(case_path):
+    """Número de células da malha: constant/polyMesh ou a soma dos processor*."""
+    cells = _owner_cells(os.path.join(case_path, "constant", "polyMesh", "owner"))
+    if cells is not None:
+        return cells
+    counts = [_owner_cells(os.path.join(case_path, p, "constant", "polyMesh", "owner"))
+              for p in processor_dirs(case_path)]
+    if counts and all(c is not None for c in counts):
+        return sum(counts)
+    return None
+
+
+def physical_cores():
+    return psutil.cpu_count(logical=False) or psutil.cpu_count() or 1
+
+
+def recommend_subdomains(cells, cores, min_cells=MIN_CELLS_PER_CORE):
+    """Maior número de subdomínios que mantém ao menos 'min_cells' células por núcleo, limitado aos núcleos."""
+    if not cells:
+        return cores
+    return int(max(1, min(cores, cells // min_cells)))
+
+
+def block_mesh_extents(case_path):
+    """Dimensões (x, y, z) dos vértices do blockMeshDict, ou None."""
+    entries = foam_dict.read(os.path.join(case_path, "system", "blockMeshDict"))
+    vertices = entries.get("vertices")
+    if not isinstance(vertices, str):
+        return None
+    numbers = [float(n) for n in re.findall(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?', vertices)]
+    if len(numbers) < 6 or len(numbers) % 3:
+        return None
+    points = np.array(numbers).reshape(-1, 3) * float(entries.get("convertToMeters", entries.get("scale", 1)) or 1)
+    return points.max(axis=0) - points.min(axis=0)
+
+
+def hierarchical_split(n, extents):
+    """(nx, ny, nz) com nx*ny*nz = n que minimiza a área das interfaces entre subdomínios."""
+    lx, ly, lz = extents
+    divisors = [d for d in range(1, n + 1) if n % d == 0]
+    best = None
+    for nx, ny in itertools.product(divisors, repeat=2):
+        if n % (nx * ny):
+            continue
+        nz = n // (nx * ny)
+        area = (nx - 1) * ly * lz + (ny - 1) * lx * lz + (nz - 1) * lx * ly
+        if best is None or area < best[0]:
+            best = (area, (nx, ny, nz))
+    return best[1]
+
+
+def recommend_method(case_path, n):
+    """Método de decomposição e coeficientes.
+
+    Malhas de blockMesh (estruturadas, sem .unv/.msh) usam 'hierarchical' com a divisão
+    de menor interface; as demais usam 'scotch', que não precisa de parâmetros.
+    """
+    if n == 1:
+        return "scotch", None, "um único subdomínio: a decomposição não é necessária"
+    imported = any(name.endswith((".unv", ".msh")) for name in os.listdir(case_path))
+    extents = None if imported else block_mesh_extents(case_path)
+    if extents is not None and np.all(extents > 0):
+        split = hierarchical_split(n, extents)
+        coeffs = {"n": f"({split[0]} {split[1]} {split[2]})", "order": "xyz"}
+        return "hierarchical", coeffs, f"malha estruturada (blockMesh): divisão {split[0]}x{split[1]}x{split[2]}"
+    if extents is not None:
+        return "scotch", None, "blockMeshDict com extensão nula em alguma direção: scotch"
+    return "scotch", None, "malha não estruturada: scotch minimiza as interfaces sem parâmetros"
+
+
+def plan(case_path, cores=None, min_cells=MIN_CELLS_PER_CORE):
+    """Recomendação completa para o caso: células, núcleos, subdomínios e método."""
+    cells = mesh_cell_count(case_path)
+    cores = cores or physical_cores()
+    n = recommend_subdomains(cells, cores, min_cells)
+    method, coeffs, reason = recommend_method(case_path, n)
+    notes = [reason]
+    if cells is None:
+        notes.append("número de células desconhecido (execute o blockMesh/ideasUnvToFoam): usando todos os núcleos")
+    elif cells / n > MAX_CELLS_PER_CORE:
+        notes.append(f"{cells / n:.0f} células por núcleo: acima de {MAX_CELLS_PER_CORE}, mais núcleos ajudariam")
+    elif n < cores:
+        notes.append(f"limitado a {n} subdomínios para manter ao menos {min_cells} células por núcleo")
+    return {
+        "cells": cells,
+        "cores": cores,
+        "subdomains": n,
+        "cells_per_core": cells / n if cells else None,
+        "method": method,
+        "coeffs": coeffs,
+        "notes": notes,
+    }
+
+
+def write_decompose_dict(case_path, subdomains, method, coeffs=None):
+    """Grava numberOfSubdomains, method e <method>Coeffs no system/decomposeParDict."""
+    path = os.path.join(case_path, "system", "decomposeParDict")
+    if not os.path.exists(path):
+        with open(path, "w") as f:
+            f.write(DECOMPOSE_TEMPLATE)
+    foam_dict.set_entries(path, {"numberOfSubdomains": subdomains, "method": method})
+    if coeffs:
+        foam_dict.set_subdict(path, f"{method}Coeffs", coeffs)
+    return path
+
+
+def wall_seconds(entry):
+    """Duração de uma execução do histórico (clock_time das métricas ou fim - início), em s."""
+    metrics = entry.get("metrics") or {}
+    if metrics.get("clock_time"):
+        return metrics["clock_time"]
+    try:
+        start = datetime.strptime(entry["start_time"], "%Y-%m-%d %H:%M:%S")
+        end = datetime.strptime(entry["end_time"], "%Y-%m-%d %H:%M:%S")
+    except (KeyError, ValueError):
+        return None
+    return (end - start).total_seconds()
+
+
+def measured_throughput(history, cells, tolerance=0.2):
+    """Vazão medida (células x passos / s) das execuções anteriores com malha de tamanho parecido.
+
+    Retorna [(subdomínios, vazão, eficiência)], com a eficiência relativa à execução
+    com menos subdomínios; a melhor vazão de cada número de subdomínios é usada.
+    """
+    best = {}
+    for entry in history:
+        metrics = entry.get("metrics") or {}
+        n, run_cells, steps = metrics.get("subdomains"), metrics.get("cells"), metrics.get("steps")
+        seconds = wall_seconds(entry)
+        if not (n and run_cells and steps and seconds) or seconds <= 0:
+            continue
+        if cells and abs(run_cells - cells) > tolerance * cells:
+            continue
+        throughput = run_cells * steps / seconds
+        best[n] = max(best.get(n, 0), throughput)
+    if not best:
+        return []
+    base_n = min(best)
+    base = best[base_n]
+    return [(n, value, (value / base) / (n / base_n)) for n, value in sorted(best.items())]
+
+
+def check_against_history(history, cells, subdomains, min_efficiency=0.6, measured=None):
+    """Compara a recomendação com as execuções anteriores. Retorna (medições, sugestão, mensagem).
+
+    'measured' permite usar outras medições no lugar do histórico (ex.: o scaling.json do caso).
+    """
+    measured = measured or measured_throughput(history, cells)
+    if not measured:
+        return measured, None, "Sem execuções anteriores com malha semelhante para comparar."
+    efficient = [n for n, _, efficiency in measured if efficiency >= min_efficiency]
+    fastest = max(measured, key=lambda item: item[1])[0]
+    if subdomains in dict((n, v) for n, v, _ in measured):
+        efficiency = dict((n, e) for n, _, e in measured)[subdomains]
+        if efficiency < min_efficiency:
+            suggestion = max(efficient) if efficient else fastest
+            return measured, suggestion, (f"Com {subdomains} subdomínios a eficiência medida foi {efficiency:.0%}; "
+                                          f"{suggestion} subdomínios rendeu melhor no histórico.")
+        return measured, None, f"A eficiência medida com {subdomains} subdomínios foi {efficiency:.0%}."
+    largest, _, largest_efficiency = measured[-1]
+    if subdomains > largest:
+        if largest_efficiency < min_efficiency:
+            suggestion = max(efficient) if efficient else fastest
+            return measured, suggestion, (f"A eficiência já caiu para {largest_efficiency:.0%} com {largest} "
+                                          f"subdomínios; {suggestion} subdomínios rendeu melhor no histórico.")
+        return measured, None, (f"O histórico só vai até {largest} subdomínios ({largest_efficiency:.0%} de "
+                                f"eficiência); a escalabilidade acima disso ainda não foi medida.")
+    if fastest < subdomains:
+        return measured, fastest, (f"No histórico a maior vazão foi com {fastest} subdomínios, "
+                                   f"menos que os {subdomains} recomendados.")
+    return measured, None, f"A maior vazão medida foi com {fastest} subdomínios."
@@ -0,0 +1,224 @@
+import json
+import math
+import os
+import threading
+
+import foam_dict
+from foam_case import common_processor_times, list_time_dirs, processor_dirs, time_value
+
+RETENTION_FILE = "retention.json"
+
+
+class DiskUsageCache:
+    """Tamanhos por diretório com invalidação pelo mtime.
+
+    Cada diretório guarda o tamanho de seus arquivos e a lista de subdiretórios.
+    Enquanto o mtime do diretório não muda (nenhum arquivo criado, removido ou
+    renomeado), a nova varredura custa um único stat em vez de um por arquivo.
+    Arquivos reescritos no lugar (campos do tempo sendo gravado, log.* crescendo) não
+    mudam esse mtime: esses diretórios são varridos com fresh=True, que ignora o cache.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def scan_dir(self, path, fresh=False):
+        """Retorna (arquivos {nome: tamanho}, subdiretórios [nomes]) de 'path'."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return {}, []
+        with self._lock:
+            cached = self.entries.get(path)
+        if cached and cached[0] == mtime and not fresh:
+            return cached[1], cached[2]
+        files = {}
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        else:
+                            files[entry.name] = entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        pass
+        except OSError:
+            return {}, []
+        with self._lock:
+            self.entries[path] = (mtime, files, subdirs)
+        return files, subdirs
+
+    def walk(self, path, relative="", fresh=False):
+        """Gera (caminho relativo do arquivo, tamanho) para todos os arquivos sob 'path'."""
+        files, subdirs = self.scan_dir(path, fresh)
+        for name, size in files.items():
+            yield os.path.join(relative, name), size
+        for name in subdirs:
+            yield from self.walk(os.path.join(path, name), os.path.join(relative, name), fresh)
+
+    def total(self, path, fresh=False):
+        return sum(size for _, size in self.walk(path, fresh=fresh))
+
+
+def case_breakdown(case_path, cache=None):
+    """Uso de disco do caso por tempo, por processador e por campo.
+
+    Os tempos somam os diretórios reconstruídos e os de todos os processor*.
+    O campo é o caminho do arquivo dentro do diretório de tempo (U, p, lagrangian/cloud/d...).
+    O último tempo de cada raiz e os arquivos soltos (log.*) são sempre relidos: podem estar
+    sendo gravados pelo solver.
+    """
+    cache = cache or DiskUsageCache()
+    by_time = {}
+    by_processor = {}
+    by_field = {}
+    other = {}
+    total = 0
+
+    def latest(names):
+        times = [name for name in names if time_value(name) is not None]
+        return max(times, key=time_value) if times else None
+
+    def add_time_dir(root, name, fresh):
+        size_total = 0
+        for relative, size in cache.walk(os.path.join(root, name), fresh=fresh):
+            field = relative if not relative.startswith("uniform") else "uniform"
+            by_field[field] = by_field.get(field, 0) + size
+            size_total += size
+        by_time[name] = by_time.get(name, 0) + size_total
+        return size_total
+
+    files, subdirs = cache.scan_dir(case_path, fresh=True)
+    latest_time = latest(subdirs)
+    total += sum(files.values())
+    other["(arquivos do caso)"] = sum(files.values())
+    processors = set(processor_dirs(case_path))
+    for name in subdirs:
+        if time_value(name) is not None:
+            total += add_time_dir(case_path, name, name == latest_time)
+        elif name in processors:
+            processor_path = os.path.join(case_path, name)
+            processor_total = 0
+            p_files, p_subdirs = cache.scan_dir(processor_path, fresh=True)
+            p_latest = latest(p_subdirs)
+            processor_total += sum(p_files.values())
+            for sub in p_subdirs:
+                if time_value(sub) is not None:
+                    processor_total += add_time_dir(processor_path, sub, sub == p_latest)
+                else:
+                    size = cache.total(os.path.join(processor_path, sub))
+                    other[f"processor*/{sub}"] = other.get(f"processor*/{sub}", 0) + size
+                    processor_total += size
+            by_processor[name] = processor_total
+            total += processor_total
+        else:
+            size = cache.total(os.path.join(case_path, name))
+            other[name] = size
+            total += size
+
+    def ordered(values, key=None):
+        return dict(sorted(values.items(), key=key or (lambda item: item[1]), reverse=True))
+
+    return {
+        "total": total,
+        "by_time": dict(sorted(by_time.items(), key=lambda item: float(item[0]))),
+        "by_processor": ordered(by_processor),
+        "by_field": ordered(by_field),
+        "other": ordered(other),
+    }
+
+
+class RetentionPolicy:
+    """Política de retenção dos diretórios de tempo.
+
+    Mantém o tempo 0, um a cada 'keep_every' escritas, os 'keep_last' mais recentes
+    e os tempos listados em 'keep_times'. "Um a cada N" é avaliado por faixas de
+    tempo de largura N * writeInterval (o primeiro tempo de cada faixa fica), e não
+    pela posição na lista, para que aplicar a política repetidas vezes durante a
+    simulação não apague pastas que já tinham sido mantidas.
+    """
+
+    def __init__(self, enabled=False, keep_every=10, keep_last=3, keep_times=None, interval_seconds=60,
+                 keep_interval=None):
+        self.enabled = enabled
+        self.keep_every = max(int(keep_every), 1)
+        self.keep_last = max(int(keep_last), 1)
+        self.keep_times = [float(t) for t in (keep_times or [])]
+        self.interval_seconds = interval_seconds
+        self.keep_interval = keep_interval
+
+    @classmethod
+    def config_path(cls, case_path):
+        return os.path.join(case_path, RETENTION_FILE)
+
+    @classmethod
+    def load(cls, case_path):
+        path = cls.config_path(case_path)
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r") as f:
+            return cls(**json.load(f))
+
+    def save(self, case_path):
+        with open(self.config_path(case_path), "w") as f:
+            json.dump({
+                "enabled": self.enabled,
+                "keep_every": self.keep_every,
+                "keep_last": self.keep_last,
+                "keep_times": self.keep_times,
+                "interval_seconds": self.interval_seconds,
+                "keep_interval": self.keep_interval,
+            }, f, indent=4)
+
+    def bucket_width(self, case_path):
+        """Largura da faixa de tempo correspondente a 'keep_every' escritas."""
+        if self.keep_interval:
+            return float(self.keep_interval)
+        control = foam_dict.read(os.path.join(case_path, "system", "controlDict"))
+        try:
+            write_interval = float(control.get("writeInterval", 0))
+            if control.get("writeControl", "timeStep") == "timeStep":
+                write_interval *= float(control.get("deltaT", 0))
+        except (TypeError, ValueError):
+            return None
+        return self.keep_every * write_interval if write_interval > 0 else None
+
+    def select_removals(self, times, width=None):
+        """Recebe [(tempo, nome)] ordenado e retorna os nomes que podem ser removidos.
+
+        Sem 'width' (controlDict ilegível) nada é removido.
+        """
+        if not width:
+            return []
+        candidates = [(value, name) for value, name in times if value > 0]
+        protected = set(name for _, name in candidates[-self.keep_last:])
+        buckets = set()
+        removals = []
+        for value, name in candidates:
+            bucket = math.floor(value / width + 1e-6)
+            if bucket not in buckets:
+                buckets.add(bucket)
+                continue
+            if name in protected:
+                continue
+            if any(abs(value - keep) <= 1e-9 * max(abs(keep), 1.0) for keep in self.keep_times):
+                continue
+            removals.append(name)
+        return removals
+
+    def plan(self, case_path):
+        """Diretórios (relativos ao caso) a remover no caso reconstruído e nos processor*.
+
+        Nos casos decompostos a seleção é feita sobre os tempos comuns a todos os
+        processadores, para que os ranks continuem consistentes entre si.
+        """
+        width = self.bucket_width(case_path)
+        removals = self.select_removals(list_time_dirs(case_path), width)
+        processors = processor_dirs(case_path)
+        if processors:
+            for name in self.select_removals(common_processor_times(case_path), width):
+                removals.extend(os.path.join(processor, name) for processor in processors)
+        return removals
@@ -0,0 +1,174 @@
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from foam_case import common_processor_times, list_time_dirs, processor_dirs
+from foam_field import SUPPORTED_CLASSES, field_class, read_field, resolve_path
+
+FIELD_COLUMNS = {
+    "time": 'd',
+    "field": None,
+    "statistic": None,
+    "value": 'd',
+}
+
+STATISTICS = ("min", "max", "mean", "volume_mean", "integral")
+
+# Campo de volumes das células (postProcess -func writeCellVolumes)
+VOLUME_FIELD = "V"
+
+
+def _volumes(root, time_name, count=None):
+    """Volumes das células de 'root' para o tempo dado (V no tempo, em 0 ou em constant)."""
+    for folder in (time_name, "0", "constant"):
+        path = resolve_path(os.path.join(root, folder, VOLUME_FIELD))
+        if os.path.exists(path):
+            volume = read_field(path)
+            values = volume["values"]
+            if volume["uniform"]:
+                return None if count is None else np.full(count, float(values))
+            if count is None or values.shape[0] == count:
+                return values
+    return None
+
+
+def partial_reduction(root, time_name, field_name):
+    """Reduz um campo de um diretório de tempo (caso ou processorN).
+
+    Retorna somas parciais que podem ser combinadas entre processadores, ou None
+    se o arquivo não for um volScalarField/volVectorField.
+    """
+    path = os.path.join(root, time_name, field_name)
+    if field_class(path) not in SUPPORTED_CLASSES:
+        return None
+    field = read_field(path)
+    values = field["values"]
+    if field["uniform"]:
+        # Campo uniforme: o número de células vem do campo de volumes, se existir
+        volumes = _volumes(root, time_name)
+        count = 0 if volumes is None else len(volumes)
+        values = np.broadcast_to(values, (max(count, 1),) + values.shape)
+    vectors = values.ndim == 2
+    magnitude = np.sqrt(np.einsum("ij,ij->i", values, values)) if vectors else values
+    volumes = _volumes(root, time_name, magnitude.shape[0])
+    partial = {
+        "count": int(magnitude.shape[0]),
+        "sum": float(magnitude.sum()),
+        "min": float(magnitude.min()) if magnitude.size else math.inf,
+        "max": float(magnitude.max()) if magnitude.size else -math.inf,
+        "weighted_sum": float(np.dot(magnitude, volumes)) if volumes is not None else None,
+        "volume": float(volumes.sum()) if volumes is not None else None,
+    }
+    if vectors:
+        partial["component_sum"] = values.sum(axis=0).tolist()
+    return partial
+
+
+def combine(partials):
+    """Combina as reduções parciais (de vários processadores) nas estatísticas finais."""
+    partials = [p for p in partials if p is not None]
+    if not partials:
+        return None
+    count = sum(p["count"] for p in partials)
+    result = {
+        "min": min(p["min"] for p in partials),
+        "max": max(p["max"] for p in partials),
+        "mean": sum(p["sum"] for p in partials) / count if count else math.nan,
+    }
+    if all(p["volume"] is not None for p in partials):
+        volume = sum(p["volume"] for p in partials)
+        integral = sum(p["weighted_sum"] for p in partials)
+        result["integral"] = integral
+        result["volume_mean"] = integral / volume if volume else math.nan
+    else:
+        result["integral"] = math.nan
+        result["volume_mean"] = math.nan
+    if "component_sum" in partials[0] and count:
+        sums = np.sum([p["component_sum"] for p in partials], axis=0) / count
+        for axis, value in zip("xyz", sums):
+            result[f"mean_{axis}"] = float(value)
+    return result
+
+
+def _time_sources(case_path):
+    """[(tempo, nome, [raízes])]: usa o caso reconstruído e, nos tempos ausentes, os processor*."""
+    sources = {}
+    for value, name in list_time_dirs(case_path):
+        sources[name] = (value, [case_path])
+    processors = [os.path.join(case_path, p) for p in processor_dirs(case_path)]
+    for value, name in common_processor_times(case_path):
+        sources.setdefault(name, (value, processors))
+    return sorted((value, name, roots) for name, (value, roots) in sources.items())
+
+
+def _field_names(root, time_name):
+    folder = os.path.join(root, time_name)
+    names = {name[:-3] if name.endswith(".gz") else name for name in os.listdir(folder)
+             if os.path.isfile(os.path.join(folder, name))}
+    names.discard(VOLUME_FIELD)
+    return sorted(names)
+
+
+def reduce_case(case_path, fields=None, times=None, max_workers=None, store=None, errors=None):
+    """Calcula min/max/média/integral de cada campo em cada tempo, em paralelo.
+
+    Cada tarefa do pool de processos lê um campo de um diretório de tempo (ou de
+    um processorN); as parciais são combinadas por (tempo, campo), sem reconstructPar.
+    Se a leitura falhar em alguma raiz (ex.: processor3 ainda gravando o campo), as
+    estatísticas desse (tempo, campo) ficam NaN em vez de cobrir só parte da malha, e
+    (raiz, tempo, campo, erro) vai para a lista 'errors', se informada.
+    Os resultados vão para a tabela 'fields' do MetricsStore, se informado.
+    Retorna [(tempo, campo, estatística, valor)].
+    """
+    tasks = []
+    for value, name, roots in _time_sources(case_path):
+        if times is not None and name not in times:
+            continue
+        names = fields if fields is not None else _field_names(roots[0], name)
+        for field_name in names:
+            for root in roots:
+                tasks.append((value, field_name, root, name))
+
+    partials = {}
+    failed = set()
+    # 'spawn': o chamador pode ser um processo com threads (GUI Qt), onde fork não é seguro
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = [(value, field_name, root, name, executor.submit(partial_reduction, root, name, field_name))
+                   for value, field_name, root, name in tasks]
+        for value, field_name, root, name, future in futures:
+            try:
+                partial = future.result()
+            except (OSError, ValueError) as e:
+                partial = None
+                failed.add((value, field_name))
+                if errors is not None:
+                    errors.append((root, name, field_name, str(e)))
+            partials.setdefault((value, field_name), []).append(partial)
+
+    rows = []
+    for (value, field_name), parts in sorted(partials.items()):
+        if (value, field_name) in failed:
+            rows.extend((value, field_name, statistic, math.nan) for statistic in STATISTICS)
+            continue
+        result = combine(parts)
+        if result is None:
+            continue
+        for statistic, number in result.items():
+            rows.append((value, field_name, statistic, number))
+
+    if store is not None:
+        table = store.table("fields", FIELD_COLUMNS)
+        table.clear()
+        for value, field_name, statistic, number in rows:
+            table.append(time=value, field=field_name, statistic=statistic, value=number)
+    return rows
+
+
+def field_series(table, field, statistic):
+    """Retorna (tempos, valores) de uma estatística da tabela 'fields'."""
+    mask = (table.column("field") == field) & (table.column("statistic") == statistic)
+    return table.column("time")[mask], table.column("value")[mask]
@@ -0,0 +1,59 @@
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QTextEdit, QPushButton, QMessageBox
+from PyQt5 import QtCore
+
+from syntax_highlighter import OpenFOAMHighlighter
+
+
+class FileEditorWindow(QDialog):
+    """Editor dos dicionários do caso (controlDict, retention.json, watchdog.json...)."""
+
+    def __init__(self, baseDir, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("File Editor")
+        self.resize(800, 600)
+        self.setModal(True)
+
+        self.baseDir = baseDir
+        self.currentFilePath = ""
+
+        layout = QVBoxLayout(self)
+
+        self.fileEditor = QTextEdit(self)
+        self.fileEditor.setAcceptRichText(False)
+        self.highlighter = OpenFOAMHighlighter(self.fileEditor.document())
+        layout.addWidget(self.fileEditor)
+
+        buttonLayout = QHBoxLayout()
+        self.saveButton = QPushButton("Save File", self)
+        self.saveButton.clicked.connect(self.saveFile)
+        buttonLayout.addWidget(self.saveButton)
+
+        self.closeButton = QPushButton("Close", self)
+        self.closeButton.clicked.connect(self.close)
+        buttonLayout.addWidget(self.closeButton)
+
+        layout.addLayout(buttonLayout)
+
+    def openFile(self, filePath):
+        """Carrega o arquivo no editor; retorna False se não puder ser lido."""
+        file = QtCore.QFile(filePath)
+        if not file.open(QtCore.QIODevice.ReadOnly | QtCore.QIODevice.Text):
+            return False
+        self.currentFilePath = filePath
+        self.fileEditor.setPlainText(str(file.readAll(), 'utf-8', errors='replace'))
+        file.close()
+        self.setWindowTitle(f"File Editor - {QtCore.QFileInfo(filePath).fileName()}")
+        return True
+
+    def saveFile(self):
+        if not self.currentFilePath:
+            QMessageBox.warning(self, "Error", "No file loaded to save.")
+            return
+
+        file = QtCore.QFile(self.currentFilePath)
+        if file.open(QtCore.QIODevice.WriteOnly | QtCore.QIODevice.Text):
+            file.write(self.fileEditor.toPlainText().encode('utf-8'))
+            file.close()
+            QMessageBox.information(self, "Success", f"File saved: {self.currentFilePath}")
+        else:
+            QMessageBox.warning(self, "Error", "Failed to save the file.")
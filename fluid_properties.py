@@ -0,0 +1,191 @@
+import os
+import shutil
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+import foam_dict
+
+# Unidades: T em °C, P em bar, X em fração mássica; densidade em kg/m³, viscosidade em Pa·s
+
+PROPERTIES = ("rho", "mu", "nu")
+KELVIN = 273.15
+
+_CACHE_SIZE = 16
+_cache = OrderedDict()
+
+TABLES_DICT = "fluidPropertiesTables"
+
+DICTIONARY_TEMPLATE = """/*--------------------------------*- C++ -*----------------------------------*\\
+  =========                 |
+  \\\\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox
+   \\\\    /   O peration     | Website:  https://openfoam.org
+    \\\\  /    A nd           |
+     \\\\/     M anipulation  |
+\\*---------------------------------------------------------------------------*/
+FoamFile
+{
+    format      ascii;
+    class       dictionary;
+    location    "constant";
+    object      %s;
+}
+// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //
+
+
+// ************************************************************************* //
+"""
+
+
+class FluidProperties:
+    """Propriedades da salmoura. Os métodos aceitam escalares ou arrays NumPy (com broadcasting)."""
+
+    def __init__(self):
+        self.c0, self.c1, self.c2, self.c3 = (999.842594, 0.06793952, -0.00909529, 0.0001001685) # Example values
+        self.A, self.B = (0.0004831439, 0.000001617e-05) # Example values
+        self.mu_c_800 = 2.0
+        self.mu_w_base = 0.00089
+
+    def coefficients(self):
+        return (self.c0, self.c1, self.c2, self.c3, self.A, self.B, self.mu_c_800, self.mu_w_base)
+
+    def water_density(self, T, P):
+        """Calcula a densidade da água pura (rho_w) em função da temperatura (T) e pressão (P)."""
+        rho_0 = self.c0 + self.c1 * T + self.c2 * T**2 + self.c3 * T**3
+        rho_w = rho_0 + self.A * P + self.B * P**2
+        return rho_w
+
+    def brine_density(self, T, P, X):
+        """Calcula a densidade da salmoura (rho_b) em função de T, P e salinidade (X)."""
+        rho_w_TP = self.water_density(T, P)
+        rho_b = rho_w_TP + X * (1695 - rho_w_TP)
+        return rho_b
+
+    def brine_viscosity(self, T, P, X):
+        """Calcula a viscosidade da salmoura (mu_b) em função de T, P e salinidade (X)."""
+        T, X = np.asarray(T, dtype=float), np.asarray(X, dtype=float)
+        mixed = self.mu_w_base * (1 - X) + X * self.mu_c_800
+        cold, hot = ((800 - T) / 800) ** 9, (T / 800) ** 9
+        with np.errstate(divide="ignore", invalid="ignore"):
+            blended = (self.mu_w_base * (1 + 3 * X) * cold + hot * mixed) / (cold + hot)
+        # P não entra no modelo; só define o formato do resultado
+        mu_b = np.where(T < 800, blended, mixed) + np.zeros(np.shape(P))
+        return mu_b[()]
+
+    def properties(self, T, P, X):
+        """rho, mu e nu (= mu / rho) em T, P, X."""
+        rho = self.brine_density(T, P, X)
+        mu = self.brine_viscosity(T, P, X)
+        return {"rho": rho, "mu": mu, "nu": mu / rho}
+
+    def table(self, T, P, X):
+        """Tabela densa das propriedades numa grade T x P x X, com cache.
+
+        Cada eixo é (início, fim, pontos). Tabelas já calculadas com os mesmos coeficientes
+        e eixos são reaproveitadas.
+        """
+        axes = tuple((float(start), float(stop), int(count)) for start, stop, count in (T, P, X))
+        key = (self.coefficients(), axes)
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+        table = PropertyTable(*(np.linspace(*axis) for axis in axes), self)
+        _cache[key] = table
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+        return table
+
+
+class PropertyTable:
+    """Propriedades pré-calculadas numa grade (T, P, X), consultadas por interpolação trilinear.
+
+    Fora da grade os valores ficam nas bordas (como 'outOfBounds clamp' das tabelas do OpenFOAM).
+    """
+
+    def __init__(self, T, P, X, fluid):
+        self.axes = (np.asarray(T, dtype=float), np.asarray(P, dtype=float), np.asarray(X, dtype=float))
+        grid = np.meshgrid(*self.axes, indexing="ij")
+        self.values = fluid.properties(*grid)
+
+    def _weights(self, axis, values):
+        """Índice inferior, passo até o ponto superior (0 em eixo de um ponto) e peso do superior."""
+        if len(axis) == 1:
+            return np.zeros(values.shape, dtype=np.intp), 0, np.zeros(values.shape)
+        values = np.clip(values, axis[0], axis[-1])
+        lower = np.clip(np.searchsorted(axis, values, side="right") - 1, 0, len(axis) - 2)
+        weight = (values - axis[lower]) / (axis[lower + 1] - axis[lower])
+        return lower, 1, weight
+
+    def lookup(self, name, T, P, X):
+        """Interpola a propriedade 'name' (rho, mu ou nu) nos pontos dados (escalares ou arrays)."""
+        T, P, X = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (T, P, X)))
+        table = self.values[name]
+        strides = (table.shape[1] * table.shape[2], table.shape[2], 1)
+        (iT, dT, wT), (iP, dP, wP), (iX, dX, wX) = (self._weights(axis, values)
+                                                    for axis, values in zip(self.axes, (T, P, X)))
+        # Índices lineares na tabela achatada: 8 vértices da célula, interpolados eixo a eixo
+        flat = table.ravel()
+        base = iT * strides[0] + iP * strides[1] + iX
+        stepT, stepP = dT * strides[0], dP * strides[1]
+
+        def along_x(offset):
+            return flat[base + offset] * (1 - wX) + flat[base + offset + dX] * wX
+
+        low = along_x(0) * (1 - wP) + along_x(stepP) * wP
+        high = along_x(stepT) * (1 - wP) + along_x(stepT + stepP) * wP
+        return (low * (1 - wT) + high * wT)[()]
+
+    def density(self, T, P, X):
+        return self.lookup("rho", T, P, X)
+
+    def viscosity(self, T, P, X):
+        return self.lookup("mu", T, P, X)
+
+    def temperature_series(self, name, P, X):
+        """(T em K, valores) da propriedade ao longo do eixo de temperatura, em P e X fixos."""
+        T = self.axes[0]
+        return T + KELVIN, self.lookup(name, T, np.full(T.shape, P), np.full(T.shape, X))
+
+
+def write_csv(path, temperature, values, name):
+    """CSV de duas colunas (T em K, valor), lido pelo Function1 'table' com format csv."""
+    np.savetxt(path, np.column_stack([temperature, values]), delimiter=",", header=f"T,{name}",
+               comments="", fmt="%.10g")
+
+
+def _table_entries(constant, name, temperature, values, fmt):
+    if fmt == "csv":
+        csv_name = f"{name}Table.csv"
+        write_csv(os.path.join(constant, csv_name), temperature, values, name)
+        return {"type": "table", "format": "csv", "nHeaderLine": 1, "refColumn": 0,
+                "componentColumns": "(1)", "separator": '","', "mergeSeparators": "no",
+                "file": f'"$FOAM_CASE/constant/{csv_name}"'}
+    points = " ".join(f"({t:.10g} {v:.10g})" for t, v in zip(temperature, values))
+    return {"type": "table", "values": f"({points})"}
+
+
+def write_physical_properties(case_path, table, P, X, names=("rho", "nu"), fmt="table", replace=False):
+    """Grava as propriedades em função de T (P e X fixos) como Function1 da temperatura (em K).
+
+    'table' grava os pontos no dicionário; 'csv' grava constant/<nome>Table.csv e o referencia.
+    Por padrão as tabelas vão para constant/fluidPropertiesTables, com chaves <nome>Table, e o
+    physicalProperties não é tocado. Com replace=True as entradas de mesmo nome no
+    physicalProperties são substituídas, depois de copiá-lo para physicalProperties.<data>.bak;
+    cabe ao usuário ajustar o viscosityModel. Retorna o caminho do dicionário gravado.
+    """
+    constant = os.path.join(case_path, "constant")
+    os.makedirs(constant, exist_ok=True)
+    dict_name = "physicalProperties" if replace else TABLES_DICT
+    path = os.path.join(constant, dict_name)
+    if not os.path.exists(path):
+        with open(path, "w") as f:
+            f.write(DICTIONARY_TEMPLATE % dict_name)
+    elif replace:
+        shutil.copy2(path, f"{path}.{time.strftime('%Y%m%d-%H%M%S')}.bak")
+    keys = [name if replace else f"{name}Table" for name in names]
+    foam_dict.remove_entries(path, keys)
+    for name, key in zip(names, keys):
+        temperature, values = table.temperature_series(name, P, X)
+        foam_dict.set_subdict(path, key, _table_entries(constant, name, temperature, values, fmt))
+    return path
@@ -0,0 +1,85 @@
+import os
+
+import foam_dict
+
+
+def time_value(name):
+    """Converte o nome de um diretório de tempo em float (None se não for um tempo)."""
+    try:
+        return float(name)
+    except ValueError:
+        return None
+
+
+def list_time_dirs(path, include_zero=True):
+    """Lista os diretórios de tempo de 'path' ordenados pelo valor do tempo: [(tempo, nome)]."""
+    if not os.path.isdir(path):
+        return []
+    times = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            value = time_value(entry.name)
+            if value is None or not entry.is_dir():
+                continue
+            if value == 0 and not include_zero:
+                continue
+            times.append((value, entry.name))
+    times.sort()
+    return times
+
+
+def processor_dirs(case_path):
+    """Lista os diretórios processor* do caso, ordenados pelo número do processador."""
+    if not os.path.isdir(case_path):
+        return []
+    names = [name for name in os.listdir(case_path)
+             if name.startswith("processor") and name[len("processor"):].isdigit()
+             and os.path.isdir(os.path.join(case_path, name))]
+    return sorted(names, key=lambda name: int(name[len("processor"):]))
+
+
+def latest_time(case_path):
+    """Último tempo escrito no caso: nos diretórios reconstruídos ou em processor0."""
+    candidates = list_time_dirs(case_path)
+    processors = processor_dirs(case_path)
+    if processors:
+        candidates += list_time_dirs(os.path.join(case_path, processors[0]))
+    return max(candidates)[0] if candidates else None
+
+
+def common_processor_times(case_path):
+    """Tempos presentes em todos os processor*, ordenados: [(tempo, nome)]."""
+    common = None
+    for processor in processor_dirs(case_path):
+        names = {name: value for value, name in list_time_dirs(os.path.join(case_path, processor))}
+        common = names if common is None else {n: v for n, v in common.items() if n in names}
+    return sorted((value, name) for name, value in (common or {}).items())
+
+
+def decomposed_latest_time(case_path):
+    """Último tempo comum a todos os processor*.
+
+    Retorna (nome do tempo, {processor: último tempo}) ou (None, {...}) se não
+    houver tempo presente em todos os processadores. Os ranks estão consistentes
+    quando todos os valores do dicionário são iguais ao tempo retornado.
+    """
+    processors = processor_dirs(case_path)
+    latest_by_rank = {}
+    common = None
+    for processor in processors:
+        times = list_time_dirs(os.path.join(case_path, processor))
+        latest_by_rank[processor] = times[-1][0] if times else None
+        names = {value: name for value, name in times}
+        common = names if common is None else {v: n for v, n in common.items() if v in names}
+    if not common:
+        return None, latest_by_rank
+    return common[max(common)], latest_by_rank
+
+
+def number_of_subdomains(case_path):
+    """numberOfSubdomains do system/decomposeParDict (None se ausente)."""
+    path = os.path.join(case_path, "system", "decomposeParDict")
+    if not os.path.exists(path):
+        return None
+    value = foam_dict.read(path).get("numberOfSubdomains")
+    return value if isinstance(value, int) else None
@@ -0,0 +1,255 @@
+import os
+import re
+
+_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}();]|[^\s{}();"]+')
+
+
+def strip_comments(text):
+    """Remove comentários // e /* */ de um dicionário OpenFOAM."""
+    text = re.sub(r'/\*.*?\*/', ' ', text, flags=re.S)
+    return re.sub(r'//[^\n]*', ' ', text)
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(strip_comments(text))
+
+
+def _parse_entries(tokens, pos, end_token=None):
+    entries = {}
+    while pos < len(tokens):
+        token = tokens[pos]
+        if token == end_token:
+            return entries, pos + 1
+        if token == ';':
+            pos += 1
+            continue
+        key = token.strip('"')
+        pos += 1
+        if pos < len(tokens) and tokens[pos] == '{':
+            value, pos = _parse_entries(tokens, pos + 1, '}')
+            entries[key] = value
+            continue
+        value_tokens = []
+        depth = 0
+        while pos < len(tokens):
+            tok = tokens[pos]
+            if tok == '(':
+                depth += 1
+            elif tok == ')':
+                depth -= 1
+            elif tok == ';' and depth <= 0:
+                pos += 1
+                break
+            elif tok == '}' and depth <= 0:
+                break
+            value_tokens.append(tok)
+            pos += 1
+        entries[key] = _convert_value(value_tokens)
+    return entries, pos
+
+
+def _convert_value(tokens):
+    if len(tokens) == 1:
+        token = tokens[0]
+        if token.startswith('"'):
+            return token.strip('"')
+        try:
+            return int(token)
+        except ValueError:
+            pass
+        try:
+            return float(token)
+        except ValueError:
+            return token
+    return " ".join(tokens)
+
+
+def parse(text):
+    """Converte o texto de um dicionário OpenFOAM em dicts aninhados."""
+    entries, _ = _parse_entries(tokenize(text), 0)
+    return entries
+
+
+def read(path):
+    """Lê e interpreta um dicionário OpenFOAM. Retorna {} se o arquivo não existir."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", errors="replace") as f:
+        return parse(f.read())
+
+
+def _format_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def set_entries(path, entries):
+    """Altera entradas de primeiro nível ('chave valor;') preservando o restante do arquivo.
+
+    Entradas inexistentes são adicionadas antes da linha final '// ****'.
+    Retorna os valores anteriores (None para as que não existiam), útil para restaurar.
+    """
+    with open(path, "r") as f:
+        text = f.read()
+    previous = {}
+    for key, value in entries.items():
+        # Apenas entradas sem indentação: as de subdicionários não são alteradas
+        pattern = re.compile(r'^' + re.escape(key) + r'(?P<space>[ \t]+)(?P<value>[^;{}\n]*);', re.M)
+        match = pattern.search(text)
+        if match:
+            previous[key] = match.group("value").strip()
+            replacement = f"{key}{match.group('space')}{_format_value(value)};"
+            text = text[:match.start()] + replacement + text[match.end():]
+        else:
+            previous[key] = None
+            line = f"{key:<16}{_format_value(value)};\n"
+            footer = text.rfind("// ****")
+            if footer != -1:
+                text = text[:footer] + line + "\n" + text[footer:]
+            else:
+                text = text.rstrip("\n") + "\n" + line
+    with open(path, "w") as f:
+        f.write(text)
+    return previous
+
+
+def set_subdict(path, name, entries):
+    """Substitui (ou cria) o subdicionário de primeiro nível 'name { ... }' com as entradas dadas."""
+    with open(path, "r") as f:
+        text = f.read()
+    # Chaves com 12 caracteres ou mais (ex.: componentColumns) ainda ficam separadas do valor
+    body = "".join(f"    {key:<11} {_format_value(value)};\n" for key, value in entries.items())
+    block = f"{name}\n{{\n{body}}}\n"
+    # Subdicionários de coeficientes não têm chaves aninhadas
+    pattern = re.compile(r'^' + re.escape(name) + r'\s*\{[^{}]*\}[ \t]*\n?', re.M)
+    match = pattern.search(text)
+    if match:
+        text = text[:match.start()] + block + text[match.end():]
+    else:
+        footer = text.rfind("// ****")
+        if footer != -1:
+            text = text[:footer] + block + "\n" + text[footer:]
+        else:
+            text = text.rstrip("\n") + "\n\n" + block
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def remove_entries(path, keys):
+    """Remove entradas de primeiro nível ('chave valor;' ou subdicionário 'chave { ... }' sem chaves aninhadas).
+
+    Retorna as chaves que existiam.
+    """
+    with open(path, "r") as f:
+        text = f.read()
+    removed = []
+    for key in keys:
+        pattern = re.compile(r'^' + re.escape(key) + r'(?:[ \t]+[^;{}\n]*;|\s*\{[^{}]*\})[ \t]*\n?(?:[ \t]*\n)?', re.M)
+        text, count = pattern.subn("", text)
+        if count:
+            removed.append(key)
+    with open(path, "w") as f:
+        f.write(text)
+    return removed
+
+
+def _blank_comments(text):
+    """Como strip_comments, mas troca os comentários por espaços e preserva as posições do texto."""
+    return re.sub(r'/\*.*?\*/|//[^\n]*', lambda m: re.sub(r'[^\n]', ' ', m.group()), text, flags=re.S)
+
+
+def _scan_level(tokens, pos, end_token=None):
+    """Entradas de um nível: chave -> (índice da chave, primeiro e último+1 índices do valor, é subdicionário).
+
+    Retorna também o índice do token que fecha o nível ('}' ou o fim da lista).
+    """
+    entries = {}
+    while pos < len(tokens):
+        token = tokens[pos].group()
+        if token == end_token:
+            return entries, pos
+        if token == ';':
+            pos += 1
+            continue
+        key, key_index = token.strip('"'), pos
+        pos += 1
+        if key.startswith('#'):
+            # Diretivas (#include, #includeEtc...) não terminam com ';'
+            pos += 1
+            continue
+        if pos < len(tokens) and tokens[pos].group() == '{':
+            start, depth = pos, 0
+            while pos < len(tokens):
+                depth += {'{': 1, '}': -1}.get(tokens[pos].group(), 0)
+                pos += 1
+                if depth == 0:
+                    break
+            entries[key] = (key_index, start, pos, True)
+            continue
+        start, depth = pos, 0
+        while pos < len(tokens):
+            tok = tokens[pos].group()
+            if tok == '(':
+                depth += 1
+            elif tok == ')':
+                depth -= 1
+            elif tok in (';', '}') and depth <= 0:
+                break
+            pos += 1
+        entries[key] = (key_index, start, pos, False)
+        if pos < len(tokens) and tokens[pos].group() == ';':
+            pos += 1
+    return entries, pos
+
+
+def replace_entry(text, key_path, value):
+    """Altera (ou cria) a entrada 'a/b/c' (c no subdicionário b de a) no texto de um dicionário.
+
+    Os subdicionários intermediários precisam existir. Retorna (novo texto, valor anterior ou None).
+    """
+    keys = key_path.split("/")
+    tokens = list(_TOKEN_RE.finditer(_blank_comments(text)))
+    pos, end_token, depth = 0, None, 0
+    for key in keys[:-1]:
+        entries, _ = _scan_level(tokens, pos, end_token)
+        if key not in entries or not entries[key][3]:
+            raise ValueError(f"subdicionário '{key}' não encontrado ({key_path})")
+        pos, end_token, depth = entries[key][1] + 1, '}', depth + 1
+    entries, close = _scan_level(tokens, pos, end_token)
+    key = keys[-1]
+    formatted = _format_value(value)
+    if key in entries:
+        key_index, start, end, is_dict = entries[key]
+        if is_dict:
+            raise ValueError(f"'{key_path}' é um subdicionário, não um valor")
+        if end > start:
+            previous = text[tokens[start].start():tokens[end - 1].end()]
+            return text[:tokens[start].start()] + formatted + text[tokens[end - 1].end():], previous
+        # Entrada sem valor ('chave;'): o valor entra logo depois da chave
+        at = tokens[key_index].end()
+        return text[:at] + " " + formatted + text[at:], None
+    line = f"{'    ' * depth}{key:<16}{formatted};\n"
+    if end_token is None:
+        footer = text.rfind("// ****")
+        if footer != -1:
+            return text[:footer] + line + "\n" + text[footer:], None
+        return text.rstrip("\n") + "\n" + line, None
+    # Antes do '}' que fecha o subdicionário, no início da linha dele
+    at = text.rfind("\n", 0, tokens[close].start()) + 1
+    return text[:at] + line + text[at:], None
+
+
+def set_nested_entries(path, entries, output=None):
+    """Aplica replace_entry para cada 'a/b/c': valor e grava em 'output' (padrão: o próprio arquivo).
+
+    Retorna os valores anteriores.
+    """
+    with open(path, "r") as f:
+        text = f.read()
+    previous = {}
+    for key_path, value in entries.items():
+        text, previous[key_path] = replace_entry(text, key_path, value)
+    with open(output or path, "w") as f:
+        f.write(text)
+    return previous
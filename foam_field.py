@@ -0,0 +1,116 @@
+import mmap
+import os
+import re
+import zlib
+
+import numpy as np
+
+import foam_dict
+
+HEADER_RE = re.compile(rb'FoamFile\s*\{(.*?)\}', re.S)
+NONUNIFORM_RE = re.compile(rb'internalField\s+nonuniform\s+List<(\w+)>\s*(\d+)\s*\(')
+UNIFORM_RE = re.compile(rb'internalField\s+uniform\s+([^;]+);')
+
+COMPONENTS = {"scalar": 1, "vector": 3, "symmTensor": 6, "tensor": 9, "sphericalTensor": 1}
+SUPPORTED_CLASSES = ("volScalarField", "volVectorField")
+
+# Parênteses dos vetores viram espaços para o parser de texto do NumPy
+_PARENTHESES = bytes.maketrans(b"()", b"  ")
+
+
+def resolve_path(path):
+    """Caminho real do campo: 'U' ou 'U.gz' (writeCompression on)."""
+    if not os.path.exists(path) and os.path.exists(path + ".gz"):
+        return path + ".gz"
+    return path
+
+
+def load_bytes(path):
+    """Conteúdo do arquivo sem cópia (mmap somente leitura) ou descompactado, se for '.gz'."""
+    with open(path, "rb") as f:
+        if path.endswith(".gz"):
+            # wbits=31: formato gzip, mais rápido que o módulo gzip para o arquivo inteiro
+            return zlib.decompress(f.read(), 31)
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_header(data):
+    """Lê o dicionário FoamFile do início do arquivo (bytes)."""
+    match = HEADER_RE.search(data[:4096])
+    if not match:
+        return {}
+    return foam_dict.parse(match.group(1).decode("ascii", "replace"))
+
+
+def _scalar_dtype(header):
+    arch = str(header.get("arch", ""))
+    size = re.search(r'scalar=(\d+)', arch)
+    return np.float32 if size and size.group(1) == "32" else np.float64
+
+
+def _parse_uniform(text):
+    text = text.decode("ascii", "replace").strip()
+    return np.array(text.strip("()").split(), dtype=float) if text.startswith("(") else np.array(float(text))
+
+
+def _parse_ascii(data, start, count, components):
+    """Converte o bloco '( ... )' em texto com uma única passada do parser C do NumPy."""
+    end = data.find(b"\n)", start) if components > 1 else data.find(b")", start)
+    if end == -1:
+        raise ValueError("fim da lista não encontrado")
+    payload = data[start:end]
+    if components > 1:
+        payload = payload.translate(_PARENTHESES)
+    values = np.fromstring(payload, dtype=np.float64, sep=" ")
+    if values.size != count * components:
+        raise ValueError(f"esperados {count * components} valores, lidos {values.size}")
+    return values
+
+
+def parse_field(data):
+    """Interpreta o conteúdo de um campo vol*Field.
+
+    Retorna {'class', 'format', 'uniform' (bool), 'values'}: para campos não
+    uniformes 'values' tem forma (n,) ou (n, componentes); para uniformes é o valor único.
+    Em arquivos binários 'values' é uma view somente leitura sobre 'data'.
+    """
+    header = read_header(data)
+    field = {"class": header.get("class"), "format": header.get("format", "ascii"), "uniform": False}
+    match = NONUNIFORM_RE.search(data)
+    if not match:
+        uniform = UNIFORM_RE.search(data)
+        if not uniform:
+            raise ValueError("internalField não encontrado")
+        field["uniform"] = True
+        field["values"] = _parse_uniform(uniform.group(1))
+        return field
+
+    components = COMPONENTS.get(match.group(1).decode(), 1)
+    count = int(match.group(2))
+    start = match.end()
+    if field["format"] == "binary":
+        values = np.frombuffer(data, dtype=_scalar_dtype(header), count=count * components, offset=start)
+    else:
+        values = _parse_ascii(data, start, count, components)
+    field["values"] = values.reshape(count, components) if components > 1 else values
+    return field
+
+
+def read_field(path):
+    """Lê o internalField de um arquivo de campo OpenFOAM (ASCII, binário ou .gz)."""
+    return parse_field(load_bytes(resolve_path(path)))
+
+
+def field_class(path):
+    """Classe do campo (volScalarField, ...) lida apenas do cabeçalho, ou None."""
+    path = resolve_path(path)
+    try:
+        with open(path, "rb") as f:
+            head = f.read(4096)
+            if path.endswith(".gz"):
+                head = zlib.decompressobj(31).decompress(head)
+            return read_header(head).get("class")
+    except (OSError, zlib.error):
+        return None
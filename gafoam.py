@@ -0,0 +1,425 @@
+"""GAFoam em linha de comando: executa e acompanha casos sem a interface gráfica.
+
+    gafoam                                abre a interface gráfica
+    gafoam run <caso> [--detach]          executa o solver e acompanha o log
+    gafoam watch <caso> [--pid N]         acompanha uma execução já iniciada
+    gafoam status [<caso>]                estado das execuções (do caso ou do daemon)
+    gafoam history [--limit N]            histórico de simulações
+    gafoam export <caso> | --entry N      séries do log em .npz ou .csv
+    gafoam daemon [--port N]              daemon que acompanha as execuções em segundo plano
+    gafoam api /runs/0/series?name=deltaT consulta a API de monitoramento do daemon
+    gafoam events [--run N]               eventos do parser em tempo real (WebSocket)
+    gafoam study <base> <saída> --param   gera variantes de um caso (e as coloca na fila do daemon)
+
+Com --detach a execução é entregue ao daemon (iniciado automaticamente), que continua
+acompanhando o log e aplicando o watchdog depois que o terminal ou a interface fecham.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time as _time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import foam_dict  # noqa: E402
+import monitor_daemon  # noqa: E402
+import monitoring_api  # noqa: E402
+import parametric_study  # noqa: E402
+import run_monitor  # noqa: E402
+from metrics_store import MetricsStore  # noqa: E402
+from simulation_history import SimulationHistory  # noqa: E402
+
+CONFIG_FILE = "config.json"
+HISTORY_FILE = "simulation_history.json"
+
+
+def _config():
+    if os.path.exists(CONFIG_FILE):
+        with open(CONFIG_FILE, "r") as f:
+            return json.load(f)
+    return {}
+
+
+def _format(value, spec=".4g"):
+    return "-" if value is None else format(value, spec)
+
+
+def progress_line(status):
+    residuals = " ".join(f"{field} {value:.2e}" for field, value in sorted(status["residuals"].items()))
+    parts = [
+        f"t = {_format(status['time'])}",
+        f"passo {status['steps']}",
+        f"deltaT {_format(status['deltaT'], '.3g')}",
+        f"Co {_format(status['courant_max'], '.3g')}",
+    ]
+    if status.get("parcels") is not None:
+        parts.append(f"parcelas {status['parcels']:.0f}")
+    parts.append(f"clock {_format(status['clock_time'], '.0f')} s")
+    if residuals:
+        parts.append(residuals)
+    return " | ".join(parts)
+
+
+def follow(job, interval, print_every):
+    """Conduz o RunJob em primeiro plano até o fim, imprimindo o progresso.
+
+    Ctrl+C pede a parada com checkpoint (writeNow); um segundo Ctrl+C só encerra o
+    monitor, deixando a simulação em execução.
+    """
+    printed = 0
+    last_print = 0.0
+    interrupted = False
+    while True:
+        try:
+            status = job.poll()
+            new = job.note_count - printed
+            for message in list(job.messages)[-new:] if new else []:
+                print(message, flush=True)
+            printed = job.note_count
+            now = _time.monotonic()
+            if not job.busy():
+                print(progress_line(status), flush=True)
+                return 0 if job.state == "finished" else 1
+            if now - last_print >= print_every and status["steps"]:
+                print(progress_line(status), flush=True)
+                last_print = now
+            _time.sleep(job.poll_delay(interval))
+        except KeyboardInterrupt:
+            if interrupted or job.pid is None:
+                print(f"Monitor encerrado; a simulação continua (pid {job.pid}). "
+                      f"Use 'gafoam watch {job.case_path} --pid {job.pid}' para acompanhar de novo.")
+                return 130
+            interrupted = True
+            print("Parada solicitada (Ctrl+C de novo para apenas sair do monitor)...", flush=True)
+            job.request_stop()
+
+
+def command_run(args):
+    case = os.path.abspath(args.case)
+    control_path = os.path.join(case, "system", "controlDict")
+    if not os.path.exists(control_path):
+        print(f"Erro: {control_path} não encontrado.", file=sys.stderr)
+        return 2
+    if args.end_time:
+        foam_dict.set_entries(control_path, {"endTime": args.end_time})
+    command = args.command or run_monitor.solver_command(case, args.solver, args.np)
+    prefix = run_monitor.openfoam_prefix(args.openfoam)
+    if args.detach:
+        monitor_daemon.submit_job({"case": case, "command": command, "shell_prefix": prefix, "solver": args.solver,
+                                   "history": args.history, "watchdog": not args.no_watchdog},
+                                  args.home)
+        pid = monitor_daemon.ensure_daemon(args.home, args.history)
+        print(f"Execução entregue ao daemon (pid {pid}). Acompanhe com 'gafoam status {case}'.")
+        return 0
+    job = run_monitor.RunJob(case, command=command, solver=args.solver, history=SimulationHistory(args.history),
+                             shell_prefix=prefix, watchdog=not args.no_watchdog)
+    job.start()
+    return follow(job, args.interval, args.print_every)
+
+
+def command_watch(args):
+    case = os.path.abspath(args.case)
+    history = SimulationHistory(args.history) if args.record else None
+    if args.detach:
+        monitor_daemon.submit_job({"case": case, "pid": args.pid, "solver": args.solver,
+                                   "history": args.history if args.record else None,
+                                   "watchdog": not args.no_watchdog, "from_start": not args.from_end},
+                                  args.home)
+        pid = monitor_daemon.ensure_daemon(args.home, args.history)
+        print(f"Acompanhamento entregue ao daemon (pid {pid}).")
+        return 0
+    job = run_monitor.RunJob(case, solver=args.solver, pid=args.pid, log_name=args.log, history=history,
+                             watchdog=not args.no_watchdog, from_start=not args.from_end)
+    job.start()
+    return follow(job, args.interval, args.print_every)
+
+
+def print_status(status):
+    print(f"{status['case']}: {status['state']}"
+          + ("" if status.get("monitor_alive", True) else " (monitor encerrado; estado desatualizado)"))
+    print(f"  pid {status.get('pid')}  início {status.get('start_time')}  atualizado {status.get('updated')}")
+    if status.get("steps"):
+        print("  " + progress_line(status))
+    for trigger in status.get("watchdog", []):
+        print(f"  watchdog [{trigger['rule']}] t = {trigger['time']}: {trigger['message']} → {trigger['action']}")
+    for alert in status.get("alerts", [])[-3:]:
+        print(f"  alerta t = {alert['time']}: {alert['message']}")
+
+
+def command_status(args):
+    if args.case:
+        status = run_monitor.read_status(os.path.abspath(args.case))
+        if status is None:
+            print(f"Nenhum {run_monitor.STATUS_FILE} em {args.case}.")
+            return 1
+        if args.json:
+            print(json.dumps(status, indent=4))
+        else:
+            print_status(status)
+        return 0
+    state = monitor_daemon.read_state(args.home)
+    pid = monitor_daemon.daemon_pid(args.home)
+    if args.json:
+        print(json.dumps(state, indent=4))
+        return 0
+    print(f"Daemon: {'pid ' + str(pid) if pid else 'parado'}")
+    for job in (state or {}).get("jobs", []):
+        status = run_monitor.read_status(job["case"])
+        if status:
+            print_status(status)
+        else:
+            print(f"{job['case']}: {job['state']}")
+    queued = (state or {}).get("queued", [])
+    if queued:
+        print(f"Na fila: {len(queued)} execução(ões), a próxima é {queued[0]['case']}")
+    return 0
+
+
+def command_history(args):
+    entries = SimulationHistory(args.history).get_history()
+    selected = list(enumerate(entries))[-args.limit:] if args.limit else list(enumerate(entries))
+    if args.json:
+        print(json.dumps([entry for _, entry in selected], indent=4))
+        return 0
+    print(f"{'#':>4}  {'Início':19}  {'Fim':19}  {'Status':20}  {'Passos':>7}  {'Parede':>9}  Caso")
+    for index, entry in selected:
+        summary = entry.get("summary") or {}
+        metrics = entry.get("metrics") or {}
+        steps = summary.get("steps", metrics.get("steps"))
+        wall = summary.get("wall_time", metrics.get("clock_time"))
+        print(f"{index + 1:>4}  {entry.get('start_time', ''):19}  {entry.get('end_time', ''):19}  "
+              f"{entry.get('status', ''):20}  {_format(steps, 'd') if steps is not None else '-':>7}  "
+              f"{_format(wall, '.0f') + ' s' if wall is not None else '-':>9}  {entry.get('case_path', '')}")
+    return 0
+
+
+def write_csv(store, directory):
+    """Uma planilha por tabela do MetricsStore: <diretório>/<tabela>.csv."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, table in store.tables.items():
+        if not len(table):
+            continue
+        path = os.path.join(directory, f"{name}.csv")
+        columns = list(table.columns)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(zip(*(table.data[column] for column in columns)))
+        paths.append(path)
+    return paths
+
+
+def command_export(args):
+    if args.entry:
+        history = SimulationHistory(args.history)
+        entries = history.get_history()
+        if not 1 <= args.entry <= len(entries):
+            print(f"Erro: entrada {args.entry} inexistente (1 a {len(entries)}).", file=sys.stderr)
+            return 2
+        path = history.metrics_path(entries[args.entry - 1])
+        if path is None:
+            print("Erro: a entrada não tem séries gravadas.", file=sys.stderr)
+            return 1
+        store = MetricsStore.load(path)
+        default = f"run{args.entry}"
+    elif args.case:
+        log_path = os.path.join(os.path.abspath(args.case), args.log)
+        if not os.path.exists(log_path):
+            print(f"Erro: {log_path} não encontrado.", file=sys.stderr)
+            return 1
+        store = run_monitor.parse_log(log_path).parser.store
+        default = os.path.join(args.case, "gafoam_export")
+    else:
+        print("Erro: informe o caso ou --entry.", file=sys.stderr)
+        return 2
+    if args.format == "npz":
+        output = args.output or default + ".npz"
+        store.save(output)
+        print(f"Séries exportadas para {output}")
+    else:
+        for path in write_csv(store, args.output or default):
+            print(f"Exportado: {path}")
+    return 0
+
+
+def command_daemon(args):
+    try:
+        monitor_daemon.MonitorDaemon(args.home, args.interval, args.history, args.queue_slots).run(
+            api=not args.no_api, host=args.host, port=args.port)
+    except RuntimeError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def api_client(args):
+    address = args.address or monitor_daemon.api_address(args.home)
+    if not address:
+        print("Erro: nenhum daemon com API em execução (use 'gafoam daemon' ou --address).", file=sys.stderr)
+        return None
+    return monitoring_api.ApiClient.from_address(address)
+
+
+def command_api(args):
+    client = api_client(args)
+    if client is None:
+        return 1
+    try:
+        print(json.dumps(client.get(args.path), indent=4))
+    except monitoring_api.ApiError as e:
+        print(f"Erro {e.status}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def command_events(args):
+    client = api_client(args)
+    if client is None:
+        return 1
+    query = []
+    if args.run is not None:
+        query.append(f"run={args.run}")
+    if args.types:
+        query.append(f"types={args.types}")
+    try:
+        for event in client.events("/ws" + ("?" + "&".join(query) if query else "")):
+            print(json.dumps(event), flush=True)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def command_study(args):
+    space = {}
+    try:
+        for text in args.param:
+            path, key, values = parametric_study.parse_parameter(text)
+            space[(path, key)] = values
+        manifest = parametric_study.generate(args.base, args.output, space, args.mode, args.link, args.prefix)
+    except (ValueError, OSError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 2
+    links = ", ".join(f"{method} {count}" for method, count in manifest["link"].items() if count)
+    print(f"{len(manifest['variants'])} variante(s) em {os.path.abspath(args.output)} "
+          f"({links or 'nenhum arquivo compartilhado'}; {manifest['shared_bytes'] / 1e9:.3g} GB não copiados)")
+    if args.submit:
+        pid = parametric_study.submit(manifest, args.solver, run_monitor.openfoam_prefix(args.openfoam),
+                                      args.history, args.home)
+        print(f"Variantes na fila do daemon (pid {pid}). Acompanhe com 'gafoam status'.")
+    return 0
+
+
+def command_gui(args):
+    # main.py lê --profile-startup e --no-tree de sys.argv (o primeiro antes das próprias importações)
+    import main
+    return main.launch()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="gafoam", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", default=os.environ.get("GAFOAM_HISTORY", HISTORY_FILE),
+                        help="arquivo do histórico de simulações")
+    parser.add_argument("--home", default=None, help="diretório do daemon (padrão: GAFOAM_HOME ou ~/.gafoam)")
+    commands = parser.add_subparsers(dest="command")
+
+    def monitored(sub):
+        sub.add_argument("case")
+        sub.add_argument("--solver", default=run_monitor.DEFAULT_SOLVER)
+        sub.add_argument("--no-watchdog", action="store_true", help="não aplica as regras do watchdog.json")
+        sub.add_argument("--detach", action="store_true", help="entrega o acompanhamento ao daemon e sai")
+        sub.add_argument("--interval", type=float, default=1.0, help="intervalo de leitura do log (s)")
+        sub.add_argument("--print-every", type=float, default=10.0, help="intervalo entre as linhas de progresso (s)")
+
+    run = commands.add_parser("run", help="executa o solver e acompanha o log")
+    monitored(run)
+    run.add_argument("--np", type=int, default=None, help="número de processos MPI (padrão: processor* do caso)")
+    run.add_argument("--command", default=None, help="comando no lugar do solver (ex.: ./Allrunparallel)")
+    run.add_argument("--end-time", default=None, help="novo endTime no controlDict")
+    run.add_argument("--openfoam", default=_config().get("openFOAMVersion", "openfoam12"),
+                     help="versão em /opt cujo etc/bashrc é carregado ('' para nenhuma)")
+    run.set_defaults(func=command_run)
+
+    watch = commands.add_parser("watch", help="acompanha uma execução já iniciada")
+    monitored(watch)
+    watch.add_argument("--pid", type=int, default=None, help="pid do solver (sem ele, o fim é o 'End' do log)")
+    watch.add_argument("--log", default=run_monitor.LOG_FILE)
+    watch.add_argument("--from-end", action="store_true", help="ignora o conteúdo já escrito no log")
+    watch.add_argument("--record", action="store_true", help="registra a execução no histórico ao final")
+    watch.set_defaults(func=command_watch)
+
+    status = commands.add_parser("status", help="estado das execuções")
+    status.add_argument("case", nargs="?")
+    status.add_argument("--json", action="store_true")
+    status.set_defaults(func=command_status)
+
+    history = commands.add_parser("history", help="histórico de simulações")
+    history.add_argument("--limit", type=int, default=20)
+    history.add_argument("--json", action="store_true")
+    history.set_defaults(func=command_history)
+
+    export = commands.add_parser("export", help="exporta as séries do log")
+    export.add_argument("case", nargs="?")
+    export.add_argument("--entry", type=int, default=None, help="entrada do histórico (numeração de 'gafoam history')")
+    export.add_argument("--log", default=run_monitor.LOG_FILE)
+    export.add_argument("--format", choices=("npz", "csv"), default="npz")
+    export.add_argument("--output", default=None)
+    export.set_defaults(func=command_export)
+
+    daemon = commands.add_parser("daemon", help="daemon de monitoramento")
+    daemon.add_argument("--interval", type=float, default=1.0)
+    daemon.add_argument("--port", type=int, default=None,
+                        help="serve a API em TCP nesta porta (padrão: apenas o socket unix em ~/.gafoam)")
+    daemon.add_argument("--host", default="127.0.0.1")
+    daemon.add_argument("--no-api", action="store_true", help="não inicia a API de monitoramento")
+    daemon.add_argument("--queue-slots", type=int, default=monitor_daemon.QUEUE_SLOTS,
+                        help="execuções da fila (ex.: gafoam study --submit) rodando ao mesmo tempo")
+    daemon.set_defaults(func=command_daemon)
+
+    api = commands.add_parser("api", help="consulta a API de monitoramento")
+    api.add_argument("path", nargs="?", default="/status")
+    api.add_argument("--address", default=None, help="unix:<socket> ou http://host:porta (padrão: o do daemon)")
+    api.set_defaults(func=command_api)
+
+    events = commands.add_parser("events", help="eventos do parser em tempo real")
+    events.add_argument("--run", type=int, default=None)
+    events.add_argument("--types", default=None, help="tipos separados por vírgula (ex.: residual,timestep)")
+    events.add_argument("--address", default=None)
+    events.set_defaults(func=command_events)
+
+    study = commands.add_parser("study", help="gera variantes de um caso para um estudo paramétrico")
+    study.add_argument("base", help="caso modelo")
+    study.add_argument("output", help="pasta das variantes (e do study.json)")
+    study.add_argument("--param", action="append", required=True,
+                       help="arquivo:chave/subchave=v1,v2,... (ex.: system/controlDict:endTime=1,2); repetível")
+    study.add_argument("--mode", choices=("grid", "zip"), default="grid",
+                       help="grid: todas as combinações; zip: i-ésimos valores juntos")
+    study.add_argument("--link", choices=parametric_study.LINK_MODES, default="auto",
+                       help="como replicar constant/polyMesh e 0/ (auto: reflink, senão hardlink, senão cópia)")
+    study.add_argument("--prefix", default="variant", help="prefixo das pastas das variantes")
+    study.add_argument("--submit", action="store_true", help="coloca as variantes na fila do daemon")
+    study.add_argument("--solver", default=run_monitor.DEFAULT_SOLVER)
+    study.add_argument("--openfoam", default=_config().get("openFOAMVersion", "openfoam12"),
+                       help="versão em /opt cujo etc/bashrc é carregado ('' para nenhuma)")
+    study.set_defaults(func=command_study)
+
+    gui = commands.add_parser("gui", help="abre a interface gráfica")
+    gui.add_argument("--profile-startup", action="store_true",
+                     help="mede a abertura (importações, construtor, primeira pintura), imprime e sai")
+    gui.add_argument("--no-tree", action="store_true", help="abre sem o painel da árvore de arquivos do caso")
+    gui.set_defaults(func=command_gui)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        return command_gui(args)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+import re
+
+from cloud_stats import CLOUD_COLUMNS, CloudBlockParser
+from convergence import ConvergenceMonitor
+from metrics_store import MetricsStore
+from profiling import EXECUTION_TIME_RE, TIME_RE
+
+FLOAT = r'(-?nan|-?inf|[0-9.eE+-]+)'
+COURANT_RE = re.compile(rf'^Courant Number mean: {FLOAT} max: {FLOAT}')
+DELTA_T_RE = re.compile(rf'^deltaT = {FLOAT}')
+SOLVER_RE = re.compile(
+    rf'^(\w+):\s+Solving for ([\w.:]+), Initial residual = {FLOAT}, '
+    rf'Final residual = {FLOAT}, No Iterations (\d+)'
+)
+
+SOLVER_COLUMNS = {
+    "time": 'd',
+    "corrector": 'i',
+    "field": None,
+    "solver": None,
+    "initial": 'd',
+    "final": 'd',
+    "iterations": 'i',
+}
+
+TIMESTEP_COLUMNS = {
+    "time": 'd',
+    "deltaT": 'd',
+    "courant_mean": 'd',
+    "courant_max": 'd',
+}
+
+TIMING_COLUMNS = {
+    "time": 'd',
+    "execution_time": 'd',
+    "clock_time": 'd',
+}
+
+
+class FoamLogParser:
+    """Converte as linhas do log do solver em eventos e alimenta o MetricsStore.
+
+    Cada chamada de feed() retorna a lista de eventos (dicts com a chave 'type')
+    gerados pela linha: 'time', 'timestep', 'timing', 'residual', 'cloud' e 'alert'.
+    """
+
+    def __init__(self, store=None, monitor=None):
+        self.store = store if store is not None else MetricsStore()
+        self.monitor = monitor if monitor is not None else ConvergenceMonitor()
+        self.solverTable = self.store.table("solver", SOLVER_COLUMNS)
+        self.timestepTable = self.store.table("timestep", TIMESTEP_COLUMNS)
+        self.timingTable = self.store.table("timing", TIMING_COLUMNS)
+        self.cloudTable = self.store.table("cloud", CLOUD_COLUMNS)
+        self.cloudBlock = CloudBlockParser()
+        self.current_time = None
+        self._correctors = {}
+        self._pending_step = {}
+
+    def reset(self):
+        self.store.clear()
+        self.monitor.reset()
+        self.current_time = None
+        self._correctors = {}
+        self._pending_step = {}
+        self.cloudBlock = CloudBlockParser()
+
+    def feed(self, line):
+        line = line.strip()
+        events = []
+        if self.cloudBlock.active:
+            if not self._ends_cloud_block(line) and self.cloudBlock.feed(line):
+                return events
+            events.append(self._finish_cloud_block())
+        if not line:
+            return events
+        events.extend(self._parse_line(line))
+        return events
+
+    @staticmethod
+    def _ends_cloud_block(line):
+        """Linhas reconhecidas pelo parser principal encerram o bloco 'Cloud:' mesmo sem linha em branco."""
+        return any(regex.match(line) for regex in (TIME_RE, SOLVER_RE, COURANT_RE, DELTA_T_RE)) \
+            or EXECUTION_TIME_RE.search(line) is not None
+
+    def _finish_cloud_block(self):
+        cloud, values = self.cloudBlock.finish()
+        for quantity, value in values.items():
+            self.cloudTable.append(time=self.current_time, cloud=cloud, quantity=quantity, value=value)
+        return {"type": "cloud", "time": self.current_time, "cloud": cloud, "values": values}
+
+    def _parse_line(self, line):
+        if self.cloudBlock.start(line):
+            return []
+
+        time_match = TIME_RE.match(line)
+        if time_match:
+            events = []
+            if self.current_time is not None:
+                events.extend(self.monitor.check(self.current_time))
+            self.current_time = float(time_match.group(1))
+            self._correctors = {}
+            events.append({"type": "time", "time": self.current_time})
+            # Courant e deltaT são impressos antes da linha 'Time =' do passo a que pertencem
+            if self._pending_step:
+                step = {"type": "timestep", "time": self.current_time,
+                        "deltaT": self._pending_step.get("deltaT"),
+                        "courant_mean": self._pending_step.get("courant_mean"),
+                        "courant_max": self._pending_step.get("courant_max")}
+                self.timestepTable.append(**{name: step[name] for name in TIMESTEP_COLUMNS})
+                events.append(step)
+                self._pending_step = {}
+            return events
+
+        courant_match = COURANT_RE.match(line)
+        if courant_match:
+            self._pending_step["courant_mean"] = float(courant_match.group(1))
+            self._pending_step["courant_max"] = float(courant_match.group(2))
+            return []
+
+        delta_t_match = DELTA_T_RE.match(line)
+        if delta_t_match:
+            self._pending_step["deltaT"] = float(delta_t_match.group(1))
+            return []
+
+        timing_match = EXECUTION_TIME_RE.search(line)
+        if timing_match:
+            timing = {"type": "timing", "time": self.current_time,
+                      "execution_time": float(timing_match.group(1)),
+                      "clock_time": float(timing_match.group(2))}
+            self.timingTable.append(**{name: timing[name] for name in TIMING_COLUMNS})
+            return [timing]
+
+        if line == "End" and self.current_time is not None:
+            return self.monitor.check(self.current_time)
+
+        solver_match = SOLVER_RE.match(line)
+        if solver_match:
+            solver, field, initial, final, iterations = solver_match.groups()
+            corrector = self._correctors.get(field, 0)
+            self._correctors[field] = corrector + 1
+            event = {
+                "type": "residual",
+                "time": self.current_time,
+                "corrector": corrector,
+                "field": field,
+                "solver": solver,
+                "initial": float(initial),
+                "final": float(final),
+                "iterations": int(iterations),
+            }
+            self.solverTable.append(**{name: event[name] for name in SOLVER_COLUMNS})
+            if corrector == 0:
+                self.monitor.record(field, event["initial"], event["final"], event["iterations"])
+            return [event]
+
+        return []
+
+    def feed_lines(self, lines):
+        events = []
+        for line in lines:
+            events.extend(self.feed(line))
+        return events
+
+    def solver_series(self, field, quantity="initial", corrector=0):
+        """Retorna (tempos, valores) de um campo para o corretor indicado (None = todos)."""
+        table = self.solverTable
+        mask = table.column("field") == field
+        if corrector is not None:
+            mask &= table.column("corrector") == corrector
+        return table.column("time")[mask], table.column(quantity)[mask]
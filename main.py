@@ -1,26 +1,65 @@
 import os
 import sys
+import startup
+# Com --profile-startup, as importações abaixo já entram na medição
+startup.profile.enable_if_requested(sys.argv)
 import re
 import numpy as np
-import pyqtgraph as pg
 import json
-import psutil
+import multiprocessing
 from PyQt5.QtWidgets import (QApplication, QWidget,QComboBox, QWidgetAction, QPushButton, QVBoxLayout, QHBoxLayout, 
                              QFileDialog, QTextEdit, QLabel, QMenuBar, QMenu, QAction, 
-                             QLineEdit, QStatusBar, QDialog, QTableWidget, QTableWidgetItem, QMessageBox, QInputDialog)
-from PyQt5.QtCore import QTimer, QProcess, Qt, QDir, QFileInfo, QProcessEnvironment
-from PyQt5.QtGui import QStandardItemModel, QStandardItem, QIcon
+                             QLineEdit, QStatusBar, QDialog, QTableWidget, QTableWidgetItem, QMessageBox, QInputDialog,
+                             QTreeWidget, QTreeWidgetItem, QDoubleSpinBox, QCheckBox, QGridLayout, QSpinBox)
+from PyQt5.QtCore import QTimer, QProcess, Qt, QDir, QFileInfo
 from PyQt5 import QtCore
 import signal # Added import
 
+import rate_calculator
 from rate_calculator import calculate_increase_rate
-from syntax_highlighter import OpenFOAMHighlighter
 from simulation_history import SimulationHistory
+import profiling
+from log_parser import FoamLogParser
+import cloud_stats
+import foam_case
+import foam_dict
+from watchdog import Watchdog
+from cleanup_service import DeletionService, format_bytes
+from disk_usage import DiskUsageCache, RetentionPolicy, case_breakdown
+from run_monitor import GRACEFUL_STOP_AT, RunMonitor, restore_tables
+from simulation_runner import SimulationRunner, openfoam_environment
+from file_editor import FileEditorWindow
+from case_tree import CaseTreePanel
+import fluid_properties
+from fluid_properties import FluidProperties
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Carregados no primeiro uso, depois que a janela aparece
+pg = startup.LazyModule("pyqtgraph")
+psutil = startup.LazyModule("psutil")
+monitor_daemon = startup.LazyModule("monitor_daemon")
+monitoring_api = startup.LazyModule("monitoring_api")
+# Módulos usados só pelos diálogos
+timestep_report = startup.LazyModule("timestep_report")
+field_reduction = startup.LazyModule("field_reduction")
+reconstruct_manager = startup.LazyModule("reconstruct_manager")
+decomposition_planner = startup.LazyModule("decomposition_planner")
+scaling_study = startup.LazyModule("scaling_study")
+run_comparison = startup.LazyModule("run_comparison")
+residual_plot = startup.LazyModule("residual_plot")
+mesh_grading = startup.LazyModule("mesh_grading")
+
+NO_TREE_FLAG = "--no-tree"
+# Linhas da varredura de Δy exibidas na tabela (o CSV exportado tem todas)
+RATE_SWEEP_TABLE_ROWS = 2000
+
 class OpenFOAMInterface(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, showTree=True):
         super().__init__(parent)
+        # Painel com a árvore de arquivos do caso (opcional: --no-tree)
+        self.showTree = showTree
+        self.caseTree = None
         self.setWindowTitle("GAFoam — incompressibleDenseParticleFluid")
         self.resize(1000, 600)
 
@@ -40,10 +79,15 @@ class OpenFOAMInterface(QWidget):
         
         self.systemDir = os.path.join(self.baseDir, "system")
         self.unvFilePath = ""
-        self.currentFilePath = ""
         self.currentOpenFOAMVersion = self.config.get("openFOAMVersion", "openfoam12")
         self.currentSolver = "incompressibleDenseParticleFluid"
-        self.currentProcess = None
+        # Processo da simulação (ou do decomposePar): início, pausa, paradas e checkpoint
+        self.simulation = SimulationRunner(self, stop_timeout=self.config.get("gracefulStopTimeout", 300))
+        self.simulation.outputLine.connect(self.handleSimulationOutput)
+        self.simulation.errorOutput.connect(lambda text: self.outputArea.append(text))
+        self.simulation.message.connect(lambda text: self.outputArea.append(text))
+        self.simulation.stopFinished.connect(self.gracefulStopFinished)
+        self.logProcess = None
         
         """ 
         
@@ -53,31 +97,109 @@ class OpenFOAMInterface(QWidget):
 
         self.residualData = {}
         self.timeData = []
-        self.residualLines = {}
-        self.colors = ['r', 'g', 'b', 'c', 'm', 'y', 'w']
         # Adiciona armazenamento para max(cloud:alpha)
         self.maxCloudAlphaData = []
-        self.maxCloudAlphaLine = None 
+        # Telemetria completa dos solvers lineares (armazenada em colunas)
+        self.logParser = FoamLogParser()
+        self.residualQuantity = "initial"
+        # Regras automáticas de parada/pausa (watchdog.json do caso)
+        self.watchdog = Watchdog()
+        # Núcleo de monitoramento compartilhado com o CLI (gafoam): parser, watchdog e estado resumido
+        self.runMonitor = RunMonitor(self.baseDir, parser=self.logParser, watchdog=self.watchdog)
+        self.pendingRestart = False
+        self.deletionService = DeletionService()
+        self.cleanupTimer = None
+        # Uso de disco do caso (varredura em segundo plano) e política de retenção
+        self.diskUsageCache = DiskUsageCache()
+        self.diskUsageExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="disk-usage")
+        self.diskUsageFuture = None
+        self.caseDiskUsage = None
+        self.showDiskUsageWhenReady = False
+        self.retentionPolicy = RetentionPolicy()
+        self.retentionTimer = None
+        # Redução dos campos (min/max/média/integral) em segundo plano
+        self.fieldReductionExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="field-reduction")
+        self.fieldReductionFuture = None
+        self.fieldReductionTimer = None
+        # Reconstrução em paralelo, fora do processo da simulação
+        self.reconstructionManager = None
+        self.reconstructionTimer = None
+        # Estudo de escalabilidade forte (scaling.json do caso)
+        self.scalingStudy = None
+        self.scalingTimer = None
+        # Conexão com uma execução acompanhada pelo daemon do gafoam
+        self.daemonReceiver = None
+        self.daemonTimer = None
+        self.daemonRun = None
+        self.pendingDaemonRun = None
+        self.pendingDaemonTimer = None
+        
+        # Histórico lido em segundo plano depois da primeira pintura (ver simulationHistory)
+        self._simulationHistory = None
+        self.simulationHistoryFuture = None
+        self.historyExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history")
+        # Gráfico de resíduos (ResidualPlot, pyqtgraph) criado depois da primeira pintura
+        self.residualPlot = None
+        self.startupFinished = False
         
         self.mainVerticalLayout = QVBoxLayout(self)
         self.mainVerticalLayout.setContentsMargins(5, 5, 5, 5)
         
-        self.setupMenuBar()
-        self.setupMainContentArea()
-        self.setupStatusBar()
+        with startup.profile.phase("setupMenuBar"):
+            self.setupMenuBar()
+        with startup.profile.phase("setupMainContentArea"):
+            self.setupMainContentArea()
+        with startup.profile.phase("setupStatusBar"):
+            self.setupStatusBar()
         
         self.systemMonitorTimer = QTimer(self)
         self.systemMonitorTimer.timeout.connect(self.updateSystemUsage)
-        self.systemMonitorTimer.start(2000)
+        self.systemMonitorTimer.timeout.connect(self.checkWatchdogStall)
+
+        self.diskUsageTimer = QTimer(self)
+        self.diskUsageTimer.timeout.connect(self.scanDiskUsage)
         
         self.setLayout(self.mainVerticalLayout)
-        self.simulationHistory = SimulationHistory()
+        self.loadWatchdog()
+
+    @property
+    def simulationHistory(self):
+        """Histórico de simulações; se a leitura em segundo plano ainda não terminou, espera por ela."""
+        if self._simulationHistory is None:
+            if self.simulationHistoryFuture is None:
+                self.simulationHistoryFuture = self.historyExecutor.submit(SimulationHistory)
+            self._simulationHistory = self.simulationHistoryFuture.result()
+        return self._simulationHistory
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.startupFinished:
+            self.startupFinished = True
+            startup.profile.mark("primeira pintura")
+            # Depois que a janela é pintada: o restante da inicialização não atrasa a abertura
+            QTimer.singleShot(0, self.finishStartup)
+
+    def finishStartup(self):
+        """Parte da inicialização adiada para depois da primeira pintura."""
+        with startup.profile.phase("gráfico de resíduos (pyqtgraph)"):
+            self.ensureResidualPlot()
+        if self.simulationHistoryFuture is None:
+            self.simulationHistoryFuture = self.historyExecutor.submit(SimulationHistory)
+        self.systemMonitorTimer.start(2000)
+        self.diskUsageTimer.start(30000)
+        if startup.profile.enabled:
+            QTimer.singleShot(0, self.reportStartup)
+
+    def reportStartup(self):
+        """--profile-startup: imprime os tempos da abertura e encerra."""
+        profile = startup.profile
+        with profile.phase("histórico (espera pela leitura)"):
+            self.simulationHistoryFuture.result()
+        profile.mark("inicialização concluída")
+        profile.stop_imports()
+        print(profile.report(), flush=True)
+        QApplication.quit()
 
-    # def openFileEditor(self):
-    #     """Abre a janela separada para o editor de arquivos."""
-    #     self.fileEditorWindow = FileEditorWindow(self.baseDir, self)
-    #     self.fileEditorWindow.show()
-    
     def detectOpenFOAMVersions(self):
         versions = []
         openfoamDir = QDir("/opt")
@@ -97,9 +219,178 @@ class OpenFOAMInterface(QWidget):
         
         processorDirs = caseDir.entryList(["processor*"], QDir.Dirs | QDir.NoDotAndDotDot)
         for dirName in processorDirs:
-            processorDir = QDir(caseDir.filePath(dirName))
-            if processorDir.removeRecursively():
-                self.outputArea.append(f"Removing old folder: {dirName}")
+            self.outputArea.append(f"Removing old folder: {dirName}")
+        self.removeDirectoriesInBackground(processorDirs)
+
+    def removeDirectoriesInBackground(self, dirNames, archive=False):
+        """Renomeia as pastas imediatamente e as apaga (ou arquiva) em segundo plano."""
+        moved = self.deletionService.remove(self.baseDir, dirNames, archive=archive)
+        if self.deletionService.busy() and self.cleanupTimer is None:
+            self.cleanupTimer = QTimer(self)
+            self.cleanupTimer.timeout.connect(self.updateCleanupProgress)
+            self.cleanupTimer.start(500)
+        return moved
+
+    def updateCleanupProgress(self):
+        progress = self.deletionService.progress()
+        action = "Arquivando/removendo" if progress["archives"] else "Removendo"
+        self.statusBar.showMessage(
+            f"{action} pastas: {progress['done']}/{progress['total']} "
+            f"({format_bytes(progress['bytes_freed'])} liberados)"
+        )
+        if self.deletionService.busy():
+            return
+        self.cleanupTimer.stop()
+        self.cleanupTimer = None
+        for error in progress["errors"]:
+            self.outputArea.append(f"Erro na limpeza: {error}")
+        for archivePath in progress["archives"]:
+            self.outputArea.append(f"Arquivo criado: {archivePath}")
+        self.outputArea.append(
+            f"Limpeza concluída: {progress['done']} pastas, {format_bytes(progress['bytes_freed'])} liberados."
+        )
+        self.statusBar.clearMessage()
+
+    def scanDiskUsage(self):
+        """Agenda a varredura do caso em segundo plano (o resultado é lido por collectDiskUsage)."""
+        if not self.baseDir or not os.path.isdir(self.baseDir):
+            return
+        if self.diskUsageFuture is not None and not self.diskUsageFuture.done():
+            return
+        self.diskUsageFuture = self.diskUsageExecutor.submit(case_breakdown, self.baseDir, self.diskUsageCache)
+
+    def collectDiskUsage(self):
+        if self.diskUsageFuture is None or not self.diskUsageFuture.done():
+            return
+        future = self.diskUsageFuture
+        self.diskUsageFuture = None
+        try:
+            self.caseDiskUsage = future.result()
+        except Exception as e:
+            self.outputArea.append(f"Erro ao analisar o uso de disco: {e}")
+            self.showDiskUsageWhenReady = False
+            return
+        if self.showDiskUsageWhenReady:
+            self.showDiskUsageWhenReady = False
+            self.statusBar.clearMessage()
+            self.showDiskUsageDialog(self.caseDiskUsage)
+
+    def openDiskUsage(self):
+        if not self.baseDir or not os.path.isdir(self.baseDir):
+            self.outputArea.append("Erro: Nenhum diretório base selecionado.")
+            return
+        self.showDiskUsageWhenReady = True
+        self.statusBar.showMessage("Analisando uso de disco do caso...")
+        self.scanDiskUsage()
+        self.collectDiskUsage()
+
+    def showDiskUsageDialog(self, usage):
+        """Uso de disco por tempo, processador e campo, com a prévia da política de retenção."""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Uso de Disco do Caso")
+        dialog.resize(1100, 650)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(f"Total do caso: {format_bytes(usage['total'])}  —  {self.baseDir}"))
+
+        timePlot = pg.PlotWidget(title="Tamanho por diretório de tempo")
+        timePlot.setBackground('w')
+        timePlot.showGrid(x=True, y=True)
+        timePlot.setLabel('bottom', 'Time')
+        timePlot.setLabel('left', 'MB')
+        if usage["by_time"]:
+            sizes = [size / 1024.0**2 for size in usage["by_time"].values()]
+            timePlot.addItem(pg.BarGraphItem(x=list(range(len(sizes))), height=sizes, width=0.8, brush='b'))
+            ticks = [(index, name) for index, name in enumerate(usage["by_time"])]
+            step = max(1, len(ticks) // 15)
+            timePlot.getAxis('bottom').setTicks([ticks[::step]])
+        layout.addWidget(timePlot, 2)
+
+        tablesLayout = QHBoxLayout()
+        for title, values in (("Tempo", usage["by_time"]), ("Processador", usage["by_processor"]),
+                              ("Campo", usage["by_field"]), ("Outros", usage["other"])):
+            table = QTableWidget(dialog)
+            table.setColumnCount(2)
+            table.setHorizontalHeaderLabels([title, "Tamanho"])
+            table.setRowCount(len(values))
+            for row, (name, size) in enumerate(values.items()):
+                table.setItem(row, 0, QTableWidgetItem(name))
+                table.setItem(row, 1, QTableWidgetItem(format_bytes(size)))
+            table.resizeColumnsToContents()
+            tablesLayout.addWidget(table)
+        layout.addLayout(tablesLayout, 3)
+
+        self.loadRetentionPolicy()
+        plan = self.retentionPolicy.plan(self.baseDir)
+        planSize = sum(self.diskUsageCache.total(os.path.join(self.baseDir, name)) for name in plan)
+        policy = self.retentionPolicy
+        retentionLabel = QLabel(
+            f"Retenção ({'automática' if policy.enabled else 'desativada'}): 1 a cada {policy.keep_every} escritas, "
+            f"últimos {policy.keep_last}, tempos {policy.keep_times or '-'} — "
+            f"{len(plan)} pastas removíveis ({format_bytes(planSize)})"
+        )
+        layout.addWidget(retentionLabel)
+
+        buttonsLayout = QHBoxLayout()
+        editButton = QPushButton("Editar política")
+        editButton.clicked.connect(lambda: (dialog.accept(), self.editRetentionPolicy()))
+        applyButton = QPushButton("Aplicar retenção agora")
+        applyButton.setEnabled(bool(plan))
+        applyButton.clicked.connect(lambda: (dialog.accept(), self.applyRetentionPolicy()))
+        buttonsLayout.addWidget(editButton)
+        buttonsLayout.addWidget(applyButton)
+        layout.addLayout(buttonsLayout)
+
+        dialog.setLayout(layout)
+        dialog.exec_()
+
+    def loadRetentionPolicy(self):
+        try:
+            self.retentionPolicy = RetentionPolicy.load(self.baseDir)
+        except (ValueError, TypeError) as e:
+            self.outputArea.append(f"Erro no retention.json, retenção desativada: {e}")
+            self.retentionPolicy = RetentionPolicy()
+
+    def editRetentionPolicy(self):
+        """Abre o retention.json do caso no editor (criando-o com os valores padrão, se necessário)."""
+        if not self.baseDir or not os.path.isdir(self.baseDir):
+            self.outputArea.append("Erro: Nenhum diretório base selecionado.")
+            return
+        configPath = RetentionPolicy.config_path(self.baseDir)
+        if not os.path.exists(configPath):
+            RetentionPolicy().save(self.baseDir)
+            self.outputArea.append(f"Política de retenção padrão criada em {configPath}.")
+        fileEditorWindow = FileEditorWindow(self.baseDir, self)
+        fileEditorWindow.openFile(configPath)
+        fileEditorWindow.exec_()
+        self.loadRetentionPolicy()
+        if self.simulation.running():
+            self.startRetentionPolicy()
+
+    def applyRetentionPolicy(self):
+        """Remove em segundo plano as pastas de tempo que a política não mantém."""
+        plan = self.retentionPolicy.plan(self.baseDir)
+        if not plan:
+            return
+        moved = self.removeDirectoriesInBackground(plan)
+        self.outputArea.append(f"Retenção: {len(moved)} pastas de tempo removidas em segundo plano.")
+
+    def startRetentionPolicy(self):
+        """Aplica a política periodicamente enquanto a simulação roda, se estiver ativada no retention.json."""
+        self.stopRetentionPolicy()
+        self.loadRetentionPolicy()
+        if not self.retentionPolicy.enabled:
+            return
+        self.retentionTimer = QTimer(self)
+        self.retentionTimer.timeout.connect(self.applyRetentionPolicy)
+        self.retentionTimer.start(int(max(self.retentionPolicy.interval_seconds, 5) * 1000))
+        self.outputArea.append(
+            f"Retenção automática ativa (a cada {self.retentionPolicy.interval_seconds:g} s)."
+        )
+
+    def stopRetentionPolicy(self):
+        if self.retentionTimer is not None:
+            self.retentionTimer.stop()
+            self.retentionTimer = None
 
     def chooseUNV(self):
         unvFilePath, _ = QFileDialog.getOpenFileName(
@@ -136,7 +427,7 @@ class OpenFOAMInterface(QWidget):
                 self.outputArea.append(f"Case folder selected: {casePath}")
                 self.meshPathLabel.setText(f"Mesh: {QFileInfo(casePath).fileName()}")
                 self.outputArea.append("Case loaded successfully.")
-                # self.populateTreeView(casePath)  
+                self.refreshCaseTree()
             else:
                 self.outputArea.append("Error: The selected folder does not contain the required directories (0, system, constant).")
         else:
@@ -191,8 +482,8 @@ class OpenFOAMInterface(QWidget):
             }
         """)
         
-        refreshTreeAction = QAction("Refresh Tree", self)
-        refreshTreeAction.triggered.connect(lambda: self.populateTreeView(QFileInfo(self.unvFilePath).absolutePath() if self.unvFilePath else None))
+        editFileAction = QAction("Edit File...", self)
+        editFileAction.triggered.connect(self.editFile)
         
         importUNVAction = QAction("Load .unv File", self)
         importUNVAction.triggered.connect(self.chooseUNV)
@@ -200,9 +491,13 @@ class OpenFOAMInterface(QWidget):
         importCaseAction = QAction("Load Case", self)
         importCaseAction.triggered.connect(self.chooseCase)
         
-        fileMenu.addAction(refreshTreeAction)
+        if self.showTree:
+            refreshTreeAction = QAction("Refresh Tree", self)
+            refreshTreeAction.triggered.connect(self.refreshCaseTree)
+            fileMenu.addAction(refreshTreeAction)
         fileMenu.addAction(importUNVAction)
         fileMenu.addAction(importCaseAction)
+        fileMenu.addAction(editFileAction)
         
         self.menuBar.addMenu(fileMenu)
         self.mainVerticalLayout.setMenuBar(self.menuBar)
@@ -255,6 +550,26 @@ class OpenFOAMInterface(QWidget):
         versionAction = QWidgetAction(openfoamMenu)
         versionAction.setDefaultWidget(self.versionComboBox)
         openfoamMenu.addAction(versionAction)
+
+        resumeLatestAction = QAction("Resume from latestTime", self)
+        resumeLatestAction.triggered.connect(self.resumeFromLatestTime)
+        openfoamMenu.addAction(resumeLatestAction)
+
+        reconstructLatestAction = QAction("Reconstruct Latest Time", self)
+        reconstructLatestAction.triggered.connect(lambda: self.startReconstruction(latestOnly=True))
+        openfoamMenu.addAction(reconstructLatestAction)
+
+        scalingStudyAction = QAction("Scaling Study", self)
+        scalingStudyAction.triggered.connect(self.openScalingStudy)
+        openfoamMenu.addAction(scalingStudyAction)
+
+        scalingResultsAction = QAction("Show Scaling Results", self)
+        scalingResultsAction.triggered.connect(self.showScalingResults)
+        openfoamMenu.addAction(scalingResultsAction)
+
+        forceStopAction = QAction("Force Stop (SIGTERM/SIGKILL)", self)
+        forceStopAction.triggered.connect(self.forceStopSimulation)
+        openfoamMenu.addAction(forceStopAction)
         
         self.menuBar.addMenu(fileMenu)
         self.menuBar.addMenu(terminalMenu)
@@ -265,9 +580,46 @@ class OpenFOAMInterface(QWidget):
         viewHistoryAction.triggered.connect(self.openSimulationHistory)
         historyMenu.addAction(viewHistoryAction)
         self.menuBar.addMenu(historyMenu)
+
+        watchdogMenu = QMenu("Watchdog", self.menuBar)
+        self.watchdogEnabledAction = QAction("Enable Watchdog", self)
+        self.watchdogEnabledAction.setCheckable(True)
+        self.watchdogEnabledAction.setChecked(True)
+        self.watchdogEnabledAction.toggled.connect(self.setWatchdogEnabled)
+        watchdogMenu.addAction(self.watchdogEnabledAction)
+        editWatchdogAction = QAction("Edit Rules (watchdog.json)", self)
+        editWatchdogAction.triggered.connect(self.editWatchdogRules)
+        watchdogMenu.addAction(editWatchdogAction)
+        self.menuBar.addMenu(watchdogMenu)
+
+        daemonMenu = QMenu("Daemon", self.menuBar)
+        self.runViaDaemonAction = QAction("Run via Daemon (keeps running after closing)", self)
+        self.runViaDaemonAction.setCheckable(True)
+        self.runViaDaemonAction.setChecked(self.config.get("runViaDaemon", False))
+        self.runViaDaemonAction.toggled.connect(self.setRunViaDaemon)
+        daemonMenu.addAction(self.runViaDaemonAction)
+        attachDaemonAction = QAction("Attach to Daemon Run...", self)
+        attachDaemonAction.triggered.connect(self.openDaemonAttach)
+        daemonMenu.addAction(attachDaemonAction)
+        detachDaemonAction = QAction("Detach", self)
+        detachDaemonAction.triggered.connect(self.detachFromDaemon)
+        daemonMenu.addAction(detachDaemonAction)
+        self.menuBar.addMenu(daemonMenu)
         
         self.mainVerticalLayout.setMenuBar(self.menuBar)
 
+        archiveTimesAction = QAction("Archive Time Folders (tar.gz)", self)
+        archiveTimesAction.triggered.connect(self.archiveSimulation)
+        fileMenu.addAction(archiveTimesAction)
+
+        diskUsageAction = QAction("Disk Usage", self)
+        diskUsageAction.triggered.connect(self.openDiskUsage)
+        fileMenu.addAction(diskUsageAction)
+
+        retentionAction = QAction("Edit Retention Policy (retention.json)", self)
+        retentionAction.triggered.connect(self.editRetentionPolicy)
+        fileMenu.addAction(retentionAction)
+
         setBaseDirAction = QAction("Set Base Directory", self)
         setBaseDirAction.triggered.connect(self.set_base_dir)
         fileMenu.addAction(setBaseDirAction)
@@ -563,7 +915,6 @@ class OpenFOAMInterface(QWidget):
             }
         """)
         self.restartButton.clicked.connect(self.restartSimulation)
-        self.restartButton.clicked.connect(self.clearResidualPlot)
         
         self.stopButton = QPushButton("⏹", self)
         self.stopButton.setStyleSheet(sim_button_style + """
@@ -617,6 +968,10 @@ class OpenFOAMInterface(QWidget):
         self.openParaviewButton.setStyleSheet(utility_button_style)
         self.openParaviewButton.clicked.connect(self.openParaview)
         
+        self.reduceFieldsButton = QPushButton("Field Statistics", self)
+        self.reduceFieldsButton.setStyleSheet(utility_button_style)
+        self.reduceFieldsButton.clicked.connect(self.reduceFields)
+        
         self.calculateRateButton = QPushButton("Calculate Δy", self)
         self.calculateRateButton.setStyleSheet(utility_button_style)
         self.calculateRateButton.clicked.connect(self.openRateCalculationDialog)
@@ -625,6 +980,7 @@ class OpenFOAMInterface(QWidget):
         self.fluidPropertiesButton.setStyleSheet(utility_button_style)
         self.fluidPropertiesButton.clicked.connect(self.openFluidPropertiesDialog)
         utilityButtonLayout.addWidget(self.openParaviewButton)
+        utilityButtonLayout.addWidget(self.reduceFieldsButton)
         utilityButtonLayout.addWidget(self.calculateRateButton)
         utilityButtonLayout.addWidget(self.fluidPropertiesButton)
         utilityButtonLayout.addStretch()  # Push buttons to left
@@ -698,14 +1054,11 @@ class OpenFOAMInterface(QWidget):
         """)
         residualLayout.addWidget(plot_title)
         
-        self.graphWidget = pg.PlotWidget()
-        self.graphWidget.setBackground('w')
-        self.graphWidget.setLabel('left', 'Residuals')
-        self.graphWidget.setLabel('bottom', 'Time')
-        self.graphWidget.setLogMode(y=True)  
-        self.graphWidget.showGrid(x=True, y=True)
-        self.graphWidget.addLegend()
-        residualLayout.addWidget(self.graphWidget)
+        # Ocupa o lugar do gráfico até ensureResidualPlot (pyqtgraph só é importado depois da abertura)
+        self.graphPlaceholder = QWidget(self)
+        self.graphPlaceholder.setStyleSheet("background-color: white;")
+        residualLayout.addWidget(self.graphPlaceholder, 1)
+        self.residualLayout = residualLayout
         
         graphControlLayout = QHBoxLayout()
 
@@ -749,8 +1102,31 @@ class OpenFOAMInterface(QWidget):
         """)
         self.exportPlotDataButton.clicked.connect(self.exportPlotData)  
 
+        self.residualQuantityCombo = QComboBox(self)
+        self.residualQuantityCombo.addItem("Initial residual", "initial")
+        self.residualQuantityCombo.addItem("Final residual", "final")
+        self.residualQuantityCombo.addItem("Iterations", "iterations")
+        self.residualQuantityCombo.addItem("Courant / deltaT", "timestep")
+        self.residualQuantityCombo.currentIndexChanged.connect(self.changeResidualQuantity)
+
         graphControlLayout.addWidget(self.clearPlotButton)
         graphControlLayout.addWidget(self.exportPlotDataButton)
+        self.timeStepReportButton = QPushButton("Relatório Δt", self)
+        self.timeStepReportButton.setStyleSheet(self.exportPlotDataButton.styleSheet())
+        self.timeStepReportButton.clicked.connect(self.openTimeStepReport)
+
+        self.showParcelsCheckBox = QCheckBox("Parcels", self)
+        self.showParcelsCheckBox.setChecked(True)
+        self.showParcelsCheckBox.toggled.connect(self.toggleParcelAxis)
+
+        self.cloudStatsButton = QPushButton("Cloud Statistics", self)
+        self.cloudStatsButton.setStyleSheet(self.exportPlotDataButton.styleSheet())
+        self.cloudStatsButton.clicked.connect(self.openCloudStatistics)
+
+        graphControlLayout.addWidget(self.residualQuantityCombo)
+        graphControlLayout.addWidget(self.showParcelsCheckBox)
+        graphControlLayout.addWidget(self.timeStepReportButton)
+        graphControlLayout.addWidget(self.cloudStatsButton)
 
         residualLayout.addLayout(graphControlLayout)
         
@@ -794,6 +1170,11 @@ class OpenFOAMInterface(QWidget):
         """)
         self.profilingButton.clicked.connect(self.enableProfiling)
         profilingPanel.addWidget(self.profilingButton)
+
+        self.profilingAnalysisButton = QPushButton("Analisar Profiling", self)
+        self.profilingAnalysisButton.setStyleSheet(self.profilingButton.styleSheet())
+        self.profilingAnalysisButton.clicked.connect(self.openProfilingAnalysis)
+        profilingPanel.addWidget(self.profilingAnalysisButton)
         
         # Área de logs de profiling
         self.profilingLogs = QTextEdit(self)
@@ -826,26 +1207,59 @@ class OpenFOAMInterface(QWidget):
         # --- Fim do painel de profiling ---
         
         # Add layouts to main content with proper proportions
+        if self.showTree:
+            self.caseTree = CaseTreePanel(self)
+            self.caseTree.fileActivated.connect(self.openFileInEditor)
+            self.caseTree.setRoot(self.baseDir)
+            contentLayout.addWidget(self.caseTree, 1)
         contentLayout.addLayout(leftControlLayout, 1)  # Left side takes 1 part
         contentLayout.addLayout(rightContentLayout, 2)  # Right side takes 2 parts
         
         self.mainVerticalLayout.addLayout(contentLayout, 1)
 
-        # self.treeUpdateTimer = QTimer(self)
-        # self.treeUpdateTimer.timeout.connect(lambda: self.populateTreeView())
-        # self.treeUpdateTimer.start(1000) 
+    def ensureResidualPlot(self):
+        """Cria o gráfico de resíduos na primeira vez em que é necessário."""
+        if self.residualPlot is not None:
+            return
+        self.residualPlot = residual_plot.ResidualPlot()
+        self.residualLayout.replaceWidget(self.graphPlaceholder, self.residualPlot.widget)
+        self.graphPlaceholder.deleteLater()
+        self.graphPlaceholder = None
+        if not self.showParcelsCheckBox.isChecked():
+            self.toggleParcelAxis(False)
+        if self.timeData or self.residualQuantity != "initial":
+            self.changeResidualQuantity(self.residualQuantityCombo.currentIndex())
+
+    def setPlotLogMode(self, logY):
+        self.ensureResidualPlot()
+        self.residualPlot.setLogMode(logY)
+
+    def toggleParcelAxis(self, checked):
+        if self.residualPlot is None:
+            return
+        self.residualPlot.showParcels(checked)
+        if checked:
+            self.updateParcelPlot()
+
+    def updateParcelPlot(self):
+        if not self.showParcelsCheckBox.isChecked():
+            return
+        self.ensureResidualPlot()
+        times, parcels = cloud_stats.cloud_series(self.logParser.cloudTable, cloud_stats.PARCELS)
+        self.residualPlot.setParcels(times, parcels)
 
     def toggleLogScale(self):
         """Toggles between linear and logarithmic scale on the Y-axis."""
-        current = self.graphWidget.getViewBox().getState()['logMode'][1]
-        self.graphWidget.setLogMode(y=not current)
+        self.ensureResidualPlot()
+        current = self.residualPlot.isLogMode()
+        self.setPlotLogMode(not current)
         scale_type = "logarithmic" if not current else "linear"
-        self.outputArea.append(f"{scale_type.capitalize()} scale activated", 2000)
+        self.outputArea.append(f"{scale_type.capitalize()} scale activated")
 
     def exportPlotData(self):
         """Exports the plot data to a CSV file."""
         if not self.timeData:
-            self.outputArea.append("No data to export", 2000)
+            self.outputArea.append("No data to export")
             return
             
         fileName, _ = QFileDialog.getSaveFileName(
@@ -869,21 +1283,19 @@ class OpenFOAMInterface(QWidget):
                     
             self.outputArea.append(f"Data exported to {fileName}")
         
-    def onTreeViewDoubleClicked(self, index):
-        """Abre a janela de edição de arquivos ao clicar em um arquivo na árvore."""
-        item = self.treeModel.itemFromIndex(index)
-        if item and not item.hasChildren(): 
-            filePath = item.data(Qt.UserRole)
-            if filePath:
-                fileEditorWindow = FileEditorWindow(self.baseDir, self)
-                fileEditorWindow.populateTreeView(self.baseDir)  
-                fileEditorWindow.show()
-
-                file = QtCore.QFile(filePath)
-                if file.open(QtCore.QIODevice.ReadOnly | QtCore.QIODevice.Text):
-                    fileEditorWindow.currentFilePath = filePath
-                    fileEditorWindow.fileEditor.setPlainText(str(file.readAll(), 'utf-8'))
-                    file.close()
+    def refreshCaseTree(self):
+        """Aponta a árvore para o caso atual e a relê do disco (sem efeito com --no-tree)."""
+        if self.caseTree is not None:
+            self.caseTree.refresh(self.baseDir)
+
+    def openFileInEditor(self, filePath):
+        """Abre um arquivo do caso no editor de dicionários."""
+        fileEditorWindow = FileEditorWindow(self.baseDir, self)
+        if fileEditorWindow.openFile(filePath):
+            self.outputArea.append(f"Arquivo aberto para edição: {filePath}")
+            fileEditorWindow.exec_()
+        else:
+            self.outputArea.append(f"Erro ao abrir o arquivo para edição: {filePath}")
     
     def setupStatusBar(self):
         self.statusBar = QStatusBar(self)
@@ -926,10 +1338,14 @@ class OpenFOAMInterface(QWidget):
         self.memUsageLabel = QLabel("Memory: --%", self.statusBar)
         self.memUsageLabel.setStyleSheet(label_style + "QLabel { color: #e74c3c; }")
 
+        self.diskUsageLabel = QLabel("Disk: --%", self.statusBar)
+        self.diskUsageLabel.setStyleSheet(label_style + "QLabel { color: #9b59b6; }")
+
         self.statusBar.addPermanentWidget(self.solverLabel, 1)
         self.statusBar.addPermanentWidget(self.meshPathLabel, 1)
         self.statusBar.addPermanentWidget(self.cpuUsageLabel)
         self.statusBar.addPermanentWidget(self.memUsageLabel)
+        self.statusBar.addPermanentWidget(self.diskUsageLabel)
         
         self.mainVerticalLayout.addWidget(self.statusBar)
     
@@ -956,45 +1372,23 @@ class OpenFOAMInterface(QWidget):
         except:
             pass
         
-        storage = QtCore.QStorageInfo(QtCore.QDir.rootPath())
-        memUsed = (storage.bytesTotal() - storage.bytesFree()) / (1024.0**3)
-        memTotal = storage.bytesTotal() / (1024.0**3)
-        memPercent = (memUsed / memTotal) * 100 if memTotal > 0 else 0
-        
+        memory = psutil.virtual_memory()
+        memUsed = (memory.total - memory.available) / (1024.0**3)
+        memTotal = memory.total / (1024.0**3)
         self.memUsageLabel.setText(
-            f"Memory: {int(memPercent)}% ({memUsed:.1f}G/{memTotal:.1f}G)"
+            f"Memory: {int(memory.percent)}% ({memUsed:.1f}G/{memTotal:.1f}G)"
         )
-    
-    def populateTreeView(self, casePath=None):
-        if not casePath:
-            casePath = QFileInfo(self.unvFilePath).absolutePath() if self.unvFilePath else self.baseDir
-        
-        self.treeModel = QStandardItemModel(self)
-        rootItem = QStandardItem(QIcon.fromTheme("folder"), casePath)
-        self.treeModel.appendRow(rootItem)
-        self.addDirectoryToTree(casePath, rootItem)
-        self.treeView.setModel(self.treeModel)
-        self.treeView.expandAll()
-    
-    def addDirectoryToTree(self, path, parent):
-        dir = QDir(path)
-        dirName = dir.dirName()
-        item = QStandardItem(dirName)
-        
-        item.setIcon(QIcon.fromTheme("folder"))
-        parent.appendRow(item)
-        
-        filters = QDir.AllEntries | QDir.NoDotAndDotDot
-        sorting = QDir.DirsFirst | QDir.Name | QDir.IgnoreCase
-        
-        for info in dir.entryInfoList(filters, sorting):
-            if info.isDir():
-                self.addDirectoryToTree(info.absoluteFilePath(), item)
-            else:
-                fileItem = QStandardItem(info.fileName())
-                fileItem.setIcon(QIcon.fromTheme("text-x-generic"))
-                item.appendRow(fileItem)
-                fileItem.setData(info.absoluteFilePath(), Qt.UserRole)
+
+        # Disco: sistema de arquivos onde está o caso (não a raiz) e o tamanho do caso
+        storage = QtCore.QStorageInfo(self.baseDir if self.baseDir and os.path.isdir(self.baseDir) else QtCore.QDir.rootPath())
+        diskUsed = (storage.bytesTotal() - storage.bytesFree()) / (1024.0**3)
+        diskTotal = storage.bytesTotal() / (1024.0**3)
+        diskPercent = (diskUsed / diskTotal) * 100 if diskTotal > 0 else 0
+        caseText = f", caso {format_bytes(self.caseDiskUsage['total'])}" if self.caseDiskUsage else ""
+        self.diskUsageLabel.setText(
+            f"Disk: {int(diskPercent)}% ({diskUsed:.1f}G/{diskTotal:.1f}G{caseText})"
+        )
+        self.collectDiskUsage()
     
     def openParaview(self):
         if not self.baseDir:
@@ -1014,6 +1408,109 @@ class OpenFOAMInterface(QWidget):
         else:
             self.outputArea.append("ParaView iniciado com sucesso")
     
+    def reduceFields(self):
+        """Calcula min/max/média/integral dos campos em todos os tempos (também em casos decompostos)."""
+        if not self.baseDir or not os.path.isdir(self.baseDir):
+            self.outputArea.append("Erro: Nenhum caso selecionado ou diretório base inválido.")
+            return
+        if self.fieldReductionFuture is not None:
+            self.outputArea.append("A redução dos campos já está em andamento.")
+            return
+        self.outputArea.append("Calculando estatísticas dos campos em segundo plano...")
+        self.statusBar.showMessage("Reduzindo campos...")
+        self.fieldReductionErrors = []
+        self.fieldReductionFuture = self.fieldReductionExecutor.submit(
+            field_reduction.reduce_case, self.baseDir, store=self.logParser.store, errors=self.fieldReductionErrors
+        )
+        self.fieldReductionTimer = QTimer(self)
+        self.fieldReductionTimer.timeout.connect(self.checkFieldReduction)
+        self.fieldReductionTimer.start(500)
+
+    def checkFieldReduction(self):
+        if not self.fieldReductionFuture.done():
+            return
+        self.fieldReductionTimer.stop()
+        self.fieldReductionTimer = None
+        future = self.fieldReductionFuture
+        self.fieldReductionFuture = None
+        self.statusBar.clearMessage()
+        try:
+            rows = future.result()
+        except Exception as e:
+            self.outputArea.append(f"Erro na redução dos campos: {e}")
+            return
+        for root, timeName, fieldName, error in self.fieldReductionErrors:
+            self.outputArea.append(f"Aviso: {fieldName} em {os.path.relpath(os.path.join(root, timeName), self.baseDir)} "
+                                   f"não pôde ser lido ({error}); estatísticas desse tempo ficam NaN.")
+        if not rows:
+            self.outputArea.append("Nenhum volScalarField/volVectorField encontrado nos diretórios de tempo.")
+            return
+        self.outputArea.append(f"Estatísticas calculadas: {len(rows)} valores.")
+        self.openFieldStatistics()
+
+    def openFieldStatistics(self):
+        """Evolução temporal de uma estatística de um campo e tabela com o último tempo."""
+        table = self.logParser.store.table("fields", field_reduction.FIELD_COLUMNS)
+        fieldNames = list(dict.fromkeys(table.data["field"]))
+        statistics = list(dict.fromkeys(table.data["statistic"]))
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Estatísticas dos Campos")
+        dialog.resize(1000, 650)
+        layout = QVBoxLayout(dialog)
+
+        controlsLayout = QHBoxLayout()
+        fieldCombo = QComboBox(dialog)
+        fieldCombo.addItems(fieldNames)
+        statisticCombo = QComboBox(dialog)
+        statisticCombo.addItems(statistics)
+        controlsLayout.addWidget(QLabel("Campo:"))
+        controlsLayout.addWidget(fieldCombo)
+        controlsLayout.addWidget(QLabel("Estatística:"))
+        controlsLayout.addWidget(statisticCombo)
+        controlsLayout.addStretch()
+        layout.addLayout(controlsLayout)
+
+        plot = pg.PlotWidget()
+        plot.setBackground('w')
+        plot.showGrid(x=True, y=True)
+        plot.setLabel('bottom', 'Time')
+        layout.addWidget(plot, 2)
+
+        def updatePlot():
+            plot.clear()
+            times, values = field_reduction.field_series(table, fieldCombo.currentText(), statisticCombo.currentText())
+            if len(times):
+                plot.plot(times, values, pen=pg.mkPen(color='b', width=2), symbol='o', symbolSize=4)
+            plot.setTitle(f"{statisticCombo.currentText()}({fieldCombo.currentText()})")
+
+        fieldCombo.currentTextChanged.connect(updatePlot)
+        statisticCombo.currentTextChanged.connect(updatePlot)
+        updatePlot()
+
+        times = table.column("time")
+        latest = times.max()
+        mask = times == latest
+        valuesTable = QTableWidget(dialog)
+        valuesTable.setColumnCount(len(statistics) + 1)
+        valuesTable.setHorizontalHeaderLabels([f"t = {latest:g}"] + statistics)
+        valuesTable.setRowCount(len(fieldNames))
+        lookup = {(f, st): v for f, st, v in zip(table.column("field")[mask], table.column("statistic")[mask],
+                                                  table.column("value")[mask])}
+        for row, name in enumerate(fieldNames):
+            valuesTable.setItem(row, 0, QTableWidgetItem(name))
+            for column, statistic in enumerate(statistics, start=1):
+                value = lookup.get((name, statistic))
+                valuesTable.setItem(row, column, QTableWidgetItem("" if value is None else f"{value:.6g}"))
+        valuesTable.resizeColumnsToContents()
+        layout.addWidget(valuesTable, 1)
+
+        if np.isnan(table.column("value")[table.column("statistic") == "integral"]).all():
+            layout.addWidget(QLabel("Integrais indisponíveis: gere o campo V com 'postProcess -func writeCellVolumes'."))
+
+        dialog.setLayout(layout)
+        dialog.exec_()
+
     def checkMesh(self):
         if not self.baseDir or not os.path.exists(self.baseDir):
             self.outputArea.append("Erro: Nenhum caso selecionado ou diretório base inválido.")
@@ -1056,46 +1553,40 @@ class OpenFOAMInterface(QWidget):
         # Captura dados de profiling e envia para o painel dedicado
         if "ExecutionTime" in line or "ClockTime" in line:
             self.profilingLogs.append(line)
-        
-        # Captura informações de timing específicas do solver
-        if ("smoothSolver:" in line and "Solving for" in line) or ("GAMG:" in line and "Solving for" in line):
-            if "Final residual" in line and "No Iterations" in line:
-                # Extrai informações de performance
-                parts = line.split(',')
-                if len(parts) >= 3:
-                    iterations_part = parts[2].strip()
-                    if "No Iterations" in iterations_part:
-                        iter_count = iterations_part.split()[-1]
-                        solver_info = f"Solver performance: {iter_count} iterations"
-                        self.profilingLogs.append(solver_info)
-        
-        current_time_match = re.search(r'Time = ([0-9.e+-]+)', line)
-        if current_time_match:
-            current_time = float(current_time_match.group(1))
-            if current_time not in self.timeData:
-                self.timeData.append(current_time)
-                if len(self.maxCloudAlphaData) < len(self.timeData):
-                    self.maxCloudAlphaData.append(None)
-
-        residual_match = re.search(r'smoothSolver:  Solving for ([a-zA-Z0-9_.]+), Initial residual = ([0-9.e+-]+)', line)
-        if residual_match:
-            variable = residual_match.group(1)
-            residual = float(residual_match.group(2))
-
-            if variable not in self.residualData:
-                self.residualData[variable] = []
-                color_idx = len(self.residualData) % len(self.colors)
-                pen = pg.mkPen(color=self.colors[color_idx], width=2)
-                self.residualLines[variable] = self.graphWidget.plot(
-                    [], [], name=variable, pen=pen
+
+        events, triggers = self.runMonitor.feed(line)
+        for trigger in triggers:
+            self.handleWatchdogTrigger(trigger)
+        # Checkpoint pendente: pausa assim que o log confirmar a escrita, sem esperar o timer
+        self.simulation.observe(events)
+
+        for event in events:
+            if event["type"] == "time":
+                current_time = event["time"]
+                if current_time not in self.timeData:
+                    self.timeData.append(current_time)
+                    if len(self.maxCloudAlphaData) < len(self.timeData):
+                        self.maxCloudAlphaData.append(None)
+
+            elif event["type"] == "residual":
+                # Captura informações de timing específicas do solver
+                self.profilingLogs.append(
+                    f"Solver performance: {event['field']} ({event['solver']}) {event['iterations']} iterations"
                 )
+                # Plota apenas o primeiro corretor de cada passo de tempo
+                if event["corrector"] == 0:
+                    self.addResidualPoint(event["field"], event.get(self.residualQuantity, event["initial"]))
 
-            while len(self.residualData[variable]) < len(self.timeData) - 1:
-                self.residualData[variable].append(None)
+            elif event["type"] == "cloud":
+                self.updateParcelPlot()
 
-            self.residualData[variable].append(residual)
+            elif event["type"] == "timestep":
+                if self.residualQuantity == "timestep":
+                    self.updateTimestepPlot()
 
-            self.updateResidualPlot(variable)
+            elif event["type"] == "alert":
+                self.outputArea.append(f"Alerta de convergência (t = {event['time']}): {event['message']}")
+                self.profilingLogs.append(f"⚠ {event['message']}")
 
         # Captura max(cloud:alpha)
         max_alpha_match = re.search(r'Max cell volume fraction\s*=\s*([0-9.eE+-]+)', line)
@@ -1116,123 +1607,309 @@ class OpenFOAMInterface(QWidget):
                     self.maxCloudAlphaData = self.maxCloudAlphaData[:len(self.timeData)-1] + [value]
                 self.updateMaxCloudAlphaPlot()
 
+    def addResidualPoint(self, variable, value):
+        self.ensureResidualPlot()
+        if variable not in self.residualData:
+            self.residualData[variable] = []
+        if not self.residualPlot.hasSeries(variable) and self.residualQuantity != "timestep":
+            self.residualPlot.addSeries(variable, len(self.residualData))
+
+        while len(self.residualData[variable]) < len(self.timeData) - 1:
+            self.residualData[variable].append(None)
+
+        self.residualData[variable].append(value)
+
+        self.updateResidualPlot(variable)
+
+    def changeResidualQuantity(self, index):
+        """Troca a grandeza plotada (resíduos, iterações ou Courant/deltaT) a partir da telemetria armazenada."""
+        self.residualQuantity = self.residualQuantityCombo.itemData(index)
+        if self.residualPlot is None:
+            # O gráfico ainda não existe: ensureResidualPlot aplica a grandeza escolhida
+            return
+        self.residualPlot.clear()
+        self.setPlotLogMode(self.residualQuantity != "iterations")
+        self.residualPlot.setLabel(self.residualQuantityCombo.itemText(index))
+
+        if self.residualQuantity == "timestep":
+            self.updateTimestepPlot()
+            return
+
+        for color_idx, variable in enumerate(self.residualData, start=1):
+            times, values = self.logParser.solver_series(variable, self.residualQuantity)
+            byTime = dict(zip(times.tolist(), values.tolist()))
+            self.residualData[variable] = [byTime.get(t) for t in self.timeData]
+            self.residualPlot.addSeries(variable, color_idx)
+            self.updateResidualPlot(variable)
+        if any(v is not None for v in self.maxCloudAlphaData):
+            self.updateMaxCloudAlphaPlot()
+
+    def updateTimestepPlot(self):
+        """Plota Courant (médio e máximo) e deltaT por tempo simulado."""
+        self.ensureResidualPlot()
+        self.residualPlot.setTimestep(self.logParser.timestepTable)
+
     def updateResidualPlot(self, variable):
         """
         Atualiza o gráfico de resíduos para uma variável específica.
         """
-        if variable in self.residualLines:
+        if self.residualPlot.hasSeries(variable):
             filtered_time_data = [t for t, r in zip(self.timeData, self.residualData[variable]) if r is not None]
             filtered_residual_data = [r for r in self.residualData[variable] if r is not None]
-
-            if filtered_time_data and filtered_residual_data:
-                self.residualLines[variable].setData(filtered_time_data, filtered_residual_data)
+            self.residualPlot.setSeries(variable, filtered_time_data, filtered_residual_data)
 
     def updateMaxCloudAlphaPlot(self):
-        # Cria a linha se não existir
-        if self.maxCloudAlphaLine is None:
-            pen = pg.mkPen(color='r', width=2, style=Qt.DashLine)
-            self.maxCloudAlphaLine = self.graphWidget.plot([], [], name='max(cloud:alpha)', pen=pen)
+        if self.residualQuantity == "timestep":
+            return
+        self.ensureResidualPlot()
         # Plota apenas os pontos válidos
         times = [t for t, v in zip(self.timeData, self.maxCloudAlphaData) if v is not None]
         values = [v for v in self.maxCloudAlphaData if v is not None]
-        self.maxCloudAlphaLine.setData(times, values)
+        self.residualPlot.setMaxAlpha(times, values)
 
     def clearResidualPlot(self):
         self.timeData = []
         self.residualData = {}
-        self.graphWidget.clear()
-        self.residualLines = {}
         self.maxCloudAlphaData = []
-        self.maxCloudAlphaLine = None
-
-    def connectProcessSignals(self, process):
-        """
-        Conecta os sinais do processo para capturar saída e atualizar resíduos.
-        """
-        def readOutput():
-            while process.canReadLine():
-                line = process.readLine().data().decode("utf-8").strip()
-                self.outputArea.append(line)  
-                self.parseResiduals(line)    
+        self.ensureResidualPlot()
+        self.residualPlot.clear()
+        self.residualPlot.clearParcels()
+        self.runMonitor.reset()
 
-        def readError():
-            while process.canReadLine():
-                line = process.readLine().data().decode("utf-8").strip()
-                self.outputArea.append(f"Erro: {line}")
-
-        process.readyReadStandardOutput.connect(readOutput)
-        process.readyReadStandardError.connect(readError)
+    def logSimulationCompletion(self, start_time, status):
+        end_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.runMonitor.record_completion(self.simulationHistory, self.currentSolver, start_time, status,
+                                          end_time=end_time, case_path=self.unvFilePath)
+        self.outputArea.append(f"Simulation {status}.")
 
-        start_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.outputArea.append("Iniciando simulação...")
-        
-        if not self.unvFilePath:
-            self.outputArea.append("Erro: Nenhum caso selecionado")
+    def reconstructPar(self):
+        """Escolhe tempos, campos e núcleos e inicia a reconstrução em paralelo."""
+        if not self.baseDir or not foam_case.processor_dirs(self.baseDir):
+            self.outputArea.append("Erro: O caso não possui diretórios processor*.")
             return
 
-        required_dirs = ["0", "system", "constant"]
-        if not all(QDir(self.unvFilePath).exists(dir_name) for dir_name in required_dirs):
-            self.outputArea.append("Erro: A pasta selecionada não contém os diretórios necessários (0, system, constant).")
-            return
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Reconstruct")
+        layout = QGridLayout(dialog)
+        latestCheckBox = QCheckBox("Apenas o último tempo (-latestTime)", dialog)
+        skipCheckBox = QCheckBox("Pular tempos já reconstruídos", dialog)
+        skipCheckBox.setChecked(True)
+        fieldsEdit = QLineEdit(dialog)
+        fieldsEdit.setPlaceholderText("todos (ex.: U p alpha.air)")
+        coresSpinBox = QSpinBox(dialog)
+        coresSpinBox.setRange(1, psutil.cpu_count(logical=True) or 1)
+        coresSpinBox.setValue(reconstruct_manager.core_budget(self.runningSubdomains()))
+        layout.addWidget(latestCheckBox, 0, 0, 1, 2)
+        layout.addWidget(skipCheckBox, 1, 0, 1, 2)
+        layout.addWidget(QLabel("Campos (-fields):"), 2, 0)
+        layout.addWidget(fieldsEdit, 2, 1)
+        layout.addWidget(QLabel("Processos reconstructPar:"), 3, 0)
+        layout.addWidget(coresSpinBox, 3, 1)
+        startButton = QPushButton("Reconstruir", dialog)
+        startButton.clicked.connect(dialog.accept)
+        layout.addWidget(startButton, 4, 1)
 
-        if not self.currentSolver:
-            self.outputArea.append("Erro: Nenhum solver selecionado")
+        if not dialog.exec_():
             return
+        self.startReconstruction(
+            latestOnly=latestCheckBox.isChecked(),
+            fields=fieldsEdit.text().split() or None,
+            workers=coresSpinBox.value(),
+            skipReconstructed=skipCheckBox.isChecked(),
+        )
 
-        self.clearResidualPlot()
+    def runningSubdomains(self):
+        """Núcleos ocupados pela simulação em execução (0 se não houver)."""
+        if self.simulation.running():
+            return foam_case.number_of_subdomains(self.baseDir) or 1
+        return 0
 
-        command = f'bash -l -c "source /opt/{self.currentOpenFOAMVersion}/etc/bashrc && mpirun -np 6 {self.currentSolver} -parallel"'
+    def startReconstruction(self, latestOnly=False, fields=None, workers=None, skipReconstructed=True):
+        if self.reconstructionManager is not None and self.reconstructionManager.busy():
+            self.outputArea.append("Uma reconstrução já está em andamento.")
+            return
+        allTimes = foam_case.common_processor_times(self.baseDir)
+        pending = reconstruct_manager.pending_times(self.baseDir, fields, latestOnly, skipReconstructed)
+        if not pending:
+            self.outputArea.append("Nenhum tempo a reconstruir: os diretórios reconstruídos estão atualizados.")
+            return
+        workers = workers or reconstruct_manager.core_budget(self.runningSubdomains())
+        chunks = reconstruct_manager.split_chunks([name for _, name in pending], workers)
+        self.reconstructionManager = reconstruct_manager.ReconstructionManager(
+            self.baseDir, f"source /opt/{self.currentOpenFOAMVersion}/etc/bashrc", workers
+        )
+        self.reconstructionManager.start(chunks, [name for _, name in allTimes], fields)
+        self.outputArea.append(
+            f"Reconstruindo {len(pending)} de {len(allTimes)} tempos em {len(chunks)} blocos "
+            f"({min(workers, len(chunks))} processos em paralelo)..."
+        )
+        self.reconstructionTimer = QTimer(self)
+        self.reconstructionTimer.timeout.connect(self.checkReconstruction)
+        self.reconstructionTimer.start(1000)
+
+    def checkReconstruction(self):
+        progress = self.reconstructionManager.poll()
+        self.statusBar.showMessage(
+            f"reconstructPar: {progress['done']}/{progress['total']} blocos ({progress['running']} em execução)"
+        )
+        if not progress["finished"]:
+            return
+        self.reconstructionTimer.stop()
+        self.reconstructionTimer = None
+        self.statusBar.clearMessage()
+        for item in progress["failed"]:
+            self.outputArea.append(
+                f"Erro na reconstrução (código {item['returncode']}): {item['command']} "
+                f"— veja log.reconstructPar.{item['index']}"
+            )
+        self.outputArea.append(
+            f"Reconstrução finalizada: {progress['done'] - len(progress['failed'])}/{progress['total']} blocos concluídos."
+        )
+    
+    def openScalingStudy(self):
+        """Roda o caso com poucos passos em 1, 2, 4, ... N ranks e mede speedup e eficiência."""
+        if not self.baseDir or not os.path.isdir(os.path.join(self.baseDir, "system")):
+            self.outputArea.append("Erro: Nenhum caso selecionado ou diretório system ausente.")
+            return
+        if self.simulation.running():
+            self.outputArea.append("Pare a simulação antes do estudo de escalabilidade: as medições disputariam os núcleos.")
+            return
+        if self.scalingStudy is not None and self.scalingStudy.busy():
+            self.outputArea.append("Um estudo de escalabilidade já está em andamento.")
+            return
 
-        self.outputArea.append(f"Iniciando simulação com {self.currentSolver}...")
-        self.currentProcess = QProcess(self)
-        self.setupProcessEnvironment(self.currentProcess)
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Scaling Study")
+        layout = QGridLayout(dialog)
+        ranksSpinBox = QSpinBox(dialog)
+        ranksSpinBox.setRange(1, psutil.cpu_count(logical=True) or 1)
+        ranksSpinBox.setValue(decomposition_planner.physical_cores())
+        stepsSpinBox = QSpinBox(dialog)
+        stepsSpinBox.setRange(5, 100000)
+        stepsSpinBox.setValue(50)
+        stubCheckBox = QCheckBox("Solver sintético (stub_solver.py, sem OpenFOAM)", dialog)
+        layout.addWidget(QLabel("Máximo de ranks:"), 0, 0)
+        layout.addWidget(ranksSpinBox, 0, 1)
+        layout.addWidget(QLabel("Passos de tempo por execução:"), 1, 0)
+        layout.addWidget(stepsSpinBox, 1, 1)
+        layout.addWidget(stubCheckBox, 2, 0, 1, 2)
+        startButton = QPushButton("Iniciar", dialog)
+        startButton.clicked.connect(dialog.accept)
+        layout.addWidget(startButton, 3, 1)
+        if not dialog.exec_():
+            return
+        self.startScalingStudy(ranksSpinBox.value(), stepsSpinBox.value(), stubCheckBox.isChecked())
+
+    def startScalingStudy(self, maxRanks, steps, useStub=False):
+        ranks = scaling_study.rank_counts(maxRanks)
+        self.scalingStudy = scaling_study.ScalingStudy(
+            self.baseDir, ranks, steps, solver=self.currentSolver,
+            shell_prefix="" if useStub else f"source /opt/{self.currentOpenFOAMVersion}/etc/bashrc",
+            command=scaling_study.stub_command if useStub else scaling_study.solver_command,
+        )
+        self.outputArea.append(
+            f"Estudo de escalabilidade: {steps} passos com {', '.join(map(str, ranks))} ranks "
+            f"(em {os.path.join(self.baseDir, scaling_study.SCALING_DIR)})."
+        )
+        try:
+            self.scalingStudy.start()
+        except OSError as e:
+            self.outputArea.append(f"Erro ao preparar o estudo de escalabilidade: {e}")
+            self.scalingStudy = None
+            return
+        self.scalingTimer = QTimer(self)
+        self.scalingTimer.timeout.connect(self.checkScalingStudy)
+        self.scalingTimer.start(1000)
 
-        def finished(code):
-            if code == 0:
-                self.outputArea.append("Simulação concluída com sucesso.")
+    def checkScalingStudy(self):
+        reported = len(self.scalingStudy.results)
+        try:
+            progress = self.scalingStudy.poll()
+        except OSError as e:
+            self.outputArea.append(f"Erro no estudo de escalabilidade: {e}")
+            self.scalingStudy.cancel()
+            progress = self.scalingStudy.progress()
+        for result in self.scalingStudy.results[reported:]:
+            if result["seconds_per_step"]:
+                self.outputArea.append(f"  {result['ranks']} ranks: {result['seconds_per_step']:.4g} s/passo")
             else:
-                self.outputArea.append(f"Simulação finalizada com código de erro: {code}")
-
-        self.currentProcess.finished.connect(finished)
-        self.connectProcessSignals(self.currentProcess)
-        self.outputArea.append(f"Comando executado: {command}")
+                self.outputArea.append(
+                    f"  {result['ranks']} ranks: sem medições (código {result['returncode']}), "
+                    f"veja {scaling_study.SCALING_DIR}/np{result['ranks']}/log.foamRun"
+                )
+        if progress["running"] is not None:
+            self.statusBar.showMessage(
+                f"Scaling study: {progress['running']} ranks ({progress['done'] + 1}/{progress['total']})"
+            )
+        if not progress["finished"]:
+            return
+        self.scalingTimer.stop()
+        self.scalingTimer = None
+        self.statusBar.clearMessage()
+        self.outputArea.append("Estudo de escalabilidade concluído: resultados em scaling.json.")
+        self.showScalingResults()
+
+    def showScalingResults(self):
+        """Curvas de speedup e eficiência paralela do scaling.json do caso."""
+        try:
+            study = scaling_study.load_results(self.baseDir)
+        except ValueError as e:
+            self.outputArea.append(f"Erro ao ler scaling.json: {e}")
+            return
+        results = [r for r in (study or {}).get("results", []) if r.get("seconds_per_step")]
+        if not results:
+            QMessageBox.warning(self, "Scaling Study", "Nenhum resultado de escalabilidade para este caso.")
+            return
 
-        self.currentProcess.start("bash", ["-l", "-c", command])
-        self.currentProcess.finished.connect(lambda: self.logSimulationCompletion(start_time))
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"Escalabilidade — {study.get('date', '')}")
+        dialog.resize(1000, 600)
+        layout = QVBoxLayout(dialog)
+        plotsLayout = QHBoxLayout()
+        ranks = [r["ranks"] for r in results]
+
+        speedupPlot = pg.PlotWidget(title="Speedup")
+        speedupPlot.setBackground('w')
+        speedupPlot.addLegend()
+        speedupPlot.showGrid(x=True, y=True)
+        speedupPlot.setLabel('bottom', 'Ranks')
+        base = ranks[0]
+        speedupPlot.plot(ranks, [n / base for n in ranks], name="ideal", pen=pg.mkPen(color='k', style=Qt.DashLine))
+        speedupPlot.plot(ranks, [r["speedup"] for r in results], name="medido",
+                         pen=pg.mkPen(color='b', width=2), symbol='o', symbolBrush='b')
+        plotsLayout.addWidget(speedupPlot)
+
+        efficiencyPlot = pg.PlotWidget(title="Eficiência paralela")
+        efficiencyPlot.setBackground('w')
+        efficiencyPlot.showGrid(x=True, y=True)
+        efficiencyPlot.setLabel('bottom', 'Ranks')
+        efficiencyPlot.setYRange(0, 1.1)
+        efficiencyPlot.plot(ranks, [r["efficiency"] for r in results],
+                            pen=pg.mkPen(color='r', width=2), symbol='o', symbolBrush='r')
+        plotsLayout.addWidget(efficiencyPlot)
+        layout.addLayout(plotsLayout, 3)
+
+        table = QTableWidget(dialog)
+        table.setColumnCount(4)
+        table.setHorizontalHeaderLabels(["Ranks", "s/passo", "Speedup", "Eficiência"])
+        table.setRowCount(len(results))
+        for row, r in enumerate(results):
+            table.setItem(row, 0, QTableWidgetItem(str(r["ranks"])))
+            table.setItem(row, 1, QTableWidgetItem(f"{r['seconds_per_step']:.4g}"))
+            table.setItem(row, 2, QTableWidgetItem(f"{r['speedup']:.2f}"))
+            table.setItem(row, 3, QTableWidgetItem(f"{r['efficiency']:.0%}"))
+        table.resizeColumnsToContents()
+        layout.addWidget(table, 1)
+        layout.addWidget(QLabel(f"{study.get('steps')} passos, {study.get('cells') or '?'} células, solver {study.get('solver')}"))
+        if study.get("deltaT_source") == "controlDict":
+            layout.addWidget(QLabel(f"Aviso: deltaT fixo {study['deltaT']:g} do controlDict (sem log.foamRun no caso); "
+                                    "com maxCo o passo de produção pode ser outro."))
+        elif study.get("deltaT") is not None:
+            layout.addWidget(QLabel(f"deltaT fixo {study['deltaT']:g} (último passo do log.foamRun do caso)"))
 
-    def logSimulationCompletion(self, start_time):
-        end_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        status = "Finished" if self.currentProcess.exitCode() == 0 else "Interrupted"
-        self.simulationHistory.add_entry(
-            solver=self.currentSolver,
-            case_path=self.unvFilePath,
-            start_time=start_time,
-            end_time=end_time,
-            status=status
-        )
-        self.outputArea.append(f"Simulation {status}.")
+        dialog.setLayout(layout)
+        dialog.exec_()
 
-    def reconstructPar(self):
-        if not self.unvFilePath:
-            self.outputArea.append("Error: No case selected.")
-            return
-        
-        self.outputArea.append("Reconstruindo caso...")
-        command = f'bash -l -c "source /opt/{self.currentOpenFOAMVersion}/etc/bashrc && reconstructPar"'
-        
-        self.currentProcess = QProcess(self)
-        self.setupProcessEnvironment(self.currentProcess)
-        self.currentProcess.setWorkingDirectory(self.baseDir)
-        
-        def finished(code):
-            self.outputArea.append(f"Reconstrução finalizada com código {code}", 5000)
-            self.currentProcess = None
-        
-        self.currentProcess.finished.connect(finished)
-        self.connectProcessSignals(self.currentProcess)
-        self.outputArea.append(f"Command: {command}")
-        self.currentProcess.start(command)
-    
     def decomposePar(self):
         if not self.unvFilePath:
             self.outputArea.append("Error: No case selected.")
@@ -1243,47 +1920,48 @@ class OpenFOAMInterface(QWidget):
             self.outputArea.append("Error: The selected folder does not contain the required directories (0, system, constant).")
             return
 
+        if self.simulation.running():
+            self.outputArea.append("Error: A simulation is running; stop it before decomposing.")
+            return
+
         self.outputArea.append("Starting decomposition...")
         command = f'source /opt/{self.currentOpenFOAMVersion}/etc/bashrc && decomposePar'
 
-        self.currentProcess = QProcess(self)
-        self.setupProcessEnvironment(self.currentProcess)
-        self.currentProcess.setWorkingDirectory(self.baseDir)
-
-        def finished(code):
+        def finished(code, status):
             if code == 0:
                 self.outputArea.append("Decomposition completed successfully.")
             else:
                 self.outputArea.append(f"Decomposition finished with error code: {code}")
 
-        self.currentProcess.finished.connect(finished)
-        self.connectProcessSignals(self.currentProcess)
-        self.currentProcess.start("bash", ["-c", command])
+        self.simulation.start(command, self.baseDir, openfoam_environment(self.currentOpenFOAMVersion), finished)
     
-    def clearSimulation(self):
+    def clearSimulation(self, archive=False):
         caseDir = QDir(self.baseDir)
         timeDirs = caseDir.entryList(QDir.Dirs | QDir.NoDotAndDotDot)
-        removedAny = False
+        toRemove = []
         
         for dirName in timeDirs:
             try:
                 timeValue = float(dirName)
                 if timeValue > 0:
-                    timeDir = QDir(caseDir.filePath(dirName))
-                    if timeDir.removeRecursively():
-                        self.outputArea.append(f"Removed time folder: {dirName}")
-                        removedAny = True
+                    toRemove.append(dirName)
             except ValueError:
                 pass
         
-        if removedAny:
-            self.outputArea.append("Time folders removed successfully.")
+        if toRemove:
+            moved = self.removeDirectoriesInBackground(toRemove, archive=archive)
+            verb = "archived" if archive else "removed"
+            self.outputArea.append(f"{len(moved)} time folders moved aside; they will be {verb} in the background.")
         else:
             self.outputArea.append("No time folders found to remove.")
 
+    def archiveSimulation(self):
+        """Compacta as pastas de tempo em <caso>/archive/*.tar.gz e as remove do caso."""
+        self.clearSimulation(archive=True)
+
     def runSimulation(self):
         """Inicia a simulação após perguntar o tempo de execução e atualizar o controlDict."""
-        if self.currentProcess and self.currentProcess.state() == QProcess.Running:
+        if self.simulation.running():
             self.outputArea.append("Outra simulação já está em execução. Pare-a antes de iniciar uma nova.")
             return
 
@@ -1358,77 +2036,114 @@ class OpenFOAMInterface(QWidget):
             os.chmod(allrunPath, 0o755)
 
         command = f'source /opt/{self.currentOpenFOAMVersion}/etc/bashrc && cd {caseDir} && ./Allrunparallel'
-        self.currentProcess = QProcess(self)
-        self.setupProcessEnvironment(self.currentProcess)
-        self.currentProcess.setWorkingDirectory(caseDir)
+        self.startSimulationProcess(command, start_time)
 
-        def finished(code):
+    def startSimulationProcess(self, command, start_time, resume=False):
+        """Inicia o processo da simulação no diretório do caso e registra o histórico ao terminar.
+
+        Uma execução nova começa com o parser, o monitor e os gráficos vazios (o histórico
+        guarda só as séries dela); com 'resume' as séries da execução retomada continuam.
+        """
+        if self.runViaDaemonAction.isChecked():
+            self.submitToDaemon(command)
+            return
+        self.loadWatchdog()
+        if not resume:
+            self.clearResidualPlot()
+        self.startRetentionPolicy()
+
+        def finished(code, status):
             if code == 0:
                 self.outputArea.append("Simulação finalizada com sucesso.")
             else:
                 self.outputArea.append(f"Simulação finalizada com erro: {code}")
-            self.logSimulationCompletion(start_time)
+            self.stopRetentionPolicy()
+            self.logSimulationCompletion(start_time, status)
+
+        self.outputArea.append(f"Comando executado: {command}")
+        self.simulation.start(command, self.baseDir, openfoam_environment(self.currentOpenFOAMVersion), finished)
+
+    def handleSimulationOutput(self, line):
+        self.outputArea.append(line)
+        self.parseResiduals(line)
+        QApplication.processEvents()
+
+    def resumeFromLatestTime(self):
+        """Retoma a simulação a partir do último tempo escrito, reaproveitando a decomposição.
+
+        Em casos decompostos, usa o último tempo presente em todos os processor*. Se os
+        ranks divergirem, fixa startFrom startTime nesse tempo comum (latestTime faria
+        cada rank partir de um tempo diferente). Executa apenas o solver (sem decomposePar).
+        O stopAt só volta a endTime se ainda estiver com o writeNow de uma parada com checkpoint.
+        """
+        if self.simulation.running():
+            self.outputArea.append("Outra simulação já está em execução. Pare-a antes de retomar.")
+            return
+        controlDictPath = os.path.join(self.baseDir, "system", "controlDict")
+        if not os.path.exists(controlDictPath):
+            self.outputArea.append("Erro: controlDict não encontrado.")
+            return
+
+        processors = foam_case.processor_dirs(self.baseDir)
+        entries = {"startFrom": "latestTime"}
+        if processors:
+            latestName, latestByRank = foam_case.decomposed_latest_time(self.baseDir)
+            if latestName is None:
+                self.outputArea.append("Erro: Nenhum tempo comum a todos os processor*; é preciso decompor novamente.")
+                return
+            subdomains = foam_case.number_of_subdomains(self.baseDir)
+            if subdomains is not None and subdomains != len(processors):
+                self.outputArea.append(f"Aviso: decomposeParDict indica {subdomains} subdomínios, "
+                                       f"mas existem {len(processors)} processor*. Usando {len(processors)}.")
+            latest = float(latestName)
+            if any(value != latest for value in latestByRank.values()):
+                lagging = ", ".join(f"{name}={value}" for name, value in latestByRank.items() if value != latest)
+                self.outputArea.append(f"Aviso: ranks com último tempo diferente ({lagging}); "
+                                       f"retomando do tempo comum {latestName}.")
+                entries = {"startFrom": "startTime", "startTime": latestName}
+        else:
+            latest = foam_case.latest_time(self.baseDir)
+            if latest is None:
+                self.outputArea.append("Erro: Nenhum tempo escrito encontrado para retomar.")
+                return
+
+        if foam_dict.read(controlDictPath).get("stopAt") == GRACEFUL_STOP_AT:
+            entries["stopAt"] = "endTime"
+        foam_dict.set_entries(controlDictPath, entries)
+        self.outputArea.append("controlDict: " + ", ".join(f"{k} {v}" for k, v in entries.items()))
+
+        solver = f"foamRun -solver {self.currentSolver}"
+        if processors:
+            solver = f"mpirun -np {len(processors)} {solver} -parallel"
+        command = (f'source /opt/{self.currentOpenFOAMVersion}/etc/bashrc && cd {self.baseDir} && '
+                   f'{solver} 2>&1 | tee -a log.foamRun')
+        self.outputArea.append(f"Retomando simulação a partir de t = {latest}...")
+        self.startSimulationProcess(command, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), resume=True)
 
-        self.currentProcess.finished.connect(finished)
-        self.connectProcessSignals(self.currentProcess)
-        self.currentProcess.start("bash", ["-c", command])
-    
     def pauseSimulation(self):
         """Pausa a simulação em execução enviando o sinal SIGSTOP para todos os processos filhos."""
-        if self.currentProcess and self.currentProcess.state() == QProcess.Running:
-            pid = self.currentProcess.processId()
-            if pid:
-                try:
-                    import psutil
-                    parent = psutil.Process(pid)
-                    # Pausa todos os filhos recursivamente
-                    for child in parent.children(recursive=True):
-                        child.suspend()
-                    parent.suspend()
-                    self.outputArea.append("Simulação pausada (todos os processos).")
-                except Exception as e:
-                    self.outputArea.append(f"Erro ao pausar a simulação: {e}")
-            else:
-                self.outputArea.append("Não foi possível obter o PID do processo para pausar.")
-        else:
-            self.outputArea.append("Nenhuma simulação em execução para pausar.")
+        self.simulation.pause()
 
     def resumeSimulation(self):
         """Retoma uma simulação pausada enviando o sinal SIGCONT para todos os processos filhos."""
-        if self.currentProcess:
-            pid = self.currentProcess.processId()
-            if pid:
-                try:
-                    import psutil
-                    parent = psutil.Process(pid)
-                    # Retoma todos os filhos recursivamente
-                    for child in parent.children(recursive=True):
-                        child.resume()
-                    parent.resume()
-                    self.outputArea.append("Simulação retomada (todos os processos).")
-                except Exception as e:
-                    self.outputArea.append(f"Erro ao retomar a simulação: {e}")
-            else:
-                self.outputArea.append("Não foi possível obter o PID do processo para retomar.")
-        else:
-            self.outputArea.append("Nenhuma simulação para retomar.")
+        self.simulation.resume()
 
     def restartSimulation(self):
-        """Reinicia a simulação."""
-        # First, stop any existing simulation
-        if self.currentProcess and self.currentProcess.state() == QProcess.Running:
-            self.stopSimulation() # Ensure it's fully stopped
-            # Wait a bit for the process to terminate if stopSimulation is asynchronous in effect
-            # Or ensure stopSimulation is blocking or provides a callback/signal
-            # For simplicity here, we assume stopSimulation effectively stops it before proceeding.
-
-        # Clear necessary previous run data, e.g., processor directories, logs if needed
-        # self.clearDecomposedProcessors() # Example, if you always want to clear these
-        # self.clearOldProcessorDirs() # As per your existing method
+        """Reinicia a simulação a partir do último tempo consistente, sem redecompor.
+
+        Se houver uma simulação rodando, ela é parada com checkpoint (writeNow) e
+        retomada assim que o solver encerrar.
+        """
+        if self.simulation.running():
+            self.pendingRestart = True
+            self.stopSimulation()
+            if self.simulation.stopping():
+                self.outputArea.append("Reinício agendado para depois da escrita do checkpoint.")
+                return
+            self.pendingRestart = False
 
         self.outputArea.append("Reiniciando a simulação...")
-        # Re-run the simulation. This might be similar to runSimulation or a specific restart logic
-        self.runSimulation() # Assuming runSimulation can handle starting fresh or from where it should
+        self.resumeFromLatestTime()
 
     def clearDecomposedProcessors(self):
         if not self.baseDir: 
@@ -1437,56 +2152,223 @@ class OpenFOAMInterface(QWidget):
 
         caseDir = QDir(self.baseDir)
         processorDirs = caseDir.entryList(["processor*"], QDir.Dirs | QDir.NoDotAndDotDot)
-        removedAny = False
 
-        for dirName in processorDirs:
-            processorDir = QDir(caseDir.filePath(dirName))
-            if processorDir.removeRecursively():
+        if processorDirs:
+            moved = self.removeDirectoriesInBackground(processorDirs)
+            for dirName in processorDirs:
                 self.outputArea.append(f"Removendo pasta: {dirName}")
-                removedAny = True
-
-        if removedAny:
-            self.outputArea.append("Pastas de decomposição removidas com sucesso.")
+            self.outputArea.append(f"{len(moved)} pastas de decomposição liberadas; remoção em segundo plano.")
         else:
             self.outputArea.append("Nenhuma pasta de decomposição encontrada.")
     
     def stopSimulation(self):
-        """Para o processo de simulação em execução e seus processos filhos."""
-        if self.currentProcess and self.currentProcess.state() == QProcess.Running:
-            self.outputArea.append("Parando a simulação...")
-            
-            pid = self.currentProcess.processId()
-            
+        """Para a simulação salvando o estado atual.
+
+        Troca stopAt para writeNow no controlDict (lido pelo solver via runTimeModifiable)
+        e aguarda o solver escrever o último tempo e encerrar. Só recorre a
+        SIGTERM/SIGKILL (forceStopSimulation) se o tempo limite for atingido.
+        """
+        self.simulation.request_stop()
+
+    def gracefulStopFinished(self, result):
+        if self.pendingRestart:
+            self.pendingRestart = False
+            self.outputArea.append("Reiniciando a simulação...")
+            self.resumeFromLatestTime()
+
+    def forceStopSimulation(self):
+        """Para o processo de simulação em execução e seus processos filhos.
+
+        A execução é registrada no histórico ('Interrupted') quando o processo termina.
+        """
+        self.simulation.force_stop()
+
+    def setRunViaDaemon(self, enabled):
+        self.config["runViaDaemon"] = enabled
+        self.save_config()
+
+    def submitToDaemon(self, command):
+        """Entrega a execução ao daemon do gafoam e conecta a interface a ela assim que começar.
+
+        A saída vai para <caso>/log.gafoam; o daemon aplica o watchdog e registra o histórico.
+        """
+        historyFile = os.path.abspath(self.simulationHistory.history_file)
+        monitor_daemon.submit_job({
+            "case": self.baseDir,
+            "command": command,
+            "solver": self.currentSolver,
+            "history": historyFile,
+            "log": "log.gafoam",
+            "watchdog": self.watchdogEnabledAction.isChecked(),
+        })
+        pid = monitor_daemon.ensure_daemon(history=historyFile)
+        self.outputArea.append(f"Execução entregue ao daemon (pid {pid}); aguardando o início...")
+        self.pendingDaemonRun = (os.path.abspath(self.baseDir), datetime.now())
+        self.pendingDaemonTimer = QTimer(self)
+        self.pendingDaemonTimer.timeout.connect(self.checkPendingDaemonRun)
+        self.pendingDaemonTimer.start(500)
+
+    def checkPendingDaemonRun(self):
+        case, submitted = self.pendingDaemonRun
+        address = monitor_daemon.api_address()
+        runs = []
+        if address:
             try:
-                parent = psutil.Process(pid)
-                for child in parent.children(recursive=True): 
-                    child.terminate()  
-                parent.terminate()  
-                gone, still_alive = psutil.wait_procs(parent.children(recursive=True), timeout=5)
-                for p in still_alive:
-                    p.kill()  
-                parent.kill()
-                self.outputArea.append("Simulação interrompida com sucesso.")
-            except psutil.NoSuchProcess:
-                self.outputArea.append("O processo já foi encerrado.")
-            except Exception as e:
-                self.outputArea.append(f"Erro ao encerrar o processo: {e}")
-            
-            from datetime import datetime
-            end_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            start_time = end_time  
-            self.simulationHistory.add_entry(
-                solver=self.currentSolver,
-                case_path=self.unvFilePath,
-                start_time=start_time,
-                end_time=end_time,
-                status="Interrompida"
-            )
-            self.outputArea.append("Simulação Interrompida.")
-            
-            self.currentProcess = None 
-        else:
-            self.outputArea.append("Nenhuma simulação em execução para parar.")
+                runs = monitoring_api.ApiClient.from_address(address, timeout=2).get("/runs")
+            except (OSError, monitoring_api.ApiError):
+                runs = []
+        started = [run for run in runs if run["case"] == case and run["state"] == "running"]
+        if started:
+            self.pendingDaemonTimer.stop()
+            self.pendingDaemonTimer = None
+            self.attachToDaemonRun(address, started[-1]["id"])
+        elif (datetime.now() - submitted).total_seconds() > 30:
+            self.pendingDaemonTimer.stop()
+            self.pendingDaemonTimer = None
+            self.outputArea.append("O daemon não iniciou a execução em 30 s; veja ~/.gafoam/daemon.log.")
+
+    def openDaemonAttach(self):
+        """Escolhe uma execução do daemon e conecta a interface a ela (sem afetar a simulação)."""
+        address, ok = QInputDialog.getText(self, "Conectar ao Daemon",
+                                           "Endereço da API (unix:<socket> ou http://host:porta):",
+                                           text=monitor_daemon.api_address() or "")
+        if not ok or not address.strip():
+            return
+        address = address.strip()
+        try:
+            runs = monitoring_api.ApiClient.from_address(address, timeout=5).get("/runs")
+        except (OSError, monitoring_api.ApiError) as e:
+            QMessageBox.warning(self, "Daemon", f"Não foi possível consultar o daemon em {address}: {e}")
+            return
+        if not runs:
+            QMessageBox.information(self, "Daemon", "O daemon não está acompanhando nenhuma execução.")
+            return
+        labels = [f"{run['id']}: {run['case']} ({run['state']}, t = {run['time']})" for run in runs]
+        running = [i for i, run in enumerate(runs) if run["state"] == "running"]
+        label, ok = QInputDialog.getItem(self, "Conectar ao Daemon", "Execução:", labels,
+                                         running[-1] if running else len(labels) - 1, False)
+        if ok:
+            self.attachToDaemonRun(address, runs[labels.index(label)]["id"])
+
+    def attachToDaemonRun(self, address, run):
+        """Recebe o snapshot (séries reduzidas e final do console) e depois as linhas novas do log."""
+        self.detachFromDaemon()
+        self.daemonRun = (address, run)
+        self.attachStarted = datetime.now()
+        client = monitoring_api.ApiClient.from_address(address)
+        self.daemonReceiver = monitoring_api.EventReceiver(
+            client, f"/ws?run={run}&snapshot=1&lines=1&types=line,watchdog&max_points=2000").start()
+        self.daemonTimer = QTimer(self)
+        self.daemonTimer.timeout.connect(self.checkDaemonAttachment)
+        self.daemonTimer.start(100)
+        self.outputArea.append(f"Conectando à execução {run} do daemon ({address})...")
+
+    def checkDaemonAttachment(self):
+        if self.daemonReceiver is None:
+            return
+        for event in self.daemonReceiver.drain():
+            if event["type"] == "snapshot":
+                self.applyDaemonSnapshot(event)
+            elif event["type"] == "line":
+                self.outputArea.append(event["line"])
+                self.parseResiduals(event["line"])
+            elif event["type"] == "watchdog":
+                message = f"Watchdog do daemon [{event['rule']}] (t = {event['time']}): {event['message']} → {event['action']}"
+                self.outputArea.append(message)
+                self.statusBar.showMessage(message, 30000)
+            elif event["type"] == "disconnected":
+                self.outputArea.append(f"Desconectado do daemon: {event['reason']}")
+                self.detachFromDaemon()
+                return
+
+    def applyDaemonSnapshot(self, snapshot):
+        status = snapshot["status"]
+        self.clearResidualPlot()
+        # O watchdog da execução é o do daemon; o local só acompanha
+        self.runMonitor.watchdog.enabled = False
+        self.runMonitor.case_path = status["case"]
+        restore_tables(self.logParser.store, snapshot["tables"])
+        self.logParser.current_time = status.get("time")
+
+        solver = self.logParser.solverTable
+        self.timeData = sorted(set(solver.data["time"]))
+        self.residualData = {field: [] for field in dict.fromkeys(solver.data["field"])}
+        times, alpha = cloud_stats.cloud_series(self.logParser.cloudTable, cloud_stats.MAX_ALPHA)
+        alphaByTime = dict(zip(times.tolist(), alpha.tolist()))
+        self.maxCloudAlphaData = [alphaByTime.get(t) for t in self.timeData]
+        self.changeResidualQuantity(self.residualQuantityCombo.currentIndex())
+        self.updateParcelPlot()
+
+        self.outputArea.setPlainText("\n".join(snapshot["console"]))
+        elapsed = (datetime.now() - self.attachStarted).total_seconds()
+        self.outputArea.append(f"Conectado à execução {snapshot['run']} do daemon ({status['case']}, "
+                               f"{status['state']}, t = {status.get('time')}) em {elapsed:.2f} s.")
+        self.statusBar.showMessage(f"Conectado ao daemon: {status['case']}", 10000)
+
+    def detachFromDaemon(self):
+        """Encerra só a conexão com o daemon; a simulação e o acompanhamento no daemon continuam."""
+        if self.daemonReceiver is None:
+            return
+        self.daemonReceiver.stop()
+        self.daemonReceiver = None
+        self.daemonTimer.stop()
+        self.daemonTimer = None
+        self.daemonRun = None
+        self.outputArea.append("Desconectado do daemon (a simulação continua).")
+
+    def loadWatchdog(self):
+        """Recarrega as regras do watchdog.json do caso (regras padrão se o arquivo for inválido)."""
+        try:
+            self.watchdog = Watchdog.load(self.baseDir)
+        except (ValueError, KeyError, TypeError) as e:
+            self.outputArea.append(f"Erro no watchdog.json, usando regras padrão: {e}")
+            self.watchdog = Watchdog()
+        self.watchdog.enabled = self.watchdog.enabled and self.watchdogEnabledAction.isChecked()
+        self.runMonitor.watchdog = self.watchdog
+        self.runMonitor.case_path = self.baseDir
+
+    def setWatchdogEnabled(self, enabled):
+        self.watchdog.enabled = enabled
+        self.outputArea.append(f"Watchdog {'ativado' if enabled else 'desativado'}.")
+
+    def editWatchdogRules(self):
+        """Abre o watchdog.json do caso no editor (criando-o com as regras padrão, se necessário)."""
+        if not self.baseDir or not os.path.isdir(self.baseDir):
+            self.outputArea.append("Erro: Nenhum diretório base selecionado.")
+            return
+        configPath = Watchdog.config_path(self.baseDir)
+        if not os.path.exists(configPath):
+            Watchdog().save(self.baseDir)
+            self.outputArea.append(f"Regras padrão do watchdog criadas em {configPath}.")
+        fileEditorWindow = FileEditorWindow(self.baseDir, self)
+        fileEditorWindow.openFile(configPath)
+        fileEditorWindow.exec_()
+        self.loadWatchdog()
+
+    def checkWatchdogStall(self):
+        if self.simulation.running():
+            for trigger in self.watchdog.tick():
+                self.handleWatchdogTrigger(trigger)
+
+    def handleWatchdogTrigger(self, trigger):
+        """Executa a ação de uma regra do watchdog: notificar, checkpoint + pausa ou parar."""
+        message = f"Watchdog [{trigger['rule']}] (t = {trigger['time']}): {trigger['message']} → {trigger['action']}"
+        self.outputArea.append(message)
+        self.profilingLogs.append(f"⚠ {message}")
+        self.statusBar.showMessage(message, 30000)
+        if not self.simulation.running():
+            return
+        if trigger["action"] == "checkpoint_pause":
+            self.checkpointAndPause()
+        elif trigger["action"] == "stop":
+            self.stopSimulation()
+
+    def checkpointAndPause(self):
+        """Força a escrita de um tempo no próximo passo e pausa a simulação assim que ele aparecer.
+
+        O controlDict é alterado e restaurado pelo RunControl (o mesmo do RunJob do CLI e do daemon).
+        """
+        self.simulation.checkpoint_and_pause()
 
     def clearTerminal(self):
         self.outputArea.clear()
@@ -1514,6 +2396,7 @@ class OpenFOAMInterface(QWidget):
             new_lines = []
             inside_info = False
             inside_debug = False
+            inside_profiling = False
             
             for line in lines:
                 if 'InfoSwitches' in line:
@@ -1522,11 +2405,15 @@ class OpenFOAMInterface(QWidget):
                 elif 'DebugSwitches' in line:
                     inside_debug = True
                     continue
+                elif line.strip().startswith('profiling'):
+                    inside_profiling = True
+                    continue
                 
-                if inside_info or inside_debug:
+                if inside_info or inside_debug or inside_profiling:
                     if '}' in line:
                         inside_info = False
                         inside_debug = False
+                        inside_profiling = False
                     continue
                 
                 new_lines.append(line)
@@ -1552,6 +2439,15 @@ class OpenFOAMInterface(QWidget):
             new_lines.insert(insert_idx+8, '    InfoSwitch          1;\n')
             new_lines.insert(insert_idx+9, '    TimeRegistry        1;  // Esta é a chave! Garante profiling detalhado.\n')
             new_lines.insert(insert_idx+10, '}\n')
+            new_lines.insert(insert_idx+11, '\n')
+            
+            # Adiciona profiling (grava <tempo>/uniform/profiling a cada escrita)
+            new_lines.insert(insert_idx+12, 'profiling\n')
+            new_lines.insert(insert_idx+13, '{\n')
+            new_lines.insert(insert_idx+14, '    active      true;\n')
+            new_lines.insert(insert_idx+15, '    cpuInfo     false;\n')
+            new_lines.insert(insert_idx+16, '    memInfo     false;\n')
+            new_lines.insert(insert_idx+17, '}\n')
             
             with open(controlDict_path, "w") as f:
                 f.writelines(new_lines)
@@ -1559,11 +2455,258 @@ class OpenFOAMInterface(QWidget):
             self.outputArea.append("Profiling completo ativado no controlDict!")
             self.outputArea.append("- InfoSwitches { time 1; } adicionado")
             self.outputArea.append("- DebugSwitches { TimeRegistry 1; } adicionado")
+            self.outputArea.append("- profiling { active true; } adicionado")
             self.profilingLogs.append("Profiling detalhado ativado - TimeRegistry habilitado!")
             
         except Exception as e:
             self.outputArea.append(f"Erro ao ativar profiling: {e}")
     
+    def openProfilingAnalysis(self):
+        """Mostra a árvore de tempos do profiling (uniform/profiling) e o tempo por passo do log."""
+        if not self.baseDir or not os.path.isdir(self.baseDir):
+            self.outputArea.append("Erro: Nenhum diretório base selecionado.")
+            return
+
+        profilingPath = profiling.find_profiling_file(self.baseDir)
+        timings = profiling.load_log_timings(os.path.join(self.baseDir, "log.foamRun"))
+        if not profilingPath and not timings:
+            QMessageBox.warning(self, "Profiling", "Nenhum arquivo uniform/profiling ou linha ExecutionTime encontrado. "
+                                "Ative o profiling e rode a simulação até a próxima escrita.")
+            return
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Análise de Profiling")
+        dialog.resize(900, 600)
+        layout = QVBoxLayout(dialog)
+
+        if timings:
+            step_times = [step["step_clock"] for step in timings[1:]] or [timings[0]["step_clock"]]
+            summary = (f"Passos: {len(timings)}  |  ClockTime total: {timings[-1]['clock_time']:.1f} s  |  "
+                       f"Tempo médio por passo: {sum(step_times) / len(step_times):.3f} s  |  "
+                       f"Passo mais lento: {max(step_times):.3f} s")
+            layout.addWidget(QLabel(summary, dialog))
+
+        nodes = {}
+        if profilingPath:
+            roots, nodes = profiling.load_profiling(profilingPath)
+            layout.addWidget(QLabel(f"Arquivo: {profilingPath}", dialog))
+
+            tree = QTreeWidget(dialog)
+            tree.setColumnCount(6)
+            tree.setHeaderLabels(["Trecho", "Fase", "Chamadas", "Tempo total (s)", "Tempo próprio (s)", "% do total"])
+            total = sum(root.total_time for root in roots) or 1.0
+
+            def addNode(node, parentItem):
+                item = NumericTreeWidgetItem(parentItem, [
+                    node.description,
+                    profiling.classify_phase(node.description),
+                    str(node.calls),
+                    f"{node.total_time:.4f}",
+                    f"{node.self_time:.4f}",
+                    f"{100 * node.total_time / total:.1f}",
+                ])
+                for child in node.children:
+                    addNode(child, item)
+
+            for root in roots:
+                addNode(root, tree)
+            tree.setSortingEnabled(True)
+            tree.sortByColumn(3, Qt.DescendingOrder)
+            tree.expandToDepth(1)
+            tree.resizeColumnToContents(0)
+            layout.addWidget(tree, 3)
+
+            phaseTable = QTableWidget(dialog)
+            phaseTable.setColumnCount(3)
+            phaseTable.setHorizontalHeaderLabels(["Fase", "Tempo próprio (s)", "%"])
+            phases = profiling.phase_breakdown(nodes)
+            phaseTotal = sum(phases.values()) or 1.0
+            phaseTable.setRowCount(len(phases))
+            for row, (phase, seconds) in enumerate(phases.items()):
+                phaseTable.setItem(row, 0, QTableWidgetItem(phase))
+                phaseTable.setItem(row, 1, QTableWidgetItem(f"{seconds:.4f}"))
+                phaseTable.setItem(row, 2, QTableWidgetItem(f"{100 * seconds / phaseTotal:.1f}"))
+            layout.addWidget(phaseTable, 1)
+
+        buttonLayout = QHBoxLayout()
+        compareButton = QPushButton("Comparar com outro caso...", dialog)
+        compareButton.setEnabled(bool(nodes))
+        compareButton.clicked.connect(lambda: self.compareProfiling(nodes))
+        buttonLayout.addWidget(compareButton)
+        closeButton = QPushButton("Fechar", dialog)
+        closeButton.clicked.connect(dialog.accept)
+        buttonLayout.addWidget(closeButton)
+        layout.addLayout(buttonLayout)
+
+        dialog.setLayout(layout)
+        dialog.exec_()
+
+    def openTimeStepReport(self):
+        """Relatório do passo de tempo adaptativo: histograma de deltaT, limites e projeção de ganho."""
+        if not self.logParser.store.has_table("timestep"):
+            QMessageBox.warning(self, "Relatório Δt", "Nenhuma linha 'Courant Number'/'deltaT' foi lida do log ainda.")
+            return
+        controls = timestep_report.read_time_step_controls(self.baseDir)
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Relatório do Passo de Tempo")
+        dialog.resize(700, 550)
+        layout = QVBoxLayout(dialog)
+
+        reportLabel = QLabel(dialog)
+        reportLabel.setWordWrap(True)
+        layout.addWidget(reportLabel)
+
+        factorLayout = QHBoxLayout()
+        factorLayout.addWidget(QLabel("Fator de aumento de maxCo:", dialog))
+        factorInput = QDoubleSpinBox(dialog)
+        factorInput.setRange(1.0, 10.0)
+        factorInput.setSingleStep(0.1)
+        factorInput.setValue(1.5)
+        factorLayout.addWidget(factorInput)
+        factorLayout.addStretch()
+        layout.addLayout(factorLayout)
+
+        def updateReport():
+            report = timestep_report.time_step_report(self.logParser.store, controls, factorInput.value())
+            projection = report["projection"]
+            limits = report["limits"]
+            def fmt(value):
+                return f"{value:.3g}" if value is not None else "--"
+            text = (
+                f"adjustTimeStep: {'sim' if controls['adjustTimeStep'] else 'não'}  |  "
+                f"maxCo: {controls['maxCo']}  |  maxDeltaT: {controls['maxDeltaT']}\n"
+                f"Passos: {report['steps']}  |  deltaT mín/médio/máx: "
+                f"{fmt(report['deltaT_min'])} / {fmt(report['deltaT_mean'])} / {fmt(report['deltaT_max'])}\n"
+                f"Limitados por maxCo: {limits['maxCo']}  |  por maxDeltaT: {limits['maxDeltaT']}  |  "
+                f"outros: {limits['other']}\n"
+                f"Aumentando maxCo em {projection['factor']:.2f}x: {projection['projected_steps']:.0f} passos "
+                f"(speedup estimado {projection['speedup']:.2f}x)"
+            )
+            if report["cost_per_step"] is not None:
+                text += (f"\nCusto medido: {report['cost_per_step']:.3f} s/passo  |  tempo de parede "
+                         f"{projection['wall_time'] / 3600:.2f} h → {projection['projected_wall_time'] / 3600:.2f} h")
+            reportLabel.setText(text)
+
+        factorInput.valueChanged.connect(updateReport)
+        updateReport()
+
+        histogram = pg.PlotWidget()
+        histogram.setBackground('w')
+        histogram.setLabel('left', 'Passos')
+        histogram.setLabel('bottom', 'log10(deltaT)')
+        counts, edges = timestep_report.delta_t_histogram(self.logParser.timestepTable.column("deltaT"))
+        if len(counts):
+            logEdges = np.log10(edges)
+            histogram.addItem(pg.BarGraphItem(x0=logEdges[:-1], x1=logEdges[1:], height=counts, brush='b'))
+        layout.addWidget(histogram)
+
+        closeButton = QPushButton("Fechar", dialog)
+        closeButton.clicked.connect(dialog.accept)
+        layout.addWidget(closeButton)
+        dialog.setLayout(layout)
+        dialog.exec_()
+
+    def openCloudStatistics(self):
+        """Painel com as estatísticas da nuvem Lagrangiana extraídas dos blocos 'Cloud:' do log."""
+        table = self.logParser.cloudTable
+        if not len(table):
+            QMessageBox.warning(self, "Cloud Statistics", "Nenhum bloco 'Cloud:' foi lido do log ainda.")
+            return
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Estatísticas da Nuvem")
+        dialog.resize(1000, 700)
+        layout = QHBoxLayout(dialog)
+
+        plotsLayout = QGridLayout()
+        panels = [
+            ("Parcelas", [(cloud_stats.PARCELS, "no sistema", 'b'), (cloud_stats.PARCELS_ADDED, "injetadas", 'g')]),
+            ("Massa (kg)", [(cloud_stats.MASS_INJECTED, "injetada", 'g'), (cloud_stats.MASS_IN_SYSTEM, "no sistema", 'b'),
+                            (cloud_stats.MASS_ESCAPED, "escapou", 'r')]),
+            ("Energia cinética (J)", [(cloud_stats.LINEAR_KE, "linear", 'b'), (cloud_stats.ROTATIONAL_KE, "rotacional", 'm')]),
+        ]
+        for index, (title, series) in enumerate(panels):
+            plot = pg.PlotWidget(title=title)
+            plot.setBackground('w')
+            plot.addLegend()
+            plot.showGrid(x=True, y=True)
+            plot.setLabel('bottom', 'Time')
+            for quantity, name, color in series:
+                times, values = cloud_stats.cloud_series(table, quantity)
+                if len(times):
+                    plot.plot(times, values, name=name, pen=pg.mkPen(color=color, width=2))
+            plotsLayout.addWidget(plot, index // 2, index % 2)
+
+        costPlot = pg.PlotWidget(title="Custo por passo x parcelas")
+        costPlot.setBackground('w')
+        costPlot.showGrid(x=True, y=True)
+        costPlot.setLabel('bottom', 'Parcelas')
+        costPlot.setLabel('left', 's/passo')
+        parcels, costs = cloud_stats.cost_vs_parcels(self.logParser.store)
+        if len(parcels):
+            costPlot.plot(parcels, costs, pen=None, symbol='o', symbolSize=5, symbolBrush='b')
+        plotsLayout.addWidget(costPlot, 1, 1)
+        layout.addLayout(plotsLayout, 3)
+
+        latest = cloud_stats.latest_values(table)
+        valuesTable = QTableWidget(dialog)
+        valuesTable.setColumnCount(2)
+        valuesTable.setHorizontalHeaderLabels(["Quantidade", "Último valor"])
+        valuesTable.setRowCount(len(latest))
+        for row, (quantity, value) in enumerate(latest.items()):
+            valuesTable.setItem(row, 0, QTableWidgetItem(quantity))
+            valuesTable.setItem(row, 1, QTableWidgetItem(f"{value:.6g}"))
+        valuesTable.resizeColumnsToContents()
+        layout.addWidget(valuesTable, 1)
+
+        dialog.setLayout(layout)
+        dialog.exec_()
+
+    def compareProfiling(self, nodes):
+        """Compara o profiling do caso atual com o de outro caso e mostra as etapas que regrediram."""
+        otherCase = QFileDialog.getExistingDirectory(self, "Escolher caso para comparar", self.baseDir)
+        if not otherCase:
+            return
+        otherPath = profiling.find_profiling_file(otherCase)
+        if not otherPath:
+            QMessageBox.warning(self, "Profiling", f"Nenhum arquivo uniform/profiling encontrado em {otherCase}.")
+            return
+        _, otherNodes = profiling.load_profiling(otherPath)
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Comparação de Profiling")
+        dialog.resize(900, 500)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(f"A: {otherCase}\nB: {self.baseDir}  (delta > 0 = B mais lento)", dialog))
+
+        phaseRows = profiling.diff_phases(otherNodes, nodes)
+        rows = profiling.diff_profiles(otherNodes, nodes)
+        table = QTableWidget(dialog)
+        table.setColumnCount(5)
+        table.setHorizontalHeaderLabels(["Trecho / Fase", "A (s)", "B (s)", "Delta (s)", "B/A"])
+        table.setRowCount(len(phaseRows) + len(rows))
+        for row, entry in enumerate(phaseRows):
+            table.setItem(row, 0, QTableWidgetItem(f"[{entry['phase']}]"))
+            table.setItem(row, 1, QTableWidgetItem(f"{entry['time_a']:.4f}"))
+            table.setItem(row, 2, QTableWidgetItem(f"{entry['time_b']:.4f}"))
+            table.setItem(row, 3, QTableWidgetItem(f"{entry['delta']:+.4f}"))
+        for row, entry in enumerate(rows, start=len(phaseRows)):
+            table.setItem(row, 0, QTableWidgetItem(entry["path"]))
+            table.setItem(row, 1, QTableWidgetItem(f"{entry['time_a']:.4f}"))
+            table.setItem(row, 2, QTableWidgetItem(f"{entry['time_b']:.4f}"))
+            table.setItem(row, 3, QTableWidgetItem(f"{entry['delta']:+.4f}"))
+            ratio = entry["ratio"]
+            table.setItem(row, 4, QTableWidgetItem(f"{ratio:.2f}" if ratio is not None else "novo"))
+        table.resizeColumnToContents(0)
+        layout.addWidget(table)
+
+        closeButton = QPushButton("Fechar", dialog)
+        closeButton.clicked.connect(dialog.accept)
+        layout.addWidget(closeButton)
+        dialog.setLayout(layout)
+        dialog.exec_()
+
     def editFile(self):
         """Abre um arquivo para edição no editor."""
         fileName, _ = QFileDialog.getOpenFileName(
@@ -1573,30 +2716,10 @@ class OpenFOAMInterface(QWidget):
             "Todos os Arquivos (*);;Arquivos de Código (*.dict *.txt *.swp)"
         )
         if fileName:
-            file = QtCore.QFile(fileName)
-            if file.open(QtCore.QIODevice.ReadOnly | QtCore.QIODevice.Text):
-                self.currentFilePath = fileName
-                self.fileEditor.setPlainText(str(file.readAll(), 'utf-8'))
-                file.close()
-                self.outputArea.append(f"Arquivo de código aberto: {fileName}")
-            else:
-                self.outputArea.append("Erro ao abrir o arquivo para edição.")
+            self.openFileInEditor(fileName)
         else:
             self.outputArea.append("Nenhum arquivo selecionado.")
     
-    def saveFile(self):
-        if not self.currentFilePath:
-            self.outputArea.append("Nenhum arquivo carregado para salvar.")
-            return
-        
-        file = QtCore.QFile(self.currentFilePath)
-        if file.open(QtCore.QIODevice.WriteOnly | QtCore.QIODevice.Text):
-            file.write(self.fileEditor.toPlainText().encode('utf-8'))
-            file.close()
-            self.outputArea.append(f"Arquivo salvo com sucesso: {self.currentFilePath}")
-        else:
-            self.outputArea.append("Erro ao salvar o arquivo.")
-    
     def executeTerminalCommand(self):
         command = self.terminalInput.text()
         if command:
@@ -1617,11 +2740,7 @@ class OpenFOAMInterface(QWidget):
             
     
     def setupProcessEnvironment(self, process):
-        env = QProcessEnvironment.systemEnvironment()
-        foam_dir = f"/opt/{self.currentOpenFOAMVersion}"
-        env.insert("FOAM_RUN", foam_dir)
-        env.insert("LD_LIBRARY_PATH", f"{foam_dir}/lib:{foam_dir}/platforms/linux64GccDPInt32Opt/lib")
-        process.setProcessEnvironment(env)
+        process.setProcessEnvironment(openfoam_environment(self.currentOpenFOAMVersion))
     
     def connectProcessSignals(self, process):
         """Conecta os sinais do processo para capturar saída e atualizar resíduos."""
@@ -1749,6 +2868,15 @@ class OpenFOAMInterface(QWidget):
             dialog, dInput.text(), nInput.text(), mInput.text(), dyIn0Input.text(), dyWall0Input.text()
         ))
 
+        sweepButton = QPushButton("Varredura (grade)...", dialog)
+        sweepButton.setStyleSheet(calculateButton.styleSheet().replace("#2ecc71", "#3498db"))
+        sweepButton.clicked.connect(lambda: (dialog.accept(), self.openRateSweepDialog()))
+
+        gradingButton = QPushButton("Graduação da malha (blockMeshDict)...", dialog)
+        gradingButton.setStyleSheet(sweepButton.styleSheet())
+        gradingButton.clicked.connect(lambda: (dialog.accept(), self.openMeshGradingDialog(
+            [dInput.text(), nInput.text(), mInput.text(), dyIn0Input.text(), dyWall0Input.text()])))
+
         layout.addWidget(dLabel)
         layout.addWidget(dInput)
         layout.addWidget(nLabel)
@@ -1760,9 +2888,317 @@ class OpenFOAMInterface(QWidget):
         layout.addWidget(dyWall0Label)
         layout.addWidget(dyWall0Input)
         layout.addWidget(calculateButton)
+        layout.addWidget(sweepButton)
+        layout.addWidget(gradingButton)
 
         dialog.exec_()
 
+    def openRateSweepDialog(self):
+        """Varredura do cálculo de Δy sobre o produto cartesiano dos valores de cada parâmetro."""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Varredura de Δy")
+        dialog.resize(1100, 600)
+        layout = QVBoxLayout(dialog)
+
+        # Lista ('0.1, 0.2') ou faixa 'início:fim:quantidade'
+        defaults = {"d": "0.05:0.2:16", "n": "5:50:16", "m": "2:20:16", "dy_in_0": "0.0005:0.005:16",
+                    "dy_wall_0": "0.002:0.02:16"}
+        inputsLayout = QGridLayout()
+        inputs = {}
+        for column, name in enumerate(rate_calculator.INPUTS):
+            inputsLayout.addWidget(QLabel(name, dialog), 0, column)
+            inputs[name] = QLineEdit(defaults[name], dialog)
+            inputsLayout.addWidget(inputs[name], 1, column)
+        layout.addLayout(inputsLayout)
+        layout.addWidget(QLabel("Valores: lista separada por vírgulas ou faixa início:fim:quantidade", dialog))
+
+        buttonsLayout = QHBoxLayout()
+        validOnly = QCheckBox("Somente combinações válidas", dialog)
+        validOnly.setChecked(True)
+        calculateButton = QPushButton("Calcular", dialog)
+        exportButton = QPushButton("Exportar CSV", dialog)
+        exportButton.setEnabled(False)
+        buttonsLayout.addWidget(validOnly)
+        buttonsLayout.addStretch()
+        buttonsLayout.addWidget(calculateButton)
+        buttonsLayout.addWidget(exportButton)
+        layout.addLayout(buttonsLayout)
+
+        summaryLabel = QLabel(dialog)
+        layout.addWidget(summaryLabel)
+        table = QTableWidget(dialog)
+        table.setColumnCount(len(rate_calculator.RESULT_DTYPE.names))
+        table.setHorizontalHeaderLabels(rate_calculator.RESULT_DTYPE.names)
+        layout.addWidget(table, 1)
+        sweep = {"results": None}
+
+        def calculate():
+            try:
+                axes = [rate_calculator.parse_values(inputs[name].text()) for name in rate_calculator.INPUTS]
+            except ValueError:
+                summaryLabel.setText("Erro: valores inválidos (use '0.1, 0.2' ou 'início:fim:quantidade').")
+                return
+            if any(len(axis) == 0 for axis in axes):
+                summaryLabel.setText("Erro: todo parâmetro precisa de ao menos um valor.")
+                return
+            results = rate_calculator.calculate_increase_rate_grid(*axes)
+            sweep["results"] = results
+            shown = results[results["valid"]] if validOnly.isChecked() else results
+            # A tabela mostra só o início; o CSV tem todas as linhas
+            rows = shown[:RATE_SWEEP_TABLE_ROWS]
+            table.setRowCount(len(rows))
+            for row, values in enumerate(rows):
+                for column, name in enumerate(rows.dtype.names):
+                    value = values[name]
+                    text = str(int(value)) if rows.dtype[name].kind in "ib" else f"{value:.6g}"
+                    table.setItem(row, column, QTableWidgetItem(text))
+            table.resizeColumnsToContents()
+            summaryLabel.setText(f"{len(results)} combinações, {int(results['valid'].sum())} válidas "
+                                 f"(mostrando {len(rows)} de {len(shown)})")
+            exportButton.setEnabled(True)
+
+        def export():
+            fileName, _ = QFileDialog.getSaveFileName(dialog, "Exportar varredura", "", "CSV Files (*.csv)")
+            if fileName:
+                count = rate_calculator.write_csv(sweep["results"], fileName, only_valid=validOnly.isChecked())
+                self.outputArea.append(f"Varredura de Δy exportada: {count} linhas em {fileName}")
+
+        calculateButton.clicked.connect(calculate)
+        exportButton.clicked.connect(export)
+        validOnly.toggled.connect(lambda: sweep["results"] is not None and calculate())
+
+        dialog.setLayout(layout)
+        dialog.exec_()
+
+    def openMeshGradingDialog(self, rateInputs=None):
+        """Designer de graduação: camadas do Δy -> células e razões de expansão -> simpleGrading do blockMeshDict."""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Graduação da malha")
+        dialog.resize(1100, 750)
+        layout = QVBoxLayout(dialog)
+
+        # Parâmetros do calculador de Δy (os do diálogo anterior, ou os exemplos)
+        defaults = ["0.106", "30", "10", "0.00142", "0.008"]
+        rateInputs = [text or default for text, default in zip(rateInputs or defaults, defaults)]
+        inputsLayout = QGridLayout()
+        inputs = []
+        for column, (name, text) in enumerate(zip(rate_calculator.INPUTS, rateInputs)):
+            inputsLayout.addWidget(QLabel(name, dialog), 0, column)
+            inputs.append(QLineEdit(text, dialog))
+            inputsLayout.addWidget(inputs[-1], 1, column)
+        fromRatesButton = QPushButton("Gerar camadas", dialog)
+        inputsLayout.addWidget(fromRatesButton, 1, len(inputs))
+        layout.addLayout(inputsLayout)
+
+        # Camadas editáveis (nome, comprimento, primeira e última célula); o resto é calculado
+        columns = ["Camada", "Comprimento", "Δ inicial", "Δ final", "Células", "Razão (blockMesh)",
+                   "Δ inicial real", "Δ final real"]
+        layerTable = QTableWidget(0, len(columns), dialog)
+        layerTable.setHorizontalHeaderLabels(columns)
+        layout.addWidget(layerTable, 2)
+
+        rowButtons = QHBoxLayout()
+        addButton = QPushButton("Adicionar camada", dialog)
+        removeButton = QPushButton("Remover camada", dialog)
+        solveButton = QPushButton("Calcular", dialog)
+        rowButtons.addWidget(addButton)
+        rowButtons.addWidget(removeButton)
+        rowButtons.addStretch()
+        rowButtons.addWidget(solveButton)
+        layout.addLayout(rowButtons)
+
+        continuityLabel = QLabel(dialog)
+        continuityLabel.setWordWrap(True)
+        layout.addWidget(continuityLabel)
+
+        preview = pg.PlotWidget(title="Tamanho de célula ao longo da direção graduada")
+        preview.setBackground('w')
+        preview.showGrid(x=True, y=True)
+        preview.setLabel('bottom', 'Posição')
+        preview.setLabel('left', 'Δ')
+        layout.addWidget(preview, 2)
+
+        blockMeshPath = mesh_grading.block_mesh_path(self.baseDir) if self.baseDir else ""
+        writeLayout = QHBoxLayout()
+        directionCombo = QComboBox(dialog)
+        directionCombo.addItems(list(mesh_grading.DIRECTIONS))
+        directionCombo.setCurrentIndex(1)
+        blockSpin = QSpinBox(dialog)
+        stepsSpin = QSpinBox(dialog)
+        stepsSpin.setRange(0, 100000000)
+        history = self.simulationHistory.get_history()
+        # Passos da última execução com métricas, como referência para o custo total
+        stepsSpin.setValue(next(((entry.get("metrics") or {}).get("steps") or 0 for entry in reversed(history)
+                                 if (entry.get("metrics") or {}).get("steps")), 0))
+        writeButton = QPushButton("Gravar no blockMeshDict", dialog)
+        for widget in (QLabel("Direção:"), directionCombo, QLabel("Bloco:"), blockSpin,
+                       QLabel("Passos:"), stepsSpin):
+            writeLayout.addWidget(widget)
+        writeLayout.addStretch()
+        writeLayout.addWidget(writeButton)
+        layout.addLayout(writeLayout)
+        costLabel = QLabel(dialog)
+        costLabel.setWordWrap(True)
+        layout.addWidget(costLabel)
+
+        try:
+            blocks = mesh_grading.block_cells(blockMeshPath) if os.path.exists(blockMeshPath) else []
+        except ValueError as e:
+            self.outputArea.append(f"blockMeshDict não interpretado: {e}")
+            blocks = []
+        blockSpin.setRange(0, max(len(blocks) - 1, 0))
+        writeButton.setEnabled(bool(blocks))
+        state = {"solved": []}
+
+        def setLayers(layers):
+            layerTable.setRowCount(len(layers))
+            for row, item in enumerate(layers):
+                for column, key in enumerate(("name", "length", "first", "last")):
+                    value = item[key]
+                    layerTable.setItem(row, column, QTableWidgetItem(value if key == "name" else f"{value:.6g}"))
+            solve()
+
+        def readLayers():
+            layers = []
+            for row in range(layerTable.rowCount()):
+                texts = [layerTable.item(row, column).text() if layerTable.item(row, column) else ""
+                         for column in range(4)]
+                layers.append(mesh_grading.layer(texts[0] or f"layer{row}", *(float(t) for t in texts[1:])))
+            return layers
+
+        def totalCells(solved):
+            """Células da malha com a direção escolhida do bloco substituída pela graduação."""
+            count = sum(item["cells"] for item in solved if item["valid"])
+            if not blocks:
+                return count
+            axis = directionCombo.currentIndex()
+            total = 0
+            for index, cells in enumerate(blocks):
+                cells = list(cells)
+                if index == blockSpin.value():
+                    cells[axis] = count
+                total += cells[0] * cells[1] * cells[2]
+            return total
+
+        def updateCost():
+            if not state["solved"]:
+                return
+            cells = totalCells(state["solved"])
+            estimate = mesh_grading.estimate_cost(cells, history, cores=decomposition_planner.physical_cores(),
+                                                  steps=stepsSpin.value())
+            text = f"Malha: {cells:,} células".replace(",", ".")
+            if not blocks:
+                text += " (só a direção graduada: blockMeshDict do caso não encontrado)"
+            text += f" · memória ≈ {format_bytes(estimate['memory_bytes'])}"
+            if estimate["seconds_per_step"] is None:
+                text += " · sem execuções no histórico para estimar o tempo"
+            else:
+                reference = (f"execução de {estimate['reference_cells']:,} células".replace(",", ".")
+                             if estimate["reference_cells"] else "mediana do histórico")
+                text += f" · {estimate['seconds_per_step']:.3g} s/passo"
+                if estimate["total_seconds"]:
+                    text += f" · {estimate['total_seconds'] / 3600:.2f} h para {stepsSpin.value()} passos"
+                text += f" ({reference}, {decomposition_planner.physical_cores()} núcleos)"
+            costLabel.setText(text)
+
+        def solve():
+            try:
+                layers = readLayers()
+            except ValueError:
+                continuityLabel.setText("Erro: comprimentos e tamanhos de célula precisam ser números.")
+                return
+            solved = mesh_grading.solve_layers(layers)
+            state["solved"] = solved
+            for row, item in enumerate(solved):
+                values = ([str(item["cells"]), f"{item['expansion']:.6g}", f"{item['first_actual']:.6g}",
+                           f"{item['last_actual']:.6g}"] if item["valid"] else ["inválida", "", "", ""])
+                for column, text in enumerate(values, start=4):
+                    cell = QTableWidgetItem(text)
+                    cell.setFlags(cell.flags() & ~Qt.ItemIsEditable)
+                    layerTable.setItem(row, column, cell)
+            layerTable.resizeColumnsToContents()
+
+            messages = [f"{name} → {following}: {ratio:.3f}" + ("" if ok else " ⚠")
+                        for name, following, ratio, ok in mesh_grading.continuity(solved)]
+            invalid = [item["name"] for item in solved if not item["valid"]]
+            text = "Continuidade (Δ inicial da próxima / Δ final da anterior, limite "
+            text += f"{mesh_grading.MAX_SIZE_JUMP}): " + ("; ".join(messages) or "uma camada")
+            if invalid:
+                text += f" · camadas impossíveis (célula maior que a camada ou progressão sem solução): {', '.join(invalid)}"
+            continuityLabel.setText(text)
+
+            preview.clear()
+            centers, sizes = mesh_grading.cell_sizes(solved)
+            preview.plot(centers, sizes, pen=pg.mkPen(color='b', width=2), symbol='o', symbolSize=3)
+            updateCost()
+
+        def fromRates():
+            try:
+                values = [float(field.text()) for field in inputs]
+            except ValueError:
+                continuityLabel.setText("Erro: parâmetros do Δy precisam ser números.")
+                return
+            setLayers(mesh_grading.layers_from_rate_calculator(*values))
+
+        def addLayer():
+            layerTable.insertRow(layerTable.rowCount())
+
+        def removeLayer():
+            if layerTable.rowCount():
+                layerTable.removeRow(layerTable.currentRow() if layerTable.currentRow() >= 0 else layerTable.rowCount() - 1)
+                solve()
+
+        def write():
+            solved = state["solved"]
+            if not solved or not all(item["valid"] for item in solved):
+                QMessageBox.warning(dialog, "Graduação", "Corrija as camadas inválidas antes de gravar.")
+                return
+            if not all(ok for *_, ok in mesh_grading.continuity(solved)):
+                reply = QMessageBox.question(dialog, "Graduação",
+                                             "Há saltos de tamanho de célula acima do limite entre camadas. Gravar mesmo assim?",
+                                             QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+                if reply != QMessageBox.Yes:
+                    return
+            direction = directionCombo.currentText()
+            count = sum(item["cells"] for item in solved)
+            try:
+                neighbours = mesh_grading.mismatched_neighbours(blockMeshPath, direction, blockSpin.value(), count)
+            except (OSError, ValueError) as e:
+                QMessageBox.warning(dialog, "Graduação", f"Erro ao ler o blockMeshDict: {e}")
+                return
+            if neighbours:
+                listed = ", ".join(f"bloco {index} ({other}: {cells})" for index, other, cells in neighbours)
+                reply = QMessageBox.question(dialog, "Graduação",
+                                             f"Blocos vizinhos compartilham arestas na direção {direction} e precisam "
+                                             f"das mesmas {count} células para a malha ficar conforme: {listed}. "
+                                             "Só o bloco escolhido será alterado. Gravar mesmo assim?",
+                                             QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+                if reply != QMessageBox.Yes:
+                    return
+            try:
+                mesh_grading.write_block_grading(blockMeshPath, solved, direction, blockSpin.value())
+            except (OSError, ValueError) as e:
+                QMessageBox.warning(dialog, "Graduação", f"Erro ao gravar o blockMeshDict: {e}")
+                return
+            self.outputArea.append(f"Graduação gravada no blockMeshDict (bloco {blockSpin.value()}, direção {direction}): "
+                                   f"{count} células.")
+            dialog.accept()
+            # Revisão (e ajustes finos) no editor de dicionários
+            self.openFileInEditor(blockMeshPath)
+
+        fromRatesButton.clicked.connect(fromRates)
+        addButton.clicked.connect(addLayer)
+        removeButton.clicked.connect(removeLayer)
+        solveButton.clicked.connect(solve)
+        writeButton.clicked.connect(write)
+        directionCombo.currentIndexChanged.connect(updateCost)
+        blockSpin.valueChanged.connect(updateCost)
+        stepsSpin.valueChanged.connect(updateCost)
+        fromRates()
+
+        dialog.setLayout(layout)
+        dialog.exec_()
+
     def calculateRatesFromDialog(self, dialog, d, n, m, dy_in_0, dy_wall_0):
         try:
             
@@ -1813,12 +3249,128 @@ class OpenFOAMInterface(QWidget):
         layout.addWidget(tempInput)
         layout.addWidget(pressureLabel)
         layout.addWidget(pressureInput)
+        tableButton = QPushButton("Tabelas para o OpenFOAM...", dialog)
+        tableButton.clicked.connect(lambda: (dialog.accept(), self.openFluidTableDialog(
+            pressureInput.text(), salinityInput.text())))
+
         layout.addWidget(salinityLabel)
         layout.addWidget(salinityInput)
         layout.addWidget(calculateButton)
+        layout.addWidget(tableButton)
 
         dialog.exec_()
 
+    def openFluidTableDialog(self, pressure="", salinity=""):
+        """Tabelas das propriedades da salmoura em função de T, gravadas no constant/fluidPropertiesTables."""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Tabelas de Propriedades do Fluido")
+        dialog.resize(800, 600)
+        layout = QVBoxLayout(dialog)
+
+        inputsLayout = QGridLayout()
+        fields = {}
+        for row, (key, label, default) in enumerate([
+                ("tStart", "T inicial (°C):", "10"), ("tStop", "T final (°C):", "150"),
+                ("points", "Pontos:", "29"), ("pressure", "Pressão (MPa):", pressure or "9.64"),
+                ("salinity", "Salinidade (mg/L):", salinity or "323000")]):
+            inputsLayout.addWidget(QLabel(label, dialog), row // 3, (row % 3) * 2)
+            fields[key] = QLineEdit(default, dialog)
+            inputsLayout.addWidget(fields[key], row // 3, (row % 3) * 2 + 1)
+        layout.addLayout(inputsLayout)
+
+        optionsLayout = QHBoxLayout()
+        checks = {}
+        for name in fluid_properties.PROPERTIES:
+            checks[name] = QCheckBox(name, dialog)
+            checks[name].setChecked(name in ("rho", "nu"))
+            optionsLayout.addWidget(checks[name])
+        formatCombo = QComboBox(dialog)
+        formatCombo.addItem("table (no dicionário)", "table")
+        formatCombo.addItem("CSV (constant/<nome>Table.csv)", "csv")
+        optionsLayout.addWidget(QLabel("Formato:", dialog))
+        optionsLayout.addWidget(formatCombo)
+        replaceCheck = QCheckBox("Substituir no physicalProperties (com backup)", dialog)
+        optionsLayout.addWidget(replaceCheck)
+        optionsLayout.addStretch()
+        previewButton = QPushButton("Visualizar", dialog)
+        writeButton = QPushButton("Gravar", dialog)
+        writeButton.setEnabled(bool(self.baseDir) and os.path.isdir(self.baseDir))
+        optionsLayout.addWidget(previewButton)
+        optionsLayout.addWidget(writeButton)
+        layout.addLayout(optionsLayout)
+
+        plots = QHBoxLayout()
+        densityPlot = pg.PlotWidget(title="rho (kg/m³)")
+        viscosityPlot = pg.PlotWidget(title="nu (m²/s)")
+        for plot in (densityPlot, viscosityPlot):
+            plot.setBackground('w')
+            plot.showGrid(x=True, y=True)
+            plot.setLabel('bottom', 'T (K)')
+            plots.addWidget(plot)
+        layout.addLayout(plots, 1)
+        statusLabel = QLabel(dialog)
+        layout.addWidget(statusLabel)
+
+        def buildTable():
+            """(tabela, P em bar, X em fração mássica), com as mesmas conversões do cálculo pontual."""
+            try:
+                start, stop = float(fields["tStart"].text()), float(fields["tStop"].text())
+                points = int(fields["points"].text())
+                pressureBar = float(fields["pressure"].text()) * 10
+                fraction = float(fields["salinity"].text()) / 1e6
+            except ValueError:
+                statusLabel.setText("Erro: Certifique-se de que todos os valores são números válidos.")
+                return None
+            if points < 2 or stop <= start:
+                statusLabel.setText("Erro: use ao menos 2 pontos e T final maior que T inicial.")
+                return None
+            table = FluidProperties().table((start, stop, points), (pressureBar, pressureBar, 1),
+                                            (fraction, fraction, 1))
+            return table, pressureBar, fraction
+
+        def preview():
+            built = buildTable()
+            if built is None:
+                return
+            table, pressureBar, fraction = built
+            for plot, name in ((densityPlot, "rho"), (viscosityPlot, "nu")):
+                plot.clear()
+                plot.plot(*table.temperature_series(name, pressureBar, fraction),
+                          pen=pg.mkPen(color='b', width=2), symbol='o', symbolSize=4)
+            statusLabel.setText(f"{len(table.axes[0])} pontos de {table.axes[0][0] + fluid_properties.KELVIN:.2f} "
+                                f"a {table.axes[0][-1] + fluid_properties.KELVIN:.2f} K")
+
+        def write():
+            built = buildTable()
+            names = [name for name, check in checks.items() if check.isChecked()]
+            if built is None or not names:
+                statusLabel.setText(statusLabel.text() or "Selecione ao menos uma propriedade.")
+                return
+            table, pressureBar, fraction = built
+            try:
+                path = fluid_properties.write_physical_properties(self.baseDir, table, pressureBar, fraction,
+                                                                  names=names, fmt=formatCombo.currentData(),
+                                                                  replace=replaceCheck.isChecked())
+            except OSError as e:
+                statusLabel.setText(f"Erro ao gravar as tabelas: {e}")
+                return
+            self.outputArea.append(f"Propriedades {', '.join(names)} (em função de T) gravadas em {path}.")
+            if replaceCheck.isChecked():
+                self.outputArea.append("physicalProperties anterior (se existia) copiado para physicalProperties.<data>.bak; "
+                                       "ajuste o viscosityModel para usar as tabelas.")
+            else:
+                self.outputArea.append(f"physicalProperties inalterado; referencie as entradas <nome>Table "
+                                       f"de constant/{fluid_properties.TABLES_DICT} (#include) onde forem usadas.")
+            dialog.accept()
+            self.openFileInEditor(path)
+
+        previewButton.clicked.connect(preview)
+        writeButton.clicked.connect(write)
+        preview()
+
+        dialog.setLayout(layout)
+        dialog.exec_()
+
     def calculateFluidProperties(self, dialog, temp, pressure, salinity):
         try:
             temp = float(temp)
@@ -1844,6 +3396,7 @@ class OpenFOAMInterface(QWidget):
             self.outputArea.append(f"Erro ao calcular propriedades: {str(e)}")
 
     def openSimulationHistory(self):
+        self.simulationHistory.reload()
         dialog = QDialog(self)
         dialog.setWindowTitle("Histórico de Simulações")
         dialog.resize(800, 400)
@@ -1885,6 +3438,8 @@ class OpenFOAMInterface(QWidget):
         """)
         self.historyTable.setColumnCount(5)
         self.historyTable.setHorizontalHeaderLabels(["Solver", "Malha", "Início", "Fim", "Status"])
+        self.historyTable.setSelectionBehavior(QTableWidget.SelectRows)
+        self.historyTable.setSelectionMode(QTableWidget.ExtendedSelection)
         self.loadHistoryIntoTable()
         layout.addWidget(self.historyTable)
 
@@ -1924,6 +3479,11 @@ class OpenFOAMInterface(QWidget):
         viewLogsButton.clicked.connect(self.showSelectedSimulationLogs)
         buttonLayout.addWidget(viewLogsButton)
 
+        compareButton = QPushButton("Comparar Selecionados", dialog)
+        compareButton.setStyleSheet(button_style.replace("#e74c3c", "#27ae60").replace("#c0392b", "#2ecc71").replace("#a93226", "#1e8449"))
+        compareButton.clicked.connect(self.compareSelectedSimulations)
+        buttonLayout.addWidget(compareButton)
+
         layout.addLayout(buttonLayout)
         dialog.setLayout(layout)
         dialog.exec_()
@@ -1954,9 +3514,122 @@ class OpenFOAMInterface(QWidget):
         logDialog.setLayout(vbox)
         logDialog.exec_()
 
+    def compareSelectedSimulations(self):
+        rows = sorted({index.row() for index in self.historyTable.selectionModel().selectedRows()})
+        if not rows:
+            QMessageBox.warning(self, "Nenhuma Seleção", "Selecione uma ou mais simulações para comparar.")
+            return
+        self.openRunComparison(rows)
+
+    def openRunComparison(self, rows):
+        """Sobrepõe as séries gravadas das execuções selecionadas, com um resumo de cada uma."""
+        history = self.simulationHistory.get_history()
+        entries = [(row, history[row]) for row in rows if row < len(history)]
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Comparação de Execuções")
+        dialog.resize(1100, 700)
+        layout = QVBoxLayout(dialog)
+
+        fields = []
+        for _, entry in entries:
+            for field in (entry.get("summary") or {}).get("final_residuals", {}):
+                if field not in fields:
+                    fields.append(field)
+        seriesOptions = [(f"Resíduo inicial {field}", run_comparison.RESIDUAL_PREFIX + field) for field in fields]
+        seriesOptions += [("deltaT", "deltaT"), ("Parcelas", "parcels"), ("Tempo de CPU por passo (s)", "step_time")]
+
+        controlsLayout = QHBoxLayout()
+        seriesCombo = QComboBox(dialog)
+        for label, key in seriesOptions:
+            seriesCombo.addItem(label, key)
+        axisCombo = QComboBox(dialog)
+        axisCombo.addItems(["Tempo simulado", "Tempo de parede (s)"])
+        logCheckBox = QCheckBox("Escala log", dialog)
+        logCheckBox.setChecked(True)
+        controlsLayout.addWidget(QLabel("Série:"))
+        controlsLayout.addWidget(seriesCombo)
+        controlsLayout.addWidget(QLabel("Eixo x:"))
+        controlsLayout.addWidget(axisCombo)
+        controlsLayout.addWidget(logCheckBox)
+        controlsLayout.addStretch()
+        layout.addLayout(controlsLayout)
+
+        plot = pg.PlotWidget()
+        plot.setBackground('w')
+        plot.showGrid(x=True, y=True)
+        legend = plot.addLegend()
+        layout.addWidget(plot, 3)
+
+        def runLabel(row, entry):
+            return f"#{row + 1} {os.path.basename(entry.get('case_path') or '')} {entry.get('start_time', '')}"
+
+        def updatePlot():
+            plot.clear()
+            legend.clear()
+            series = seriesCombo.currentData()
+            if series is None:
+                return
+            wallClock = axisCombo.currentIndex() == 1
+            tables = run_comparison.tables_for(series)
+            plot.setLogMode(x=False, y=logCheckBox.isChecked())
+            plot.setLabel('bottom', axisCombo.currentText())
+            for colorIndex, (row, entry) in enumerate(entries):
+                path = self.simulationHistory.metrics_path(entry)
+                if not path:
+                    continue
+                store = run_comparison.load_run_store(path, tables)
+                times, values = run_comparison.run_series(store, series)
+                if not len(times):
+                    continue
+                x = run_comparison.to_wall_clock(store, times) if wallClock else times
+                if logCheckBox.isChecked():
+                    valid = values > 0
+                    x, values = x[valid], values[valid]
+                pen = pg.mkPen(color=pg.intColor(colorIndex, hues=max(len(entries), 2)), width=2)
+                plot.plot(x, values, pen=pen, name=runLabel(row, entry))
+
+        seriesCombo.currentIndexChanged.connect(updatePlot)
+        axisCombo.currentIndexChanged.connect(updatePlot)
+        logCheckBox.toggled.connect(updatePlot)
+        updatePlot()
+
+        summaryTable = QTableWidget(dialog)
+        headers = ["Execução", "Status", "Passos", "Tempo de parede", "Passos/h", "Tempo final"] + \
+                  [f"Resíduo final {field}" for field in fields]
+        summaryTable.setColumnCount(len(headers))
+        summaryTable.setHorizontalHeaderLabels(headers)
+        summaryTable.setRowCount(len(entries))
+
+        def formatNumber(value, spec=".4g"):
+            return "-" if value is None else format(value, spec)
+
+        for tableRow, (row, entry) in enumerate(entries):
+            summary = entry.get("summary") or {}
+            wall = summary.get("wall_time")
+            values = [
+                runLabel(row, entry),
+                entry.get("status", ""),
+                str(summary.get("steps", "-")),
+                "-" if wall is None else f"{wall / 3600:.2f} h" if wall >= 3600 else f"{wall:.0f} s",
+                formatNumber(summary.get("steps_per_hour"), ".0f"),
+                formatNumber(summary.get("end_time")),
+            ] + [formatNumber(summary.get("final_residuals", {}).get(field), ".3e") for field in fields]
+            if not summary:
+                values[2] = "sem métricas gravadas"
+            for column, text in enumerate(values):
+                summaryTable.setItem(tableRow, column, QTableWidgetItem(text))
+        summaryTable.resizeColumnsToContents()
+        layout.addWidget(summaryTable, 1)
+
+        dialog.setLayout(layout)
+        dialog.exec_()
+
     def loadHistoryIntoTable(self):
         """Carrega o histórico na tabela."""
         history = self.simulationHistory.get_history()
+        # Entradas exibidas: exclusões usam estas, não a lista relida depois (o daemon também grava)
+        self.historyEntries = list(history)
         self.historyTable.setRowCount(len(history))
         for row, entry in enumerate(history):
             self.historyTable.setItem(row, 0, QTableWidgetItem(entry["solver"]))
@@ -1972,9 +3645,8 @@ class OpenFOAMInterface(QWidget):
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No
         )
         if reply == QMessageBox.Yes:
-            self.simulationHistory.history = []
-            self.simulationHistory.save_history()
-            self.loadHistoryIntoTable()  
+            self.simulationHistory.clear(self.historyEntries)
+            self.loadHistoryIntoTable()
             QMessageBox.information(self, "Histórico Limpo", "Todo o histórico foi limpo com sucesso.")
 
     def deleteSelectedSimulation(self):
@@ -1989,55 +3661,96 @@ class OpenFOAMInterface(QWidget):
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No
         )
         if reply == QMessageBox.Yes:
-            del self.simulationHistory.history[selectedRow]
-            self.simulationHistory.save_history()
+            removed = self.simulationHistory.remove_entry(self.historyEntries[selectedRow])
             self.loadHistoryIntoTable()
+            if not removed:
+                QMessageBox.warning(self, "Simulação Excluída", "A simulação selecionada já não estava no histórico.")
+                return
             QMessageBox.information(self, "Simulação Excluída", "A simulação selecionada foi excluída com sucesso.")
 
-    def filterTreeView(self, text):
-        """Filtra os itens da árvore de diretórios com base no texto inserido."""
-        def filterItems(item, text):
-            match = text.lower() in item.text().lower()
-            for row in range(item.rowCount()):
-                child = item.child(row)
-                match = filterItems(child, text) or match
-            item.setHidden(match)
-            return match
-
-        for row in range(self.treeModel.rowCount()):
-            rootItem = self.treeModel.item(row)
-            filterItems(rootItem, text)
-
     def configureDecomposeParCores(self):
-        """Abre um diálogo para configurar o número de núcleos e atualiza o decomposeParDict."""
-        num_cores, ok = QInputDialog.getInt(
-            self,
-            "Configurar Núcleos",
-            "Digite o número de núcleos para decomposePar:",
-            min=1,
-            max=128,  
-            value=2 
+        """Planejador de decomposição: recomenda subdomínios e método e grava o decomposeParDict."""
+        if not self.baseDir or not os.path.isdir(os.path.join(self.baseDir, "system")):
+            self.outputArea.append("Erro: Nenhum caso selecionado ou diretório system ausente.")
+            return
+        plan = decomposition_planner.plan(self.baseDir)
+        # O estudo de escalabilidade do caso, se existir, tem precedência sobre o histórico
+        try:
+            scaling = scaling_study.measured_throughput(scaling_study.load_results(self.baseDir))
+        except (ValueError, KeyError, TypeError):
+            scaling = []
+        measured, suggestion, historyMessage = decomposition_planner.check_against_history(
+            self.simulationHistory.get_history(), plan["cells"], plan["subdomains"], measured=scaling
         )
-        if ok:
-            self.num_cores = num_cores  
-            decompose_par_dict_path = os.path.join(self.baseDir, "system", "decomposeParDict")
-            try:
-                with open(decompose_par_dict_path, "r") as file:
-                    lines = file.readlines()
+        if scaling:
+            historyMessage = f"Estudo de escalabilidade (scaling.json): {historyMessage}"
 
-                with open(decompose_par_dict_path, "w") as file:
-                    for line in lines:
-                        if "numberOfSubdomains" in line:
-                            file.write(f"numberOfSubdomains {num_cores};\n")
-                        else:
-                            file.write(line)
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Planejar Decomposição")
+        dialog.resize(520, 420)
+        layout = QVBoxLayout(dialog)
 
-                self.outputArea.append(f"Arquivo decomposeParDict atualizado com {num_cores} núcleos.")
+        cellsText = f"{plan['cells']:,}".replace(",", ".") if plan["cells"] else "desconhecido"
+        perCore = f"{plan['cells_per_core']:.0f}" if plan["cells_per_core"] else "-"
+        layout.addWidget(QLabel(
+            f"Células: {cellsText}    Núcleos físicos: {plan['cores']}\n"
+            f"Recomendado: {plan['subdomains']} subdomínios ({perCore} células/núcleo), método {plan['method']}\n"
+            + "\n".join(plan["notes"])
+        ))
+
+        formLayout = QGridLayout()
+        subdomainsSpinBox = QSpinBox(dialog)
+        subdomainsSpinBox.setRange(1, max(plan["cores"], (plan["cells"] or 0) // 1000, 1))
+        subdomainsSpinBox.setValue(plan["subdomains"])
+        methodCombo = QComboBox(dialog)
+        methodCombo.addItems(["scotch", "simple", "hierarchical"])
+        methodCombo.setCurrentText(plan["method"])
+        formLayout.addWidget(QLabel("numberOfSubdomains:"), 0, 0)
+        formLayout.addWidget(subdomainsSpinBox, 0, 1)
+        formLayout.addWidget(QLabel("method:"), 1, 0)
+        formLayout.addWidget(methodCombo, 1, 1)
+        layout.addLayout(formLayout)
+
+        if measured:
+            historyTable = QTableWidget(dialog)
+            historyTable.setColumnCount(3)
+            historyTable.setHorizontalHeaderLabels(["Subdomínios", "Células·passos/s", "Eficiência"])
+            historyTable.setRowCount(len(measured))
+            for row, (n, throughput, efficiency) in enumerate(measured):
+                historyTable.setItem(row, 0, QTableWidgetItem(str(n)))
+                historyTable.setItem(row, 1, QTableWidgetItem(f"{throughput:.3g}"))
+                historyTable.setItem(row, 2, QTableWidgetItem(f"{efficiency:.0%}"))
+            historyTable.resizeColumnsToContents()
+            layout.addWidget(historyTable)
+        historyLabel = QLabel(historyMessage)
+        historyLabel.setWordWrap(True)
+        layout.addWidget(historyLabel)
+        if suggestion:
+            useHistoryButton = QPushButton(f"Usar {suggestion} subdomínios (histórico)", dialog)
+            useHistoryButton.clicked.connect(lambda: subdomainsSpinBox.setValue(suggestion))
+            layout.addWidget(useHistoryButton)
+
+        applyButton = QPushButton("Gravar decomposeParDict", dialog)
+        applyButton.clicked.connect(dialog.accept)
+        layout.addWidget(applyButton)
 
-            except FileNotFoundError:
-                self.outputArea.append("Erro: Arquivo decomposeParDict não encontrado.")
-            except Exception as e:
-                self.outputArea.append(f"Erro ao atualizar decomposeParDict: {str(e)}")
+        if not dialog.exec_():
+            return
+        subdomains = subdomainsSpinBox.value()
+        method = methodCombo.currentText()
+        coeffs = None
+        if method == "hierarchical":
+            extents = decomposition_planner.block_mesh_extents(self.baseDir)
+            split = decomposition_planner.hierarchical_split(subdomains, extents if extents is not None else (1, 1, 1))
+            coeffs = {"n": f"({split[0]} {split[1]} {split[2]})", "order": "xyz"}
+        elif method == "simple":
+            coeffs = {"n": f"({subdomains} 1 1)", "delta": 0.001}
+        try:
+            path = decomposition_planner.write_decompose_dict(self.baseDir, subdomains, method, coeffs)
+        except OSError as e:
+            self.outputArea.append(f"Erro ao atualizar decomposeParDict: {e}")
+            return
+        self.outputArea.append(f"{path} atualizado: {subdomains} subdomínios, método {method}.")
 
     def load_config(self):
         """Carrega as configurações do arquivo config.json."""
@@ -2066,7 +3779,7 @@ class OpenFOAMInterface(QWidget):
             self.save_config()
             self.outputArea.append(f"Diretório base configurado para: {self.baseDir}")
             
-            # self.populateTreeView(self.baseDir)
+            self.refreshCaseTree()
         else:
             self.outputArea.append("Nenhum diretório base selecionado.")
 
@@ -2106,11 +3819,20 @@ class OpenFOAMInterface(QWidget):
         self.logProcess = None
 
     def closeEvent(self, event):
-        """Intercepta o evento de fechamento da janela para encerrar processos em execução."""
-        if self.currentProcess and self.currentProcess.state() == QProcess.Running:
-            self.currentProcess.terminate()
-            if not self.currentProcess.waitForFinished(3000):  
-                self.currentProcess.kill() 
+        """Intercepta o evento de fechamento da janela para encerrar processos em execução.
+
+        Execuções do daemon não são afetadas: só a conexão é encerrada. Uma simulação
+        iniciada pela própria interface é encerrada junto com ela, após confirmação.
+        """
+        if self.simulation.running():
+            reply = QMessageBox.question(self, "Simulação em execução",
+                                         "A simulação iniciada por esta janela será encerrada. Fechar mesmo assim?\n"
+                                         "(Use 'Daemon > Run via Daemon' para execuções que continuam após fechar.)",
+                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                event.ignore()
+                return
+            self.simulation.shutdown()
             self.outputArea.append("Simulação interrompida ao fechar o programa.")
         
         if self.logProcess and self.logProcess.state() == QProcess.Running:
@@ -2119,6 +3841,18 @@ class OpenFOAMInterface(QWidget):
                 self.logProcess.kill()
             self.outputArea.append("Processo de logs interrompido ao fechar o programa.")
         
+        self.stopRetentionPolicy()
+        self.detachFromDaemon()
+        if self.pendingDaemonTimer is not None:
+            self.pendingDaemonTimer.stop()
+        if self.reconstructionManager is not None and self.reconstructionManager.busy():
+            self.reconstructionManager.cancel()
+            self.outputArea.append("Reconstrução cancelada ao fechar o programa.")
+        if self.scalingStudy is not None and self.scalingStudy.busy():
+            self.scalingStudy.cancel()
+        self.deletionService.shutdown()
+        self.diskUsageExecutor.shutdown(wait=False, cancel_futures=True)
+        self.fieldReductionExecutor.shutdown(wait=False, cancel_futures=True)
         event.accept()  
 
     def showSimulationInfo(self):
@@ -2150,106 +3884,36 @@ class OpenFOAMInterface(QWidget):
         dialog.setLayout(layout)
         dialog.exec_()
         
-class FluidProperties:
-    def __init__(self):
-        self.c0, self.c1, self.c2, self.c3 = (999.842594, 0.06793952, -0.00909529, 0.0001001685) # Example values
-        self.A, self.B = (0.0004831439, 0.000001617e-05) # Example values
-        self.mu_c_800 = 2.0  
-        self.mu_w_base = 0.00089  
-
-    def water_density(self, T, P):
-        """Calcula a densidade da água pura (rho_w) em função da temperatura (T) e pressão (P)."""
-        rho_0 = self.c0 + self.c1 * T + self.c2 * T**2 + self.c3 * T**3
-        rho_w = rho_0 + self.A * P + self.B * P**2
-        return rho_w
-
-    def brine_density(self, T, P, X):
-        """Calcula a densidade da salmoura (rho_b) em função de T, P e salinidade (X)."""
-        rho_w_TP = self.water_density(T, P)
-        rho_b = rho_w_TP + X * (1695 - rho_w_TP)
-        return rho_b
-
-    def brine_viscosity(self, T, P, X):
-        """Calcula a viscosidade da salmoura (mu_b) em função de T, P e salinidade (X)."""
-        if T < 800:
-            term1 = self.mu_w_base * (1 + 3 * X) * ((800 - T) / 800) ** 9
-            term2 = ((T / 800) ** 9) * (self.mu_w_base * (1 - X) + X * self.mu_c_800)
-            mu_b = (term1 + term2) / (((800 - T) / 800) ** 9 + (T / 800) ** 9)
-        else:
-            mu_b = self.mu_w_base * (1 - X) + self.mu_c_800 * X
-        return mu_b
-
-class FileEditorWindow(QDialog):
-    def __init__(self, baseDir, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("File Editor")
-        self.resize(800, 600)
-        self.setModal(True)  
-
-        self.baseDir = baseDir
-        self.currentFilePath = ""
-
-        layout = QVBoxLayout(self)
-
-        # self.searchBar = QLineEdit(self)
-        # self.searchBar.setPlaceholderText("Search files...")
-        # layout.addWidget(self.searchBar)
-
-        # self.treeView = QTreeView(self)
-        # self.treeModel = QStandardItemModel(self)
-        # self.treeView.setModel(self.treeModel)
-        # self.treeView.setHeaderHidden(True)
-        # self.treeView.doubleClicked.connect(self.onTreeViewDoubleClicked)
-        # layout.addWidget(self.treeView)
-
-        self.fileEditor = QTextEdit(self)
-        layout.addWidget(self.fileEditor)
-
-        buttonLayout = QHBoxLayout()
-        self.saveButton = QPushButton("Save File", self)
-        self.saveButton.clicked.connect(self.saveFile)
-        buttonLayout.addWidget(self.saveButton)
-
-        self.closeButton = QPushButton("Close", self)
-        self.closeButton.clicked.connect(self.close)
-        buttonLayout.addWidget(self.closeButton)
-
-        layout.addLayout(buttonLayout)
-
-        # self.populateTreeView(self.baseDir)
-
-    def populateTreeView(self, casePath):
-        pass
-    def addDirectoryToTree(self, path, parent):
-        pass
-    def filterTreeView(self, text):
-        pass
-    def onTreeViewDoubleClicked(self, index):
-        pass
-
-    def saveFile(self):
-        if not self.currentFilePath:
-            QMessageBox.warning(self, "Error", "No file loaded to save.")
-            return
-
-        file = QtCore.QFile(self.currentFilePath)
-        if file.open(QtCore.QIODevice.WriteOnly | QtCore.QIODevice.Text):
-            file.write(self.fileEditor.toPlainText().encode('utf-8'))
-            file.close()
-            QMessageBox.information(self, "Success", f"File saved: {self.currentFilePath}")
-        else:
-            QMessageBox.warning(self, "Error", "Failed to save the file.")
+class NumericTreeWidgetItem(QTreeWidgetItem):
+    """Item de árvore que ordena colunas numéricas pelo valor, e não pelo texto."""
+    def __lt__(self, other):
+        column = self.treeWidget().sortColumn() if self.treeWidget() else 0
+        try:
+            return float(self.text(column)) < float(other.text(column))
+        except ValueError:
+            return self.text(column) < other.text(column)
+
+def launch(argv=None):
+    """Abre a interface gráfica (também usado pelo 'gafoam' sem subcomando).
+
+    Com --profile-startup, mede a abertura, imprime os tempos e encerra;
+    com --no-tree, abre sem o painel da árvore de arquivos do caso.
+    """
+    argv = sys.argv if argv is None else argv
+    profile = startup.profile
+    profile.enable_if_requested(argv)
+    with profile.phase("QApplication"):
+        app = QApplication(argv)
+        app.setStyle("Fusion")
+    
+    with profile.phase("OpenFOAMInterface()"):
+        interface = OpenFOAMInterface(showTree=NO_TREE_FLAG not in argv)
+    with profile.phase("show()"):
+        interface.show()
+    
+    return app.exec_()
 
-def openFileEditor(self):
-    """Abre a janela separada para o editor de arquivos."""
-    self.fileEditorWindow = FileEditorWindow(self.baseDir, self)
-    self.fileEditorWindow.show()
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    app.setStyle("Fusion")
-    
-    interface = OpenFOAMInterface()
-    interface.show()
-    
-    sys.exit(app.exec_())
+    multiprocessing.freeze_support()
+    sys.exit(launch())
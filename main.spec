@@ -6,7 +6,12 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # Carregados sob demanda em main.py (startup.LazyModule): invisíveis para a análise
+    hiddenimports=['pyqtgraph', 'psutil', 'monitor_daemon', 'monitoring_api', 'timestep_report',
+                   'field_reduction', 'reconstruct_manager', 'decomposition_planner', 'scaling_study',
+                   'run_comparison', 'residual_plot', 'mesh_grading',
+                   # Importado só pela extensão C do numpy (>= 2.3), que a análise não enxerga
+                   'numpy._core._exceptions'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,95 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Perfil onedir: nada é descompactado a cada abertura (main.spec, onefile, extrai tudo num
+# diretório temporário). Bytecode pré-compilado com optimize=2 e módulos não usados excluídos.
+#
+#     pyinstaller main_onedir.spec      ->  dist/main_onedir/main
+
+# Carregados sob demanda em main.py (startup.LazyModule): invisíveis para a análise
+hidden_imports = ['pyqtgraph', 'psutil', 'monitor_daemon', 'monitoring_api', 'timestep_report',
+                  'field_reduction', 'reconstruct_manager', 'decomposition_planner', 'scaling_study',
+                  'run_comparison', 'residual_plot', 'mesh_grading',
+                  # Importado só pela extensão C do numpy (>= 2.3), que a análise não enxerga
+                  'numpy._core._exceptions']
+
+# Só QtCore, QtGui, QtWidgets, QtSvg, QtTest e uic são usados (os três últimos pelo pyqtgraph)
+qt_excludes = ['PyQt5.' + name for name in (
+    'QtWebEngine', 'QtWebEngineCore', 'QtWebEngineWidgets', 'QtWebChannel', 'QtWebSockets',
+    'QtMultimedia', 'QtMultimediaWidgets', 'QtQml', 'QtQuick', 'QtQuickWidgets', 'QtQuick3D',
+    'Qt3DCore', 'Qt3DRender', 'Qt3DInput', 'Qt3DLogic', 'Qt3DAnimation', 'Qt3DExtras',
+    'QtBluetooth', 'QtNfc', 'QtPositioning', 'QtLocation', 'QtSensors', 'QtSerialPort',
+    'QtSql', 'QtXmlPatterns', 'QtDesigner', 'QtHelp', 'QtOpenGL', 'QtNetwork', 'QtDBus',
+    'QtRemoteObjects', 'QtTextToSpeech', 'QtPrintSupport',
+)]
+
+# numpy.fft, numpy.random e numpy.linalg ficam (pyqtgraph); os demais só são carregados sob demanda
+numpy_excludes = ['numpy.f2py', 'numpy.distutils', 'numpy.testing', 'numpy.ma', 'numpy.polynomial',
+                  'numpy.matlib']
+
+other_excludes = ['tkinter', 'unittest', 'pytest', 'IPython', 'matplotlib', 'scipy', 'PIL', 'yaml',
+                  'pyqtgraph.opengl', 'pyqtgraph.examples', 'pyqtgraph.jupyter', 'pyqtgraph.flowchart',
+                  'pyqtgraph.canvas']
+
+# Plugins do Qt que a interface não usa e as bibliotecas que só eles trazem (o webgl puxa QtQuick/QtQml).
+# Ficam xcb, wayland e offscreen, os temas e os formatos de imagem comuns.
+unused_qt_plugins = (
+    'plugins/platforms/libqwebgl', 'plugins/platforms/libqeglfs', 'plugins/platforms/libqlinuxfb',
+    'plugins/platforms/libqvnc', 'plugins/platforms/libqminimalegl', 'plugins/generic/',
+    'plugins/egldeviceintegrations/', 'plugins/imageformats/libqicns', 'plugins/imageformats/libqtga',
+    'plugins/imageformats/libqtiff', 'plugins/imageformats/libqwbmp', 'plugins/imageformats/libqwebp',
+)
+# Pelo nome do arquivo: também remove os links simbólicos que o onedir cria na raiz de _internal
+unused_qt_libraries = ('libQt5Quick', 'libQt5Qml', 'libQt5WebSockets', 'libQt5EglFSDeviceIntegration',
+                       'libQt5EglFsKmsSupport')
+
+
+def keep(entry):
+    path = entry[0].replace('\\', '/')
+    return (not any(pattern in path for pattern in unused_qt_plugins)
+            and not path.rsplit('/', 1)[-1].startswith(unused_qt_libraries))
+
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=hidden_imports,
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=qt_excludes + numpy_excludes + other_excludes,
+    noarchive=False,
+    optimize=2,
+)
+a.binaries = [entry for entry in a.binaries if keep(entry)]
+a.datas = [entry for entry in a.datas if keep(entry)]
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='main',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    # Sem UPX: as bibliotecas seriam descomprimidas em memória a cada abertura
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='main_onedir',
+)
@@ -0,0 +1,311 @@
+import os
+import re
+import statistics
+
+import numpy as np
+
+import foam_dict
+import rate_calculator
+from decomposition_planner import wall_seconds
+
+DIRECTIONS = "xyz"
+# Maior razão aceita entre os tamanhos de célula de um lado e do outro de uma interface entre camadas
+MAX_SIZE_JUMP = 1.2
+# Diferença relativa aceita entre o comprimento total das camadas e a aresta do bloco
+LENGTH_TOLERANCE = 1e-3
+# Memória por célula (ordem de grandeza para solvers incompressíveis com nuvem Lagrangiana)
+BYTES_PER_CELL = 1500
+
+
+def layer(name, length, first, last):
+    return {"name": name, "length": float(length), "first": float(first), "last": float(last)}
+
+
+def layers_from_rate_calculator(d, n, m, dy_in_0, dy_wall_0):
+    """Camadas do jato na ordem da malha, com as mesmas hipóteses de calculate_increase_rate.
+
+    Bocal (10 d, de dy_in_0 a dy_wall_0), parede (m d, uniforme) e transição (m d, de dy_wall_0 a n d / 50).
+    """
+    delta = m * d
+    return [
+        layer("nozzle", 10 * d, dy_in_0, dy_wall_0),
+        layer("wall", delta, dy_wall_0, dy_wall_0),
+        layer("transition", delta, dy_wall_0, n * d / 50),
+    ]
+
+
+def solve_layers(layers):
+    """Número de células e razão de expansão (última/primeira célula, como no blockMesh) de cada camada.
+
+    O número de células vem da progressão geométrica de compute_r_N, truncado como em
+    calculate_increase_rate (int()), para que as contagens coincidam com as do Δy; com ele fixo,
+    a razão de expansão mantém last/first e os tamanhos reais (first_actual, last_actual) são
+    recalculados para fechar o comprimento da camada. Camadas impossíveis ficam com valid=False.
+    """
+    lengths = np.array([item["length"] for item in layers], dtype=float)
+    first = np.array([item["first"] for item in layers], dtype=float)
+    last = np.array([item["last"] for item in layers], dtype=float)
+    uniform = np.isclose(first, last)
+    _, N, graded = rate_calculator.compute_r_N_array(first, last, lengths)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cells = np.where(uniform, lengths / first, N)
+    # Nenhuma célula pode ser maior que a própria camada
+    valid = ((lengths > 0) & (first > 0) & (last > 0) & (first <= lengths) & (last <= lengths)
+             & np.isfinite(cells) & (uniform | graded))
+    cells = np.where(valid, np.maximum(np.trunc(np.where(valid, cells, 1)), 1), 0).astype(np.int64)
+    expansion = np.where(uniform, 1.0, last / first)
+
+    solved = []
+    for index, item in enumerate(layers):
+        count, ratio = int(cells[index]), float(expansion[index])
+        if not valid[index]:
+            solved.append(dict(item, cells=0, expansion=ratio, growth=np.nan, first_actual=np.nan,
+                               last_actual=np.nan, valid=False))
+            continue
+        growth = ratio ** (1 / (count - 1)) if count > 1 else 1.0
+        if np.isclose(growth, 1.0):
+            first_actual = item["length"] / count
+        else:
+            first_actual = item["length"] * (growth - 1) / (growth ** count - 1)
+        solved.append(dict(item, cells=count, expansion=ratio, growth=growth, first_actual=first_actual,
+                           last_actual=first_actual * growth ** (count - 1), valid=True))
+    return solved
+
+
+def continuity(solved, max_jump=MAX_SIZE_JUMP):
+    """Saltos de tamanho de célula entre camadas vizinhas: [(camada, próxima, razão, ok)]."""
+    jumps = []
+    for current, following in zip(solved, solved[1:]):
+        if not (current["valid"] and following["valid"]):
+            jumps.append((current["name"], following["name"], np.nan, False))
+            continue
+        ratio = following["first_actual"] / current["last_actual"]
+        jump = max(ratio, 1 / ratio)
+        jumps.append((current["name"], following["name"], ratio, jump <= max_jump))
+    return jumps
+
+
+def cell_sizes(solved):
+    """(posição do centro, tamanho) de cada célula ao longo da direção graduada, para o gráfico."""
+    centers, sizes = [], []
+    start = 0.0
+    for item in solved:
+        if not item["valid"]:
+            start += item["length"]
+            continue
+        widths = item["first_actual"] * item["growth"] ** np.arange(item["cells"])
+        edges = start + np.concatenate(([0.0], np.cumsum(widths)))
+        centers.append((edges[:-1] + edges[1:]) / 2)
+        sizes.append(widths)
+        start += item["length"]
+    if not centers:
+        return np.empty(0), np.empty(0)
+    return np.concatenate(centers), np.concatenate(sizes)
+
+
+def grading_entry(solved):
+    """Graduação de uma direção no simpleGrading: número, ou multi-graduação ((comprimento células razão) ...)."""
+    valid = [item for item in solved if item["valid"]]
+    if len(valid) == 1:
+        return f"{valid[0]['expansion']:.6g}"
+    total_length = sum(item["length"] for item in valid)
+    total_cells = sum(item["cells"] for item in valid)
+    sections = " ".join(f"({item['length'] / total_length:.6g} {item['cells'] / total_cells:.6g} "
+                        f"{item['expansion']:.6g})" for item in valid)
+    return f"({sections})"
+
+
+# === blockMeshDict ===
+
+# Arestas de um bloco hex ao longo de cada direção local (numeração de vértices do blockMesh)
+HEX_EDGES = {
+    "x": ((0, 1), (3, 2), (7, 6), (4, 5)),
+    "y": ((0, 3), (1, 2), (5, 6), (4, 7)),
+    "z": ((0, 4), (1, 5), (2, 6), (3, 7)),
+}
+NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+_HEX_RE = re.compile(r'hex\s*\(([^()]*)\)\s*(?:\w+\s*)?\(\s*(\d+)\s+(\d+)\s+(\d+)\s*\)\s*simpleGrading\s*\(')
+
+
+def _balanced_end(text, start):
+    """Índice logo após o ')' que fecha o '(' em text[start]."""
+    depth = 0
+    for index in range(start, len(text)):
+        if text[index] == "(":
+            depth += 1
+        elif text[index] == ")":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+    raise ValueError("parênteses desbalanceados no blockMeshDict")
+
+
+def _split_items(body):
+    """Itens de primeiro nível de uma lista OpenFOAM: números ou grupos entre parênteses."""
+    items, index = [], 0
+    while index < len(body):
+        if body[index].isspace():
+            index += 1
+        elif body[index] == "(":
+            end = _balanced_end(body, index)
+            items.append(body[index:end])
+            index = end
+        else:
+            end = index
+            while end < len(body) and not body[end].isspace() and body[end] != "(":
+                end += 1
+            items.append(body[index:end])
+            index = end
+    return items
+
+
+def _blocks(text):
+    """[(início, vértices, células (nx, ny, nz), início e fim do simpleGrading (...))] de cada bloco hex."""
+    section = re.search(r'^blocks\s*\(', text, re.M)
+    if not section:
+        raise ValueError("blockMeshDict sem a lista 'blocks'")
+    end = _balanced_end(text, section.end() - 1)
+    blocks = []
+    for match in _HEX_RE.finditer(text, section.end(), end):
+        grading_start = match.end() - 1
+        grading_end = _balanced_end(text, grading_start)
+        vertices = tuple(int(n) for n in match.group(1).split())
+        cells = tuple(int(match.group(i)) for i in (2, 3, 4))
+        blocks.append((match.start(), vertices, cells, grading_start, grading_end))
+    return blocks
+
+
+def block_cells(path):
+    """Número de células de cada bloco hex do blockMeshDict."""
+    with open(path, "r") as f:
+        return [cells for _, _, cells, _, _ in _blocks(f.read())]
+
+
+def _points(text):
+    """Vértices do blockMeshDict em metros (com convertToMeters/scale), ou None se não forem números."""
+    entries = foam_dict.parse(text)
+    vertices = entries.get("vertices")
+    if not isinstance(vertices, str) or "$" in vertices or "#" in vertices:
+        return None
+    numbers = [float(n) for n in NUMBER_RE.findall(vertices)]
+    if not numbers or len(numbers) % 3:
+        return None
+    return np.array(numbers).reshape(-1, 3) * float(entries.get("convertToMeters", entries.get("scale", 1)) or 1)
+
+
+def _block_extent(points, vertices, direction):
+    """Comprimento médio das quatro arestas do bloco ao longo da direção (arestas retas), ou None."""
+    if points is None or len(vertices) != 8 or max(vertices) >= len(points):
+        return None
+    lengths = [np.linalg.norm(points[vertices[b]] - points[vertices[a]]) for a, b in HEX_EDGES[direction]]
+    return float(np.mean(lengths))
+
+
+def block_extent(path, direction, block=0):
+    """Comprimento do bloco ao longo da direção ('x', 'y' ou 'z'), em metros; None se os vértices não puderem ser lidos."""
+    with open(path, "r") as f:
+        text = f.read()
+    blocks = _blocks(text)
+    if not 0 <= block < len(blocks):
+        return None
+    return _block_extent(_points(text), blocks[block][1], direction)
+
+
+def mismatched_neighbours(path, direction, block, cells):
+    """Blocos que compartilham uma aresta da direção graduada e ficariam com outro número de células nela.
+
+    Retorna [(bloco, direção do bloco vizinho, células atuais)]. Só considera vértices comuns
+    (mesmo índice na lista 'vertices'); faces ligadas por mergePatchPairs não são detectadas.
+    """
+    with open(path, "r") as f:
+        blocks = _blocks(f.read())
+    edges = {frozenset((blocks[block][1][a], blocks[block][1][b])) for a, b in HEX_EDGES[direction]}
+    found = []
+    for index, (_, vertices, counts, _, _) in enumerate(blocks):
+        if index == block or len(vertices) != 8:
+            continue
+        for axis, other in enumerate(DIRECTIONS):
+            shared = any(frozenset((vertices[a], vertices[b])) in edges for a, b in HEX_EDGES[other])
+            if shared and counts[axis] != cells:
+                found.append((index, other, counts[axis]))
+    return found
+
+
+def write_block_grading(path, solved, direction, block=0):
+    """Grava número de células e simpleGrading da direção ('x', 'y' ou 'z') de um bloco do blockMeshDict.
+
+    O restante do arquivo (e as outras direções) não muda. Recusa (ValueError) camadas cujo comprimento
+    total difere da aresta do bloco, pois o simpleGrading grava só frações e todos os tamanhos de célula
+    seriam reescalados. Retorna o texto anterior, para desfazer.
+    """
+    axis = DIRECTIONS.index(direction)
+    with open(path, "r") as f:
+        text = f.read()
+    blocks = _blocks(text)
+    if not 0 <= block < len(blocks):
+        raise ValueError(f"o blockMeshDict tem {len(blocks)} bloco(s) hex; bloco {block} não existe")
+    start, vertices, cells, grading_start, grading_end = blocks[block]
+    items = _split_items(text[grading_start + 1:grading_end - 1])
+    if len(items) != 3:
+        raise ValueError("simpleGrading do bloco não tem 3 componentes")
+    total_cells = sum(item["cells"] for item in solved if item["valid"])
+    if not total_cells:
+        raise ValueError("nenhuma camada válida para gravar")
+    extent = _block_extent(_points(text), vertices, direction)
+    if extent is None:
+        raise ValueError("não foi possível ler os vértices do bloco para conferir o comprimento das camadas")
+    total_length = sum(item["length"] for item in solved if item["valid"])
+    if abs(total_length - extent) > LENGTH_TOLERANCE * extent:
+        raise ValueError(f"as camadas somam {total_length:.6g} m, mas o bloco {block} mede {extent:.6g} m "
+                         f"na direção {direction}; ajuste os comprimentos para não reescalar as células")
+    items[axis] = grading_entry(solved)
+    cells = list(cells)
+    cells[axis] = total_cells
+
+    header = text[start:grading_start]
+    counts = re.search(r'\(\s*\d+\s+\d+\s+\d+\s*\)(?=\s*simpleGrading)', header)
+    header = header[:counts.start()] + f"({cells[0]} {cells[1]} {cells[2]})" + header[counts.end():]
+    new_text = text[:start] + header + "(" + " ".join(items) + ")" + text[grading_end:]
+    with open(path, "w") as f:
+        f.write(new_text)
+    return text
+
+
+# === Custo estimado ===
+
+def history_throughput(history):
+    """Vazão por núcleo (células x passos / s / subdomínio) de cada execução do histórico com métricas."""
+    measured = []
+    for entry in history:
+        metrics = entry.get("metrics") or {}
+        n, cells, steps = metrics.get("subdomains") or 1, metrics.get("cells"), metrics.get("steps")
+        seconds = wall_seconds(entry)
+        if cells and steps and seconds and seconds > 0:
+            measured.append((cells, cells * steps / seconds / n))
+    return measured
+
+
+def estimate_cost(cells, history, cores=1, steps=None):
+    """Memória e tempo estimados para uma malha de 'cells' células.
+
+    A vazão por núcleo vem da execução do histórico com malha de tamanho mais parecido
+    (ou da mediana, se nenhuma estiver a menos de um fator 2); None se não houver histórico.
+    """
+    estimate = {"cells": cells, "memory_bytes": cells * BYTES_PER_CELL, "seconds_per_step": None,
+                "total_seconds": None, "reference_cells": None}
+    measured = history_throughput(history)
+    if not measured or not cells:
+        return estimate
+    reference_cells, throughput = min(measured, key=lambda item: abs(np.log(item[0] / cells)))
+    if not 0.5 <= reference_cells / cells <= 2:
+        reference_cells, throughput = None, statistics.median(value for _, value in measured)
+    estimate["reference_cells"] = reference_cells
+    estimate["seconds_per_step"] = cells / (throughput * max(cores, 1))
+    if steps:
+        estimate["total_seconds"] = estimate["seconds_per_step"] * steps
+    return estimate
+
+
+def block_mesh_path(case_path):
+    return os.path.join(case_path, "system", "blockMeshDict")
@@ -0,0 +1,100 @@
+import os
+from array import array
+
+import numpy as np
+
+
+class MetricsTable:
+    """Tabela colunar: colunas numéricas em array.array ('d' ou 'i'), colunas de texto em listas."""
+
+    def __init__(self, columns):
+        self.columns = dict(columns)
+        self.data = {name: array(typecode) if typecode else [] for name, typecode in self.columns.items()}
+
+    def __len__(self):
+        first = next(iter(self.data.values()), [])
+        return len(first)
+
+    def append(self, **row):
+        for name, typecode in self.columns.items():
+            value = row.get(name)
+            if typecode == 'd':
+                value = float('nan') if value is None else value
+            elif typecode == 'i':
+                value = -1 if value is None else value
+            self.data[name].append(value)
+
+    def column(self, name):
+        """Retorna uma cópia da coluna como array NumPy."""
+        values = self.data[name]
+        typecode = self.columns[name]
+        if typecode:
+            # Cópia via buffer protocol: uma view impediria o array.array de crescer
+            return np.array(values, dtype=np.float64 if typecode == 'd' else np.intc)
+        return np.array(values, dtype=str)
+
+    def last(self, name, default=None):
+        values = self.data[name]
+        return values[-1] if len(values) else default
+
+    def clear(self):
+        for name, typecode in self.columns.items():
+            self.data[name] = array(typecode) if typecode else []
+
+
+class MetricsStore:
+    """Armazena as séries extraídas do log em tabelas colunares nomeadas."""
+
+    def __init__(self):
+        self.tables = {}
+
+    def table(self, name, columns=None):
+        if name not in self.tables:
+            if columns is None:
+                raise KeyError(f"Tabela de métricas inexistente: {name}")
+            self.tables[name] = MetricsTable(columns)
+        return self.tables[name]
+
+    def has_table(self, name):
+        return name in self.tables and len(self.tables[name]) > 0
+
+    def clear(self):
+        for table in self.tables.values():
+            table.clear()
+
+    def save(self, path):
+        """Grava todas as tabelas em um único arquivo .npz (chaves 'tabela/coluna')."""
+        arrays = {}
+        for table_name, table in self.tables.items():
+            for column_name in table.columns:
+                arrays[f"{table_name}/{column_name}"] = table.column(column_name)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path, tables=None):
+        """Lê um arquivo gravado por save(). Com 'tables', apenas essas tabelas são descompactadas."""
+        store = cls()
+        with np.load(path, allow_pickle=False) as data:
+            columns = {}
+            for key in data.files:
+                table_name, column_name = key.split("/", 1)
+                if tables is not None and table_name not in tables:
+                    continue
+                columns.setdefault(table_name, {})[column_name] = data[key]
+        for table_name, table_columns in columns.items():
+            spec = {}
+            for column_name, values in table_columns.items():
+                if values.dtype.kind == 'f':
+                    spec[column_name] = 'd'
+                elif values.dtype.kind in 'iu':
+                    spec[column_name] = 'i'
+                else:
+                    spec[column_name] = None
+            table = store.table(table_name, spec)
+            for column_name, values in table_columns.items():
+                if spec[column_name]:
+                    table.data[column_name] = array(spec[column_name], values.astype(np.float64 if spec[column_name] == 'd' else np.intc).tobytes())
+                else:
+                    table.data[column_name] = values.tolist()
+        return store
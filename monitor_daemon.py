@@ -0,0 +1,298 @@
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import uuid
+
+from monitoring_api import SOCKET_NAME, MonitoringServer
+from run_monitor import DEFAULT_SOLVER, LOG_FILE, RunJob, now_string, pid_alive
+from simulation_history import SimulationHistory
+
+# Bytes do log lidos por execução a cada ciclo: um log longo não bloqueia a API
+BYTES_PER_POLL = 256 * 1024
+# Execuções da fila ({"queue": true}, ex.: variantes de um estudo paramétrico) rodando ao mesmo tempo
+QUEUE_SLOTS = 1
+
+DAEMON_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gafoam.py")
+
+
+def daemon_home():
+    """Diretório do daemon de monitoramento (GAFOAM_HOME ou ~/.gafoam)."""
+    return os.environ.get("GAFOAM_HOME") or os.path.join(os.path.expanduser("~"), ".gafoam")
+
+
+def _state_path(home):
+    return os.path.join(home, "daemon.json")
+
+
+def _jobs_dir(home):
+    return os.path.join(home, "jobs")
+
+
+def read_state(home=None):
+    """Estado gravado pelo daemon (pid e execuções acompanhadas), ou None."""
+    path = _state_path(home or daemon_home())
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def daemon_pid(home=None):
+    """Pid do daemon em execução (None se não houver)."""
+    state = read_state(home)
+    if state and pid_alive(state.get("pid")):
+        return state["pid"]
+    return None
+
+
+def _spec_problem(spec):
+    """Motivo para recusar um pedido (None se ele for válido)."""
+    if not isinstance(spec, dict) or not isinstance(spec.get("case"), str):
+        return "sem a chave 'case'"
+    if not os.path.isdir(spec["case"]):
+        return f"caso {spec['case']} não existe"
+    return None
+
+
+def submit_job(spec, home=None):
+    """Entrega uma execução ao daemon (um .json por pedido em <home>/jobs).
+
+    Com "queue": true a execução espera na fila até haver vaga (QUEUE_SLOTS execuções da fila por vez).
+    """
+    jobs = _jobs_dir(home or daemon_home())
+    os.makedirs(jobs, exist_ok=True)
+    spec = dict(spec, case=os.path.abspath(spec["case"]), submitted=now_string())
+    if spec.get("history"):
+        spec["history"] = os.path.abspath(spec["history"])
+    # Prefixo de tempo: o daemon lê os pedidos em ordem de nome, ou seja, na ordem de envio
+    path = os.path.join(jobs, f"{time.time_ns():020d}-{uuid.uuid4().hex}.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(spec, f, indent=4)
+    # Renomeado só depois de completo: o daemon nunca lê um pedido pela metade
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def api_address(home=None):
+    """Endereço da API de monitoramento do daemon em execução ('unix:...' ou 'http://...'), ou None."""
+    state = read_state(home)
+    if state and pid_alive(state.get("pid")):
+        return state.get("api")
+    return None
+
+
+def ensure_daemon(home=None, history=None):
+    """Inicia o daemon em segundo plano, em sessão própria, se ainda não estiver rodando."""
+    home = home or daemon_home()
+    pid = daemon_pid(home)
+    if pid:
+        return pid
+    os.makedirs(home, exist_ok=True)
+    log = open(os.path.join(home, "daemon.log"), "ab")
+    arguments = [sys.executable, DAEMON_SCRIPT, "--home", home]
+    if history:
+        arguments += ["--history", os.path.abspath(history)]
+    process = subprocess.Popen(arguments + ["daemon"],
+                               stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                               start_new_session=True)
+    log.close()
+    return process.pid
+
+
+class MonitorDaemon:
+    """Processo de longa duração que acompanha várias execuções sem interface gráfica.
+
+    Os pedidos chegam como arquivos em <home>/jobs (gafoam run --detach, gafoam watch
+    --detach ou a interface) e cada um vira um RunJob. O estado de todas as execuções é
+    gravado em <home>/daemon.json; o de cada uma, em <caso>/gafoam_status.json.
+    Encerrar o daemon não encerra as simulações.
+
+    Pedidos com "queue": true aguardam em self.queued e são iniciados em ordem, no máximo
+    'queue_slots' por vez; a fila é gravada no daemon.json e retomada pelo próximo daemon.
+    """
+
+    def __init__(self, home=None, interval=1.0, history_file=None, queue_slots=QUEUE_SLOTS):
+        self.home = home or daemon_home()
+        self.interval = interval
+        self.history_file = os.path.abspath(history_file) if history_file else None
+        self.queue_slots = queue_slots
+        self.jobs = []
+        # Pedidos da fila ainda não iniciados e execuções da fila já iniciadas
+        self.queued = []
+        self.queue_jobs = []
+        self.histories = {}
+        # Funções chamadas com (id da execução, linha, eventos) a cada linha lida (API de monitoramento)
+        self.listeners = []
+        self.api = None
+        self.running = False
+        self.started = now_string()
+
+    def history(self, path):
+        if not path:
+            return None
+        if path not in self.histories:
+            self.histories[path] = SimulationHistory(path)
+        return self.histories[path]
+
+    def accept_jobs(self):
+        jobs_dir = _jobs_dir(self.home)
+        if not os.path.isdir(jobs_dir):
+            return
+        for name in sorted(os.listdir(jobs_dir)):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(jobs_dir, name)
+            try:
+                with open(path, "r") as f:
+                    spec = json.load(f)
+                problem = _spec_problem(spec)
+            except (OSError, ValueError) as e:
+                problem = str(e)
+            if problem:
+                # Renomeado (e não apagado): o pedido fica em <home>/jobs para inspeção
+                print(f"[{now_string()}] Pedido inválido {name}: {problem}", flush=True)
+                os.replace(path, path + ".rejected")
+                continue
+            os.remove(path)
+            self.add_job(spec)
+
+    def add_job(self, spec):
+        if spec.get("queue"):
+            if any(queued["case"] == spec["case"] for queued in self.queued):
+                print(f"[{now_string()}] {spec['case']} já está na fila; pedido ignorado.", flush=True)
+                return None
+            self.queued.append(spec)
+            print(f"[{now_string()}] Na fila: {spec['case']} ({len(self.queued)} aguardando)", flush=True)
+            return None
+        return self.start_job(spec)
+
+    def start_job(self, spec):
+        if any(job.case_path == spec["case"] and job.busy() for job in self.jobs):
+            print(f"[{now_string()}] {spec['case']} já está sendo acompanhado; pedido ignorado.", flush=True)
+            return None
+        job = RunJob(spec["case"], command=spec.get("command"), solver=spec.get("solver") or DEFAULT_SOLVER,
+                     pid=spec.get("pid"), log_name=spec.get("log") or LOG_FILE,
+                     history=self.history(spec.get("history")),
+                     shell_prefix=spec.get("shell_prefix", ""), watchdog=spec.get("watchdog", True),
+                     from_start=spec.get("from_start", True), offset=spec.get("offset"),
+                     start_time=spec.get("start_time"))
+        run = len(self.jobs)
+        job.monitor.listeners.append(lambda line, events: self.publish(run, line, events))
+        self.jobs.append(job)
+        try:
+            job.start()
+        except Exception as e:
+            self.job_failed(job, e)
+            return job
+        print(f"[{now_string()}] Acompanhando {job.case_path} (pid {job.pid})", flush=True)
+        return job
+
+    def job_failed(self, job, error):
+        """Uma execução com erro é marcada como falha (histórico e API); as outras continuam."""
+        job.fail(f"{type(error).__name__}: {error}")
+        print(f"[{now_string()}] {job.case_path}: {job.messages[-1]}", flush=True)
+
+    def publish(self, run, line, events):
+        for listener in self.listeners:
+            listener(run, line, events)
+
+    def start_queued(self):
+        """Inicia pedidos da fila enquanto houver vaga."""
+        while self.queued and sum(job.busy() for job in self.queue_jobs) < self.queue_slots:
+            job = self.start_job(self.queued.pop(0))
+            if job is not None:
+                self.queue_jobs.append(job)
+
+    def poll(self):
+        self.accept_jobs()
+        self.start_queued()
+        for job in self.jobs:
+            if job.busy():
+                try:
+                    job.poll(BYTES_PER_POLL)
+                except Exception as e:
+                    self.job_failed(job, e)
+                    continue
+                if not job.busy():
+                    print(f"[{now_string()}] {job.case_path}: {job.messages[-1]}", flush=True)
+        # Execuções encerradas ficam listadas até o próximo reinício do daemon
+        self.write_state()
+
+    def state(self):
+        return {
+            "pid": os.getpid(),
+            "started": self.started,
+            "api": self.api,
+            "updated": now_string(),
+            "jobs": [{"case": job.case_path, "state": job.state, "pid": job.pid, "solver": job.solver,
+                      "time": job.monitor.parser.current_time, "start_time": job.start_time, "end_time": job.end_time,
+                      "offset": job.offset, "log": os.path.basename(job.log_path),
+                      "history": job.history.history_file if job.history is not None else None,
+                      "queue": job in self.queue_jobs}
+                     for job in self.jobs],
+            # Pedidos completos: o próximo daemon os recoloca na fila
+            "queued": self.queued,
+        }
+
+    def write_state(self):
+        path = _state_path(self.home)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.state(), f, indent=4)
+        os.replace(path + ".tmp", path)
+
+    def stop(self, *args):
+        self.running = False
+
+    def adopt_previous(self):
+        """Retoma o acompanhamento das simulações que o daemon anterior deixou em execução."""
+        previous = read_state(self.home)
+        # A fila vai para o fim: as execuções ainda vivas continuam ocupando as vagas
+        self.queued.extend((previous or {}).get("queued", []))
+        for job in (previous or {}).get("jobs", []):
+            if job["state"] in ("running", "paused", "stopping") and pid_alive(job.get("pid")):
+                adopted = self.start_job({"case": job["case"], "pid": job["pid"], "solver": job.get("solver"),
+                                          "history": job.get("history"), "offset": job.get("offset"),
+                                          "log": job.get("log"), "start_time": job.get("start_time")})
+                if adopted is not None and job.get("queue"):
+                    self.queue_jobs.append(adopted)
+
+    def run(self, api=True, host="127.0.0.1", port=None):
+        """Laço principal. Com 'api', serve a API de monitoramento no mesmo loop asyncio."""
+        os.makedirs(_jobs_dir(self.home), exist_ok=True)
+        if daemon_pid(self.home) not in (None, os.getpid()):
+            raise RuntimeError(f"Já existe um daemon em execução (pid {daemon_pid(self.home)}).")
+        asyncio.run(self.serve(api, host, port))
+
+    async def serve(self, api, host, port):
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGTERM, self.stop)
+        loop.add_signal_handler(signal.SIGINT, self.stop)
+        server = None
+        if api:
+            server = await MonitoringServer(self, os.path.join(self.home, SOCKET_NAME), host, port).start()
+            self.api = server.address()
+        self.adopt_previous()
+        self.running = True
+        print(f"[{now_string()}] Daemon iniciado (pid {os.getpid()}, {self.home}"
+              + (f", API em {self.api})" if self.api else ")"), flush=True)
+        while self.running:
+            try:
+                self.poll()
+            except Exception as e:
+                # Ex.: daemon.json impossível de gravar; o laço continua acompanhando as execuções
+                print(f"[{now_string()}] Erro no ciclo do daemon: {type(e).__name__}: {e}", flush=True)
+            await asyncio.sleep(min((job.poll_delay(self.interval) for job in self.jobs if job.busy()),
+                                    default=self.interval))
+        if server is not None:
+            await server.close()
+        self.api = None
+        for job in self.jobs:
+            if job.busy():
+                job.write_status(force=True)
+        # O estado fica gravado para que o próximo daemon readote as execuções em andamento
+        self.write_state()
+        print(f"[{now_string()}] Daemon encerrado; as simulações continuam em execução.", flush=True)
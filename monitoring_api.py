@@ -0,0 +1,475 @@
+"""API local de monitoramento (HTTP + WebSocket), servida pelo daemon do gafoam.
+
+Por padrão escuta apenas em um socket unix (<home>/gafoam.sock); com uma porta, em
+127.0.0.1. Só usa a biblioteca padrão (asyncio). Todas as respostas são JSON:
+
+    GET /status                          daemon e resumo de cada execução
+    GET /runs                            execuções acompanhadas
+    GET /runs/<id>                       estado completo de uma execução
+    GET /runs/<id>/series?name=residual:p&max_points=500&x=time|clock
+    GET /runs/<id>/console?lines=100     final do console
+    GET /history?limit=20                histórico de simulações
+    GET /ws?run=<id>&types=residual,timestep   (WebSocket) eventos do parser em tempo real
+
+No WebSocket, 'lines=1' acrescenta as linhas do console (eventos 'line') e 'snapshot=1'
+(com 'run') envia antes um evento 'snapshot' com o estado, as tabelas reduzidas
+(max_points passos) e o final do console; os eventos seguintes são exatamente os
+posteriores a ele. É o que a interface usa para se conectar a uma execução em andamento.
+"""
+import asyncio
+import base64
+import hashlib
+import http.client
+import json
+import math
+import os
+import queue
+import socket
+import struct
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+import run_comparison
+from run_monitor import compact_tables, now_string
+
+SOCKET_NAME = "gafoam.sock"
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+# Eventos pendentes por cliente; um cliente que não acompanha o ritmo é desconectado
+QUEUE_SIZE = 10000
+MAX_HEADER_LINES = 100
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def clean(value):
+    """Troca NaN/inf por None (JSON estrito) e converte os tipos do NumPy."""
+    if isinstance(value, dict):
+        return {key: clean(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [clean(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return clean(value.tolist())
+    if isinstance(value, (float, np.floating)):
+        return float(value) if math.isfinite(value) else None
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+def encode(value):
+    return json.dumps(clean(value), allow_nan=False).encode("utf-8")
+
+
+def ws_frame(payload, opcode=0x1, mask=False):
+    """Quadro WebSocket (RFC 6455) único (FIN); clientes precisam mascarar os quadros."""
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+    if mask:
+        key = os.urandom(4)
+        header += key
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+    return bytes(header) + payload
+
+
+def _unmask(payload, key):
+    data = np.frombuffer(payload, dtype=np.uint8)
+    keys = np.resize(np.frombuffer(key, dtype=np.uint8), len(data))
+    return (data ^ keys).tobytes()
+
+
+async def read_ws_frame(reader):
+    """Lê um quadro WebSocket. Retorna (opcode, payload)."""
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    key = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    return opcode, _unmask(payload, key) if key else payload
+
+
+class Subscriber:
+    def __init__(self, run=None, types=None, lines=False):
+        self.run = run
+        self.types = types
+        self.lines = lines
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.overflow = False
+
+    def offer(self, run, line, events):
+        if self.overflow or (self.run is not None and run != self.run):
+            return
+        if self.lines:
+            events = [{"type": "line", "line": line}] + events
+        for event in events:
+            if self.types and event["type"] not in self.types:
+                continue
+            try:
+                self.queue.put_nowait(dict(event, run=run))
+            except asyncio.QueueFull:
+                self.overflow = True
+                return
+
+
+class MonitoringServer:
+    """Servidor HTTP/WebSocket sobre os RunJob do MonitorDaemon.
+
+    Roda no mesmo loop asyncio em que o daemon consulta as execuções: não há acesso
+    concorrente ao parser, e os eventos chegam aos clientes pelos listeners do daemon.
+    """
+
+    def __init__(self, daemon, socket_path=None, host="127.0.0.1", port=None):
+        self.daemon = daemon
+        self.socket_path = socket_path
+        self.host = host
+        self.port = port
+        self.server = None
+        self.subscribers = set()
+        daemon.listeners.append(self.publish)
+
+    async def start(self):
+        if self.port is not None:
+            self.server = await asyncio.start_server(self.handle, self.host, self.port)
+            self.port = self.server.sockets[0].getsockname()[1]
+        else:
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            self.server = await asyncio.start_unix_server(self.handle, self.socket_path)
+            os.chmod(self.socket_path, 0o600)
+        return self
+
+    async def close(self):
+        self.daemon.listeners.remove(self.publish)
+        self.server.close()
+        await self.server.wait_closed()
+        if self.port is None and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    def address(self):
+        return f"http://{self.host}:{self.port}" if self.port is not None else f"unix:{self.socket_path}"
+
+    def publish(self, run, line, events):
+        for subscriber in list(self.subscribers):
+            subscriber.offer(run, line, events)
+
+    def _job(self, run):
+        try:
+            index = int(run)
+            # Índices negativos seriam aceitos pela lista ('/runs/-1' = última execução)
+            if index < 0:
+                raise IndexError(index)
+            return self.daemon.jobs[index]
+        except (ValueError, IndexError):
+            raise ApiError(404, f"execução inexistente: {run}")
+
+    def route(self, path, query):
+        parts = [part for part in path.split("/") if part]
+        if not parts:
+            return {"endpoints": ["/status", "/runs", "/runs/<id>", "/runs/<id>/series", "/runs/<id>/console",
+                                  "/history", "/ws"]}
+        if parts == ["status"]:
+            return {"daemon": self.daemon.state(), "runs": [self.run_summary(run, job)
+                                                           for run, job in enumerate(self.daemon.jobs)]}
+        if parts == ["runs"]:
+            return [self.run_summary(run, job) for run, job in enumerate(self.daemon.jobs)]
+        if parts[0] == "runs" and len(parts) >= 2:
+            job = self._job(parts[1])
+            if len(parts) == 2:
+                return dict(job.status(), id=int(parts[1]))
+            if parts[2:] == ["series"]:
+                return self.series(job, query)
+            if parts[2:] == ["console"]:
+                lines = int(query.get("lines", 100))
+                return {"lines": list(job.monitor.console)[-lines:] if lines > 0 else []}
+        if parts == ["history"]:
+            history = self.daemon.history(self.daemon.history_file)
+            if history is None:
+                raise ApiError(404, "o daemon foi iniciado sem arquivo de histórico")
+            history.history = history.load_history()
+            limit = int(query.get("limit", 20))
+            entries = history.get_history()[-limit:] if limit > 0 else history.get_history()
+            return [{key: value for key, value in entry.items() if key != "log_data"} for entry in entries]
+        raise ApiError(404, f"caminho inexistente: {path}")
+
+    @staticmethod
+    def run_summary(run, job):
+        snapshot = job.monitor.snapshot()
+        return {"id": run, "case": job.case_path, "state": job.state, "pid": job.pid, "time": snapshot["time"],
+                "steps": snapshot["steps"], "residuals": snapshot["residuals"], "start_time": job.start_time}
+
+    @staticmethod
+    def series(job, query):
+        name = query.get("name", "deltaT")
+        try:
+            times, values = run_comparison.run_series(job.monitor.parser.store, name)
+        except KeyError:
+            raise ApiError(400, f"série desconhecida: {name}")
+        total = len(times)
+        x = times
+        if query.get("x") == "clock":
+            x = run_comparison.to_wall_clock(job.monitor.parser.store, times)
+        x, values = run_comparison.downsample(x, values, int(query.get("max_points", 1000)))
+        return {"name": name, "x": x, "y": values, "total": total}
+
+    async def handle(self, reader, writer):
+        upgraded, request_line = False, ""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            headers = {}
+            for _ in range(MAX_HEADER_LINES):
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+            method, target, _ = (request_line.split(" ") + ["", ""])[:3]
+            url = urlsplit(target)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            if method != "GET":
+                raise ApiError(405, "apenas GET")
+            if url.path == "/ws":
+                if headers.get("upgrade", "").lower() != "websocket" or "sec-websocket-key" not in headers:
+                    raise ApiError(400, "esperado um pedido de WebSocket")
+                upgraded = True
+                await self.websocket(reader, writer, headers, query)
+                return
+            await self.respond(writer, 200, self.route(url.path, query))
+        except ApiError as e:
+            await self.respond(writer, e.status, {"error": str(e)})
+        except (ValueError, TypeError) as e:
+            await self.respond(writer, 400, {"error": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            # Erro inesperado numa rota (ex.: KeyError/OSError ao ler as séries): 500 e registro no log
+            print(f"[{now_string()}] Erro na API ({request_line}): {type(e).__name__}: {e}", flush=True)
+            if not upgraded:
+                try:
+                    await self.respond(writer, 500, {"error": f"{type(e).__name__}: {e}"})
+                except ConnectionError:
+                    pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, body):
+        payload = encode(body)
+        writer.write(f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("latin-1") + payload)
+        await writer.drain()
+
+    async def websocket(self, reader, writer, headers, query):
+        accept = base64.b64encode(hashlib.sha1((headers["sec-websocket-key"] + WS_GUID).encode()).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode("latin-1"))
+        run = int(query["run"]) if "run" in query else None
+        types = set(query["types"].split(",")) if query.get("types") else None
+        subscriber = Subscriber(run, types, query.get("lines") == "1")
+        if run is not None and query.get("snapshot") == "1":
+            try:
+                job = self._job(run)
+            except ApiError as e:
+                writer.write(ws_frame(struct.pack("!H", 1008) + str(e).encode(), opcode=0x8))
+                return
+            # Sem 'await' entre o snapshot e a inscrição: nenhum evento fica de fora ou repetido
+            writer.write(ws_frame(encode({
+                "type": "snapshot",
+                "run": run,
+                "status": job.status(),
+                "tables": compact_tables(job.monitor.parser.store, int(query.get("max_points", 2000))),
+                "console": list(job.monitor.console),
+            })))
+        self.subscribers.add(subscriber)
+        receiver = asyncio.ensure_future(self._ws_receive(reader, writer))
+        try:
+            while not receiver.done():
+                getter = asyncio.ensure_future(subscriber.queue.get())
+                done, _ = await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+                if getter not in done:
+                    getter.cancel()
+                    break
+                if subscriber.overflow and subscriber.queue.empty():
+                    writer.write(ws_frame(struct.pack("!H", 1008) + "fila de eventos cheia".encode(), opcode=0x8))
+                    break
+                writer.write(ws_frame(encode(getter.result())))
+                await writer.drain()
+        finally:
+            self.subscribers.discard(subscriber)
+            receiver.cancel()
+            # Recolhe o resultado (ou a exceção) da leitura: sem isso o asyncio avisa que ela se perdeu
+            await asyncio.gather(receiver, return_exceptions=True)
+
+    async def _ws_receive(self, reader, writer):
+        """Responde a ping e termina quando o cliente fecha a conexão."""
+        while True:
+            opcode, payload = await read_ws_frame(reader)
+            if opcode == 0x8:
+                writer.write(ws_frame(payload[:2], opcode=0x8))
+                return
+            if opcode == 0x9:
+                writer.write(ws_frame(payload, opcode=0xA))
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=10):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+def parse_address(address):
+    """'unix:<caminho>' ou 'http://host:porta' → argumentos do ApiClient."""
+    if address.startswith("unix:"):
+        return {"socket_path": address[len("unix:"):]}
+    url = urlsplit(address if "//" in address else "http://" + address)
+    return {"host": url.hostname or "127.0.0.1", "port": url.port}
+
+
+class ApiClient:
+    """Cliente síncrono da API (socket unix ou TCP local), usado pelo CLI e pela interface."""
+
+    @classmethod
+    def from_address(cls, address, timeout=10):
+        return cls(timeout=timeout, **parse_address(address))
+
+    def __init__(self, socket_path=None, host="127.0.0.1", port=None, timeout=10):
+        self.socket_path = socket_path
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def _socket(self):
+        if self.port is not None:
+            return socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        return sock
+
+    def get(self, path):
+        if self.port is not None:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        else:
+            connection = _UnixConnection(self.socket_path, self.timeout)
+        try:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            body = json.loads(response.read())
+        finally:
+            connection.close()
+        if response.status != 200:
+            raise ApiError(response.status, body.get("error", response.reason))
+        return body
+
+    def events(self, path="/ws"):
+        """Gerador com os eventos recebidos pelo WebSocket (bloqueante)."""
+        sock = self._socket()
+        # Guardado para que outra thread possa interromper a leitura (EventReceiver.stop)
+        self.event_socket = sock
+        key = base64.b64encode(os.urandom(16)).decode()
+        sock.sendall((f"GET {path} HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode("latin-1"))
+        stream = sock.makefile("rb")
+        status = stream.readline().decode("latin-1")
+        if " 101 " not in status:
+            sock.close()
+            raise ApiError(400, f"WebSocket recusado: {status.strip()}")
+        while stream.readline().strip():
+            pass
+        sock.settimeout(None)
+        try:
+            while True:
+                header = stream.read(2)
+                if len(header) < 2:
+                    return
+                first, second = header
+                length = second & 0x7F
+                if length == 126:
+                    length = struct.unpack("!H", stream.read(2))[0]
+                elif length == 127:
+                    length = struct.unpack("!Q", stream.read(8))[0]
+                payload = stream.read(length)
+                opcode = first & 0x0F
+                if opcode == 0x8:
+                    return
+                if opcode == 0x9:
+                    sock.sendall(ws_frame(payload, opcode=0xA, mask=True))
+                elif opcode == 0x1:
+                    yield json.loads(payload)
+        finally:
+            try:
+                sock.sendall(ws_frame(struct.pack("!H", 1000), opcode=0x8, mask=True))
+            except OSError:
+                pass
+            sock.close()
+
+
+class EventReceiver:
+    """Lê o WebSocket em uma thread e entrega os eventos em uma fila.
+
+    Quem consome (a interface, via QTimer) chama drain() periodicamente; nenhuma
+    função é chamada a partir da thread de leitura. Erros e o fim da conexão chegam
+    como eventos {'type': 'disconnected'}.
+    """
+
+    def __init__(self, client, path):
+        self.client = client
+        self.path = path
+        self.queue = queue.Queue()
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, name="gafoam-events", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _run(self):
+        reason = "conexão encerrada pelo daemon"
+        try:
+            for event in self.client.events(self.path):
+                self.queue.put(event)
+        except (OSError, ValueError, ApiError) as e:
+            reason = str(e)
+        if not self.stopping:
+            self.queue.put({"type": "disconnected", "reason": reason})
+
+    def drain(self, limit=5000):
+        events = []
+        while len(events) < limit:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def stop(self):
+        self.stopping = True
+        sock = getattr(self.client, "event_socket", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
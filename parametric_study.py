@@ -0,0 +1,219 @@
+import errno
+import fcntl
+import itertools
+import json
+import os
+import shutil
+
+import foam_case
+import foam_dict
+
+# Partes do caso que o solver só lê: entram na variante por reflink/hardlink, sem cópia.
+# Com hardlink, editar um desses arquivos no lugar altera o caso base e todas as variantes;
+# arquivos do espaço de parâmetros são sempre regravados (arquivo novo), mesmo dentro de 0/.
+SHARED_DIRS = (os.path.join("constant", "polyMesh"), "0")
+# Copiados sempre (pequenos e às vezes editados à mão: um hardlink alteraria o caso base)
+CASE_DIRS = ("0", "constant", "system")
+MANIFEST = "study.json"
+PARAMETERS_FILE = "gafoam_parameters.json"
+
+# ioctl FICLONE do Linux: cópia por referência (copy-on-write) em btrfs, XFS, ZFS...
+FICLONE = 0x40049409
+LINK_MODES = ("auto", "reflink", "hardlink", "copy")
+
+
+def parse_parameter(text):
+    """'arquivo:chave/subchave=v1,v2,...' -> (arquivo, chave, [valores]).
+
+    Os valores são separados por vírgula fora de parênteses, ex.: 'constant/cloudProperties:
+    subModels/injectionModels/model1/U0=(0 -1 0),(0 -2 0)'.
+    """
+    target, _, values = text.partition("=")
+    path, _, key = target.partition(":")
+    if not (path.strip() and key.strip() and values.strip()):
+        raise ValueError(f"parâmetro inválido: '{text}' (use arquivo:chave=v1,v2)")
+    items, depth, current = [], 0, ""
+    for char in values:
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        if char == "," and depth == 0:
+            items.append(current.strip())
+            current = ""
+        else:
+            current += char
+    items.append(current.strip())
+    return path.strip(), key.strip(), [_value(item) for item in items if item]
+
+
+def _value(text):
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def expand(space, mode="grid"):
+    """Combinações do espaço de parâmetros {(arquivo, chave): [valores]}.
+
+    'grid' faz o produto cartesiano; 'zip' pareia os i-ésimos valores (listas de mesmo tamanho).
+    """
+    keys = list(space)
+    if mode == "zip":
+        lengths = {len(values) for values in space.values()}
+        if len(lengths) > 1:
+            raise ValueError("no modo zip todos os parâmetros precisam ter o mesmo número de valores")
+        combinations = zip(*space.values())
+    else:
+        combinations = itertools.product(*space.values())
+    return [dict(zip(keys, values)) for values in combinations]
+
+
+def _reflink(source, target):
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.remove(target)
+            raise
+
+
+class Cloner:
+    """Replica arquivos grandes: reflink, hardlink ou cópia ('auto' tenta nessa ordem).
+
+    No modo 'auto' a primeira falha de um método o desliga para o resto do estudo
+    (ex.: ext4 não tem reflink; outro sistema de arquivos não aceita hardlink).
+    """
+
+    def __init__(self, mode="auto"):
+        if mode not in LINK_MODES:
+            raise ValueError(f"modo de ligação inválido: {mode}")
+        self.mode = mode
+        self.methods = ["reflink", "hardlink", "copy"] if mode == "auto" else [mode]
+        self.counts = {method: 0 for method in ("reflink", "hardlink", "copy")}
+        self.shared_bytes = 0
+
+    def clone(self, source, target):
+        for method in list(self.methods):
+            try:
+                if method == "reflink":
+                    _reflink(source, target)
+                elif method == "hardlink":
+                    os.link(source, target)
+                else:
+                    shutil.copy2(source, target)
+            except OSError as e:
+                if self.mode != "auto" or method == "copy" or e.errno == errno.ENOSPC:
+                    raise
+                self.methods.remove(method)
+                continue
+            self.counts[method] += 1
+            if method != "copy":
+                self.shared_bytes += os.path.getsize(source)
+            return method
+        raise OSError(f"não foi possível replicar {source}")
+
+
+def _shared(relative):
+    return any(relative == shared or relative.startswith(shared + os.sep) for shared in SHARED_DIRS)
+
+
+def case_files(base):
+    """Arquivos do caso modelo (0, constant, system), relativos a ele; resultados e logs ficam de fora."""
+    files = []
+    for name in CASE_DIRS:
+        root = os.path.join(base, name)
+        for folder, dirs, names in os.walk(root):
+            dirs.sort()
+            for file_name in sorted(names):
+                files.append(os.path.relpath(os.path.join(folder, file_name), base))
+    return files
+
+
+def create_variant(base, target, values, files, cloner):
+    """Cria uma variante: dicionários alterados são regravados, as partes compartilhadas ligadas e o resto copiado."""
+    changed = {}
+    for (path, key), value in values.items():
+        changed.setdefault(os.path.normpath(path), {})[key] = value
+    missing = [path for path in changed if not os.path.isfile(os.path.join(base, path))]
+    if missing:
+        raise ValueError(f"arquivos do espaço de parâmetros ausentes no caso base: {', '.join(missing)}")
+    for relative in files:
+        source, destination = os.path.join(base, relative), os.path.join(target, relative)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        if relative in changed:
+            foam_dict.set_nested_entries(source, changed[relative], output=destination)
+        elif _shared(relative):
+            cloner.clone(source, destination)
+        else:
+            shutil.copy2(source, destination)
+    with open(os.path.join(target, PARAMETERS_FILE), "w") as f:
+        json.dump({f"{path}:{key}": value for (path, key), value in values.items()}, f, indent=4)
+
+
+def generate(base, output, space, mode="grid", link="auto", prefix="variant"):
+    """Gera as variantes de 'base' em 'output' (uma pasta por combinação) e grava output/study.json.
+
+    Se uma variante falhar, as já criadas são removidas: não ficam variantes sem study.json.
+    Retorna o manifesto: variantes com seus parâmetros, contagem por método de ligação e bytes compartilhados.
+    """
+    base = os.path.abspath(base)
+    if not all(os.path.isdir(os.path.join(base, name)) for name in ("system", "constant")):
+        raise ValueError(f"{base} não é um caso OpenFOAM (system/ e constant/)")
+    combinations = expand(space, mode)
+    os.makedirs(output, exist_ok=True)
+    files = case_files(base)
+    cloner = Cloner(link)
+    variants = []
+    try:
+        for index, values in enumerate(combinations):
+            name = f"{prefix}_{index:04d}"
+            target = os.path.join(os.path.abspath(output), name)
+            if os.path.exists(target):
+                raise ValueError(f"{target} já existe")
+            try:
+                create_variant(base, target, values, files, cloner)
+            except BaseException:
+                shutil.rmtree(target, ignore_errors=True)
+                raise
+            variants.append({"name": name, "case": target,
+                             "parameters": {f"{path}:{key}": value for (path, key), value in values.items()}})
+    except BaseException:
+        # Também no Ctrl+C: um estudo parcial sem manifesto não seria submetido nem limpo
+        for variant in variants:
+            shutil.rmtree(variant["case"], ignore_errors=True)
+        raise
+    manifest = {"base": base, "mode": mode, "link": cloner.counts, "shared_bytes": cloner.shared_bytes,
+                "variants": variants}
+    with open(os.path.join(output, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+
+def submit(manifest, solver, prefix="", history=None, home=None):
+    """Coloca as variantes na fila do daemon ({"queue": true}: rodam uma de cada vez, por padrão).
+
+    As variantes não têm processor*: o número de processos vem do numberOfSubdomains do
+    decomposeParDict de cada uma e, com mais de um, o job roda decomposePar antes do mpirun.
+    """
+    # Importados aqui: simulation_history (usado pelo daemon) lê read_parameters deste módulo
+    import monitor_daemon
+    import run_monitor
+    for variant in manifest["variants"]:
+        case = variant["case"]
+        ranks = foam_case.number_of_subdomains(case) or 1
+        command = run_monitor.solver_command(case, solver, ranks, decompose=True)
+        monitor_daemon.submit_job({"case": case, "command": command,
+                                   "shell_prefix": prefix, "solver": solver, "history": history, "queue": True},
+                                  home)
+    return monitor_daemon.ensure_daemon(home, history)
+
+
+def read_parameters(case_path):
+    """Parâmetros de uma variante gerada por este módulo ({} para outros casos)."""
+    path = os.path.join(case_path, PARAMETERS_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
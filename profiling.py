@@ -0,0 +1,179 @@
+import os
+import re
+
+import foam_dict
+
+EXECUTION_TIME_RE = re.compile(
+    r'ExecutionTime\s*=\s*([0-9.eE+-]+)\s*s\s+ClockTime\s*=\s*([0-9.eE+-]+)\s*s'
+)
+TIME_RE = re.compile(r'^Time = ([0-9.eE+-]+)')
+
+# Palavras-chave usadas para agrupar as descrições do profiling em etapas do solver
+PHASES = [
+    ("Momentum predictor", ("UEqn", "solve_U", "Ua", "momentumPredictor", "MomentumPredictor")),
+    ("Pressure solve", ("pEqn", "solve_p", "pressure", "Pressure")),
+    ("Cloud evolve", ("cloud", "Cloud", "parcel", "lagrangian")),
+    ("Write", ("write", "Write")),
+    ("Function objects", ("functionObject",)),
+]
+
+
+class ProfilingNode:
+    def __init__(self, node_id, description, calls=0, total_time=0.0, child_time=0.0, parent_id=None):
+        self.id = node_id
+        self.description = description
+        self.calls = calls
+        self.total_time = total_time
+        self.child_time = child_time
+        self.parent_id = parent_id
+        self.children = []
+
+    @property
+    def self_time(self):
+        return max(self.total_time - self.child_time, 0.0)
+
+    def path(self, nodes):
+        """Caminho 'pai/filho' do nó, usado para comparar execuções diferentes."""
+        parts = [self.description]
+        parent = nodes.get(self.parent_id)
+        while parent is not None:
+            parts.append(parent.description)
+            parent = nodes.get(parent.parent_id)
+        return "/".join(reversed(parts))
+
+    def walk(self, depth=0):
+        yield self, depth
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+
+def classify_phase(description):
+    """Associa a descrição de um trecho do profiling a uma etapa do solver."""
+    for phase, keywords in PHASES:
+        if any(keyword in description for keyword in keywords):
+            return phase
+    return "Other"
+
+
+def find_profiling_file(case_path):
+    """Retorna o arquivo 'uniform/profiling' do último tempo escrito (caso serial ou processor0)."""
+    for base in (case_path, os.path.join(case_path, "processor0")):
+        if not os.path.isdir(base):
+            continue
+        times = []
+        for name in os.listdir(base):
+            try:
+                times.append((float(name), name))
+            except ValueError:
+                pass
+        for _, name in sorted(times, reverse=True):
+            path = os.path.join(base, name, "uniform", "profiling")
+            if os.path.exists(path):
+                return path
+    return None
+
+
+def load_profiling(path):
+    """Lê o dicionário 'profiling' e monta a árvore de nós. Retorna (raízes, nós por id)."""
+    data = foam_dict.read(path)
+    triggers = data.get("profiling", data)
+    nodes = {}
+    for name, entry in triggers.items():
+        if not isinstance(entry, dict) or "id" not in entry:
+            continue
+        node = ProfilingNode(
+            node_id=entry["id"],
+            description=str(entry.get("description", name)),
+            calls=int(entry.get("calls", 0)),
+            total_time=float(entry.get("totalTime", 0.0)),
+            child_time=float(entry.get("childTime", 0.0)),
+            parent_id=entry.get("parentId"),
+        )
+        nodes[node.id] = node
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node.parent_id)
+        if parent is not None:
+            parent.children.append(node)
+        else:
+            roots.append(node)
+    for node in nodes.values():
+        node.children.sort(key=lambda n: n.total_time, reverse=True)
+    roots.sort(key=lambda n: n.total_time, reverse=True)
+    return roots, nodes
+
+
+def phase_breakdown(nodes):
+    """Soma o tempo próprio (self time) de cada nó por etapa do solver."""
+    phases = {}
+    for node in nodes.values():
+        phase = classify_phase(node.description)
+        phases[phase] = phases.get(phase, 0.0) + node.self_time
+    return dict(sorted(phases.items(), key=lambda item: item[1], reverse=True))
+
+
+def parse_log_timings(lines):
+    """Extrai o tempo de parede gasto em cada passo a partir das linhas ExecutionTime/ClockTime."""
+    steps = []
+    current_time = None
+    last_execution = 0.0
+    last_clock = 0.0
+    for line in lines:
+        time_match = TIME_RE.match(line.strip())
+        if time_match:
+            current_time = float(time_match.group(1))
+            continue
+        match = EXECUTION_TIME_RE.search(line)
+        if match:
+            execution = float(match.group(1))
+            clock = float(match.group(2))
+            steps.append({
+                "time": current_time,
+                "execution_time": execution,
+                "clock_time": clock,
+                "step_execution": execution - last_execution,
+                "step_clock": clock - last_clock,
+            })
+            last_execution = execution
+            last_clock = clock
+    return steps
+
+
+def load_log_timings(log_path):
+    if not os.path.exists(log_path):
+        return []
+    with open(log_path, "r", errors="replace") as f:
+        return parse_log_timings(f)
+
+
+def diff_profiles(nodes_a, nodes_b):
+    """Compara duas execuções nó a nó (pelo caminho). Ordena pelas maiores regressões de tempo."""
+    paths_a = {node.path(nodes_a): node for node in nodes_a.values()}
+    paths_b = {node.path(nodes_b): node for node in nodes_b.values()}
+    rows = []
+    for path in set(paths_a) | set(paths_b):
+        time_a = paths_a[path].total_time if path in paths_a else 0.0
+        time_b = paths_b[path].total_time if path in paths_b else 0.0
+        rows.append({
+            "path": path,
+            "phase": classify_phase(path.rsplit("/", 1)[-1]),
+            "time_a": time_a,
+            "time_b": time_b,
+            "delta": time_b - time_a,
+            "ratio": time_b / time_a if time_a > 0 else None,
+        })
+    rows.sort(key=lambda row: row["delta"], reverse=True)
+    return rows
+
+
+def diff_phases(nodes_a, nodes_b):
+    """Compara o tempo por etapa do solver entre duas execuções."""
+    phases_a = phase_breakdown(nodes_a)
+    phases_b = phase_breakdown(nodes_b)
+    rows = []
+    for phase in set(phases_a) | set(phases_b):
+        time_a = phases_a.get(phase, 0.0)
+        time_b = phases_b.get(phase, 0.0)
+        rows.append({"phase": phase, "time_a": time_a, "time_b": time_b, "delta": time_b - time_a})
+    rows.sort(key=lambda row: row["delta"], reverse=True)
+    return rows
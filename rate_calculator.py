@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 def compute_r_N(y_min, y_max, h):
     SS = y_max / y_min
@@ -56,3 +57,107 @@ def calculate_increase_rate(d, n, m, dy_in_0, dy_wall_0):
         "S_in": S_in,
         "S_trans": S_trans,
     }
+
+
+# === Modo em lote (NumPy): varredura de parâmetros ===
+
+INPUTS = ("d", "n", "m", "dy_in_0", "dy_wall_0")
+OUTPUTS = ("rate_nozzle", "rate_wall", "rate_trans", "nozzle_layer_cells", "transition_layer_cells",
+           "wall_layer_cells", "S_in", "S_trans")
+CELL_FIELDS = ("nozzle_layer_cells", "transition_layer_cells", "wall_layer_cells")
+
+# Uma linha por combinação; 'valid' é falso onde a versão escalar levantaria exceção
+# (divisão por zero, log de número não positivo, potência complexa ou estouro)
+RESULT_DTYPE = np.dtype([(name, "f8") for name in INPUTS]
+                        + [(name, "i8" if name in CELL_FIELDS else "f8") for name in OUTPUTS]
+                        + [("valid", "?")])
+
+# Maior contagem de células aceita (int64 e float64 exato)
+MAX_CELLS = 2 ** 53
+
+
+def compute_r_N_array(y_min, y_max, h):
+    """compute_r_N vetorizado: (r, N, válido), sem exceções."""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        SS = y_max / y_min
+        denominator = y_min * SS - h
+        r = (y_min - h) / denominator
+        SSr = SS * r
+        N = np.log(SSr) / np.log(r)
+    valid = (denominator != 0) & (r > 0) & (r != 1) & (SSr > 0) & np.isfinite(N)
+    return r, N, valid
+
+
+def _truncate(values, valid):
+    """int() do Python (trunca para zero) onde válido; 0 no resto."""
+    valid = valid & np.isfinite(values) & (np.abs(values) < MAX_CELLS)
+    return np.where(valid, np.trunc(np.where(valid, values, 0)), 0).astype(np.int64), valid
+
+
+def _layer_rate(S, cells, valid):
+    """S ** (1 / (cells - 1)), inválido para cells == 1, base negativa com expoente fracionário ou estouro."""
+    valid = valid & (cells != 1)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        rate = np.power(S, 1.0 / np.where(valid, cells - 1, 1))
+    return rate, valid & np.isfinite(rate)
+
+
+def calculate_increase_rate_batch(d, n, m, dy_in_0, dy_wall_0):
+    """calculate_increase_rate sobre arrays (com broadcasting); retorna um array estruturado (RESULT_DTYPE).
+
+    Combinações inválidas não levantam exceção: ficam com valid=False, NaN nas taxas e 0 nas células.
+    """
+    d, n, m, dy_in_0, dy_wall_0 = np.broadcast_arrays(*(np.asarray(value, dtype=float)
+                                                        for value in (d, n, m, dy_in_0, dy_wall_0)))
+    delta = m * d
+    h = n * d
+    dy_in_1 = dy_wall_0
+    dy_trans_1 = h / 50
+
+    _, N_in, valid = compute_r_N_array(dy_in_0, dy_wall_0, 10 * d)
+    nozzle_cells, valid = _truncate(N_in, valid)
+    _, N_trans, valid_trans = compute_r_N_array(dy_wall_0, dy_trans_1, delta)
+    transition_cells, valid = _truncate(N_trans, valid & valid_trans)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wall_cells, valid = _truncate(delta / dy_wall_0, valid & (dy_wall_0 != 0))
+        S_in = dy_in_1 / dy_in_0
+        S_trans = dy_trans_1 / dy_wall_0
+    rate_nozzle, valid = _layer_rate(S_in, nozzle_cells, valid & (dy_in_0 != 0))
+    rate_trans, valid = _layer_rate(S_trans, transition_cells, valid)
+
+    results = np.empty(d.shape, dtype=RESULT_DTYPE)
+    for name, values in zip(INPUTS, (d, n, m, dy_in_0, dy_wall_0)):
+        results[name] = values
+    results["valid"] = valid
+    outputs = {"rate_nozzle": rate_nozzle, "rate_wall": 1.0, "rate_trans": rate_trans,
+               "nozzle_layer_cells": nozzle_cells, "transition_layer_cells": transition_cells,
+               "wall_layer_cells": wall_cells, "S_in": S_in, "S_trans": S_trans}
+    for name, values in outputs.items():
+        results[name] = np.where(valid, values, 0 if name in CELL_FIELDS else np.nan)
+    return results
+
+
+def calculate_increase_rate_grid(d, n, m, dy_in_0, dy_wall_0):
+    """Produto cartesiano das listas de valores de cada parâmetro, em uma linha por combinação."""
+    axes = [np.atleast_1d(np.asarray(values, dtype=float)) for values in (d, n, m, dy_in_0, dy_wall_0)]
+    grid = np.meshgrid(*axes, indexing="ij")
+    return calculate_increase_rate_batch(*(axis.ravel() for axis in grid))
+
+
+def parse_values(text):
+    """Valores de um parâmetro da varredura: '0.1, 0.2' (lista) ou 'início:fim:quantidade' (linspace)."""
+    text = text.strip()
+    if ":" in text:
+        start, stop, count = text.split(":")
+        return np.linspace(float(start), float(stop), int(count))
+    return np.array([float(value) for value in text.replace(";", ",").split(",") if value.strip()])
+
+
+def write_csv(results, path, only_valid=False):
+    """Grava a varredura em CSV (uma coluna por campo); retorna o número de linhas."""
+    if only_valid:
+        results = results[results["valid"]]
+    formats = ["%d" if results.dtype[name].kind in "ib" else "%.10g" for name in results.dtype.names]
+    columns = np.column_stack([results[name].astype(float) for name in results.dtype.names])
+    np.savetxt(path, columns, delimiter=",", header=",".join(results.dtype.names), comments="", fmt=formats)
+    return len(results)
@@ -0,0 +1,162 @@
+import os
+import subprocess
+
+import psutil
+
+from foam_case import common_processor_times, processor_dirs
+from run_monitor import terminate_tree
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def needs_reconstruction(case_path, time_name, fields=None):
+    """Verifica se o tempo precisa ser reconstruído.
+
+    O tempo está em dia quando cada campo (os informados ou os de processor0) existe
+    no diretório reconstruído com mtime maior ou igual ao do campo mais novo entre
+    os processor*.
+    """
+    target = os.path.join(case_path, time_name)
+    if not os.path.isdir(target):
+        return True
+    processors = processor_dirs(case_path)
+    if fields is None:
+        first = os.path.join(case_path, processors[0], time_name)
+        fields = [entry.name for entry in os.scandir(first) if entry.is_file()]
+    for field in fields:
+        reconstructed = _mtime(os.path.join(target, field))
+        if reconstructed is None:
+            return True
+        newest = max((_mtime(os.path.join(case_path, p, time_name, field)) or 0) for p in processors)
+        if newest > reconstructed:
+            return True
+    return False
+
+
+def pending_times(case_path, fields=None, latest_only=False, skip_reconstructed=True):
+    """Tempos decompostos (comuns a todos os processor*) que devem ser reconstruídos: [(tempo, nome)].
+
+    O tempo 0 fica de fora, como no reconstructPar sem -withZero.
+    """
+    times = [(value, name) for value, name in common_processor_times(case_path) if value > 0]
+    if latest_only:
+        times = times[-1:]
+    if not skip_reconstructed:
+        return times
+    return [(value, name) for value, name in times if needs_reconstruction(case_path, name, fields)]
+
+
+def time_selection(names, all_names):
+    """Monta o argumento de -time, agrupando em 'a:b' os tempos consecutivos na lista completa."""
+    index = {name: i for i, name in enumerate(all_names)}
+    parts = []
+    run = []
+    for name in names:
+        if run and index[name] != index[run[-1]] + 1:
+            parts.append(run)
+            run = []
+        run.append(name)
+    if run:
+        parts.append(run)
+    return ",".join(part[0] if len(part) == 1 else f"{part[0]}:{part[-1]}" for part in parts)
+
+
+def split_chunks(times, workers, chunks_per_worker=2):
+    """Divide os tempos em blocos contíguos; mais blocos que workers equilibra a carga."""
+    if not times:
+        return []
+    count = min(len(times), max(1, workers * chunks_per_worker))
+    size, extra = divmod(len(times), count)
+    chunks = []
+    start = 0
+    for i in range(count):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(times[start:end])
+        start = end
+    return chunks
+
+
+def core_budget(reserved=0):
+    """Núcleos físicos disponíveis para a reconstrução, descontando os reservados (simulação em curso)."""
+    cores = psutil.cpu_count(logical=False) or os.cpu_count() or 1
+    return max(1, cores - reserved)
+
+
+class ReconstructionManager:
+    """Executa vários 'reconstructPar -time ...' em paralelo, limitado a 'workers' processos.
+
+    Os processos não passam pelo QProcess da simulação: a interface consulta poll()
+    periodicamente, que também inicia o próximo bloco da fila. A saída de cada bloco
+    vai para '<caso>/log.reconstructPar.<n>'.
+    """
+
+    def __init__(self, case_path, shell_prefix="", workers=1):
+        self.case_path = case_path
+        self.shell_prefix = shell_prefix
+        self.workers = max(1, workers)
+        self.queue = []
+        self.running = []
+        self.finished = []
+        self.total = 0
+
+    def start(self, chunks, all_names, fields=None):
+        """Agenda os blocos (listas de nomes de tempo) e inicia os primeiros."""
+        self.queue = []
+        for index, names in enumerate(chunks):
+            arguments = ["reconstructPar", "-time", f"'{time_selection(names, all_names)}'"]
+            if fields:
+                arguments += ["-fields", f"'({' '.join(fields)})'"]
+            self.queue.append((index, names, " ".join(arguments)))
+        self.total = len(self.queue)
+        self.finished = []
+        self.poll()
+
+    def _launch(self, index, names, command):
+        log_path = os.path.join(self.case_path, f"log.reconstructPar.{index}")
+        log = open(log_path, "w")
+        full_command = f"{self.shell_prefix} && {command}" if self.shell_prefix else command
+        # Sessão própria: cancel() encerra também o reconstructPar iniciado pelo bash
+        process = subprocess.Popen(["bash", "-c", full_command], cwd=self.case_path,
+                                   stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+        self.running.append((index, names, command, process, log))
+
+    def poll(self):
+        """Recolhe os processos terminados e inicia novos blocos. Retorna o progresso."""
+        still_running = []
+        for index, names, command, process, log in self.running:
+            code = process.poll()
+            if code is None:
+                still_running.append((index, names, command, process, log))
+                continue
+            log.close()
+            self.finished.append({"index": index, "times": names, "command": command, "returncode": code})
+        self.running = still_running
+        while self.queue and len(self.running) < self.workers:
+            self._launch(*self.queue.pop(0))
+        return self.progress()
+
+    def progress(self):
+        return {
+            "total": self.total,
+            "done": len(self.finished),
+            "running": len(self.running),
+            "failed": [item for item in self.finished if item["returncode"] != 0],
+            "finished": not self.queue and not self.running,
+        }
+
+    def busy(self):
+        return bool(self.queue or self.running)
+
+    def cancel(self):
+        """Cancela os blocos na fila e encerra os que estão em execução."""
+        self.queue = []
+        for _, _, _, process, log in self.running:
+            terminate_tree(process.pid)
+            process.wait()
+            log.close()
+        self.running = []
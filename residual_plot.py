@@ -0,0 +1,103 @@
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtCore import Qt
+
+COLORS = ['r', 'g', 'b', 'c', 'm', 'y', 'w']
+
+# Curvas da visão "Courant / deltaT": coluna da tabela timestep, legenda e cor
+TIMESTEP_SERIES = [("courant_max", "Courant max", 'r'), ("courant_mean", "Courant mean", 'm'), ("deltaT", "deltaT", 'b')]
+
+
+class ResidualPlot:
+    """Gráfico de resíduos da interface: uma curva por campo, max(cloud:alpha), Courant/deltaT
+    e o número de parcelas num eixo Y secundário (direita).
+
+    Só desenha: as séries ficam na interface (timeData, residualData) e no FoamLogParser.
+    """
+
+    def __init__(self):
+        self.widget = pg.PlotWidget()
+        self.widget.setBackground('w')
+        self.widget.setLabel('left', 'Residuals')
+        self.widget.setLabel('bottom', 'Time')
+        self.widget.setLogMode(y=True)
+        self.widget.showGrid(x=True, y=True)
+        self.widget.addLegend()
+        self.lines = {}
+        self.timestepLines = {}
+        self.maxAlphaLine = None
+
+        # Eixo Y secundário (direita) para o número de parcelas da nuvem
+        plotItem = self.widget.getPlotItem()
+        self.parcelViewBox = pg.ViewBox()
+        plotItem.showAxis('right')
+        plotItem.getAxis('right').setLabel('Parcels')
+        plotItem.getAxis('right').setLogMode(False, False)
+        plotItem.scene().addItem(self.parcelViewBox)
+        plotItem.getAxis('right').linkToView(self.parcelViewBox)
+        self.parcelViewBox.setXLink(plotItem)
+        plotItem.vb.sigResized.connect(self.updateParcelViewBox)
+        self.parcelCurve = pg.PlotDataItem([], [], pen=pg.mkPen(color='k', width=2, style=Qt.DotLine))
+        self.parcelViewBox.addItem(self.parcelCurve)
+        plotItem.legend.addItem(self.parcelCurve, 'parcels (right axis)')
+
+    def updateParcelViewBox(self):
+        plotItem = self.widget.getPlotItem()
+        self.parcelViewBox.setGeometry(plotItem.vb.sceneBoundingRect())
+        self.parcelViewBox.linkedViewChanged(plotItem.vb, self.parcelViewBox.XAxis)
+
+    def clear(self):
+        """Remove as curvas (a das parcelas, no eixo direito, só é zerada)."""
+        self.widget.clear()
+        self.lines = {}
+        self.timestepLines = {}
+        self.maxAlphaLine = None
+
+    def clearParcels(self):
+        self.parcelCurve.setData([], [])
+
+    def setLabel(self, text):
+        self.widget.setLabel('left', text)
+
+    def isLogMode(self):
+        return self.widget.getViewBox().getState()['logMode'][1]
+
+    def setLogMode(self, logY):
+        """Aplica escala log ao eixo esquerdo mantendo linear o eixo das parcelas (direita)."""
+        self.widget.setLogMode(y=logY)
+        self.widget.getPlotItem().getAxis('right').setLogMode(False, False)
+
+    def showParcels(self, visible):
+        self.parcelCurve.setVisible(visible)
+        self.widget.getPlotItem().showAxis('right', visible)
+
+    def setParcels(self, times, parcels):
+        self.parcelCurve.setData(times, parcels)
+
+    def hasSeries(self, variable):
+        return variable in self.lines
+
+    def addSeries(self, variable, colorIndex):
+        """Cria a curva (vazia) de um campo; a cor vem da ordem em que o campo apareceu."""
+        pen = pg.mkPen(color=COLORS[colorIndex % len(COLORS)], width=2)
+        self.lines[variable] = self.widget.plot([], [], name=variable, pen=pen)
+
+    def setSeries(self, variable, times, values):
+        if variable in self.lines and len(times):
+            self.lines[variable].setData(times, values)
+
+    def setTimestep(self, table):
+        """Courant (médio e máximo) e deltaT por tempo simulado."""
+        times = table.column("time")
+        for column, name, color in TIMESTEP_SERIES:
+            if column not in self.timestepLines:
+                self.timestepLines[column] = self.widget.plot([], [], name=name, pen=pg.mkPen(color=color, width=2))
+            values = table.column(column)
+            valid = np.isfinite(values) & (values > 0)
+            self.timestepLines[column].setData(times[valid], values[valid])
+
+    def setMaxAlpha(self, times, values):
+        if self.maxAlphaLine is None:
+            pen = pg.mkPen(color='r', width=2, style=Qt.DashLine)
+            self.maxAlphaLine = self.widget.plot([], [], name='max(cloud:alpha)', pen=pen)
+        self.maxAlphaLine.setData(times, values)
@@ -0,0 +1,116 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from cloud_stats import PARCELS, cloud_series
+from metrics_store import MetricsStore
+
+# Séries disponíveis para comparação: nome -> tabelas necessárias
+SERIES_TABLES = {
+    "deltaT": ("timestep", "timing"),
+    "parcels": ("cloud", "timing"),
+    "step_time": ("timing",),
+}
+RESIDUAL_PREFIX = "residual:"
+
+_CACHE_SIZE = 64
+_cache = OrderedDict()
+
+
+def load_run_store(path, tables):
+    """Carrega só as tabelas pedidas do .npz de uma execução, com cache por (arquivo, mtime, tabelas)."""
+    key = (path, os.path.getmtime(path), tuple(sorted(tables)))
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+    store = MetricsStore.load(path, tables=set(tables))
+    _cache[key] = store
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return store
+
+
+def tables_for(series):
+    if series.startswith(RESIDUAL_PREFIX):
+        return ("solver", "timing")
+    return SERIES_TABLES[series]
+
+
+def _table(store, name):
+    return store.tables.get(name)
+
+
+def run_series(store, series):
+    """(tempos simulados, valores) de uma série: 'residual:<campo>', 'deltaT', 'parcels' ou 'step_time' (CPU por passo)."""
+    empty = (np.array([]), np.array([]))
+    if series.startswith(RESIDUAL_PREFIX):
+        table = _table(store, "solver")
+        if table is None or not len(table):
+            return empty
+        mask = (table.column("corrector") == 0) & (table.column("field") == series[len(RESIDUAL_PREFIX):])
+        return table.column("time")[mask], table.column("initial")[mask]
+    if series == "deltaT":
+        table = _table(store, "timestep")
+        return (table.column("time"), table.column("deltaT")) if table is not None else empty
+    if series == "parcels":
+        table = _table(store, "cloud")
+        return cloud_series(table, PARCELS) if table is not None and len(table) else empty
+    if series == "step_time":
+        table = _table(store, "timing")
+        if table is None or len(table) < 2:
+            return empty
+        # Tempo de CPU (ExecutionTime) do processo: o ClockTime, em segundos inteiros, não resolve um passo
+        return table.column("time")[1:], np.diff(table.column("execution_time"))
+    raise KeyError(series)
+
+
+def downsample(x, y, max_points):
+    """Reduz a série a no máximo 'max_points' pontos, mantendo o mínimo e o máximo de cada intervalo."""
+    n = len(x)
+    if max_points < 2 or n <= max_points:
+        return x, y
+    size = -(-n // (max_points // 2))
+    buckets = -(-n // size)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+    valid = ~np.isnan(padded)
+    low = np.where(valid, padded, np.inf).argmin(axis=1)
+    high = np.where(valid, padded, -np.inf).argmax(axis=1)
+    offsets = np.arange(buckets) * size
+    index = np.unique(np.concatenate([offsets + low, offsets + high]))
+    index = index[index < n]
+    return x[index], y[index]
+
+
+def to_wall_clock(store, times):
+    """Converte tempos simulados em tempo de parede (s) pela tabela de timing da execução."""
+    table = _table(store, "timing")
+    if table is None or not len(table) or not len(times):
+        return np.full(len(times), np.nan)
+    return np.interp(times, table.column("time"), table.column("clock_time"))
+
+
+def summarize_store(store):
+    """Resumo gravado no histórico: passos, tempo de parede, passos/h e resíduos finais."""
+    timing = _table(store, "timing")
+    timestep = _table(store, "timestep")
+    solver = _table(store, "solver")
+    steps = max(len(timing) if timing is not None else 0, len(timestep) if timestep is not None else 0)
+    wall = timing.last("clock_time") if timing is not None else None
+    summary = {
+        "steps": steps,
+        "wall_time": wall,
+        "steps_per_hour": steps / wall * 3600 if wall else None,
+        "end_time": timing.last("time") if timing is not None and len(timing) else None,
+        "final_residuals": {},
+    }
+    if solver is not None and len(solver):
+        mask = solver.column("corrector") == 0
+        fields = solver.column("field")[mask]
+        initial = solver.column("initial")[mask]
+        # Último valor de cada campo: índices da última ocorrência
+        names, last = np.unique(fields[::-1], return_index=True)
+        summary["final_residuals"] = {str(name): float(initial[::-1][index]) for name, index in zip(names, last)}
+    return summary
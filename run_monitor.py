@@ -0,0 +1,692 @@
+import json
+import os
+import subprocess
+import time as _time
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+import foam_case
+import foam_dict
+from cloud_stats import MAX_ALPHA, PARCELS
+from log_parser import FoamLogParser
+from watchdog import Watchdog
+
+LOG_FILE = "log.foamRun"
+STATUS_FILE = "gafoam_status.json"
+# Linhas do console mantidas para quem se conecta depois (status, interface)
+CONSOLE_TAIL = 200
+# Tabelas enviadas (reduzidas) a quem se conecta a uma execução em andamento
+SNAPSHOT_TABLES = ("solver", "timestep", "timing", "cloud")
+DEFAULT_SOLVER = "incompressibleDenseParticleFluid"
+# Intervalo de leitura do log (s) enquanto um checkpoint aguarda a escrita: com writeInterval 1
+# o solver grava um tempo completo (em todos os processor*) a cada passo até a pausa
+CHECKPOINT_POLL = 0.05
+# stopAt gravado pela parada com checkpoint (restaurado depois; se sobrar, a retomada o desfaz)
+GRACEFUL_STOP_AT = "writeNow"
+
+
+def now_string():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def run_metrics(case_path, parser):
+    """Tamanho da malha, subdomínios e custo da execução, usados pelo planejador de decomposição."""
+    # Importado aqui (como psutil abaixo): main.py importa este módulo na abertura e os adia
+    import decomposition_planner
+    processors = foam_case.processor_dirs(case_path)
+    return {
+        "cells": decomposition_planner.mesh_cell_count(case_path),
+        "subdomains": len(processors) or 1,
+        "steps": len(parser.timestepTable),
+        "clock_time": parser.timingTable.last("clock_time"),
+    }
+
+
+def solver_command(case_path, solver=DEFAULT_SOLVER, ranks=None, decompose=False):
+    """Comando do solver: mpirun quando o caso está decomposto (ou 'ranks' > 1), serial caso contrário.
+
+    Com 'decompose' o decomposePar roda antes do mpirun (caso ainda não decomposto).
+    """
+    if ranks is None:
+        ranks = len(foam_case.processor_dirs(case_path)) or foam_case.number_of_subdomains(case_path) or 1
+    if ranks > 1:
+        command = f"mpirun -np {ranks} foamRun -solver {solver} -parallel"
+        return f"decomposePar -force > log.decomposePar 2>&1 && {command}" if decompose else command
+    return f"foamRun -solver {solver}"
+
+
+def openfoam_prefix(version):
+    return f"source /opt/{version}/etc/bashrc" if version else ""
+
+
+def _tree(pid):
+    import psutil
+    parent = psutil.Process(pid)
+    return parent.children(recursive=True) + [parent]
+
+
+def suspend_tree(pid):
+    for process in _tree(pid):
+        process.suspend()
+
+
+def resume_tree(pid):
+    for process in _tree(pid):
+        process.resume()
+
+
+def terminate_tree(pid, timeout=5):
+    """SIGTERM no processo e em todos os filhos; SIGKILL nos que não encerrarem a tempo."""
+    import psutil
+    try:
+        processes = _tree(pid)
+    except psutil.NoSuchProcess:
+        return
+    for process in processes:
+        try:
+            process.terminate()
+        except psutil.NoSuchProcess:
+            pass
+    _, alive = psutil.wait_procs(processes, timeout=timeout)
+    for process in alive:
+        try:
+            process.kill()
+        except psutil.NoSuchProcess:
+            pass
+
+
+def pid_alive(pid):
+    if not pid:
+        return False
+    import psutil
+    try:
+        return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return False
+
+
+def _modifiable(control):
+    return bool(control) and str(control.get("runTimeModifiable", "yes")).lower() in ("yes", "on", "true", "1")
+
+
+class LogFollower:
+    """Lê as linhas novas de um log em crescimento (como 'tail -f'), a partir de um offset.
+
+    Linhas incompletas ficam guardadas até a próxima leitura; se o arquivo for truncado
+    ou recriado, a leitura recomeça do início.
+    """
+
+    def __init__(self, path, offset=0, chunk_size=8 * 1024 * 1024):
+        self.path = path
+        self.offset = offset
+        self.chunk_size = chunk_size
+        self.partial = b""
+
+    def read_lines(self, limit=None):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return []
+        if size < self.offset:
+            self.offset = 0
+            self.partial = b""
+        if size == self.offset:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(min(self.chunk_size, limit) if limit else self.chunk_size)
+        self.offset += len(data)
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+        return [line.decode("utf-8", "replace").rstrip("\r") for line in lines]
+
+
+class RunMonitor:
+    """Núcleo de monitoramento de uma execução, independente da interface.
+
+    Recebe as linhas do log, alimenta o FoamLogParser e o watchdog e mantém o estado
+    resumido (últimos resíduos, parcelas, alertas e o final do console). A interface
+    gráfica e o CLI (gafoam) são apenas clientes: cada um decide como executar as ações.
+    """
+
+    def __init__(self, case_path=None, parser=None, watchdog=None, tail=CONSOLE_TAIL):
+        self.case_path = case_path
+        self.parser = parser if parser is not None else FoamLogParser()
+        self.watchdog = watchdog if watchdog is not None else Watchdog()
+        self.console = deque(maxlen=tail)
+        # Funções chamadas com (linha, eventos) a cada linha lida (ex.: API de monitoramento)
+        self.listeners = []
+        self.reset()
+
+    def reset(self):
+        self.parser.reset()
+        self.watchdog.reset()
+        self.console.clear()
+        self.lines = 0
+        self.residuals = {}
+        self.alerts = []
+        self.last_step = {}
+        self.cloud = {}
+        self.ended = False
+
+    def feed(self, line):
+        """Processa uma linha do log. Retorna (eventos, disparos do watchdog)."""
+        line = line.strip()
+        self.console.append(line)
+        self.lines += 1
+        if line == "End":
+            self.ended = True
+        events = self.parser.feed(line)
+        triggers = []
+        for event in events:
+            triggers.extend(self.watchdog.observe(event))
+            if event["type"] == "residual" and event["corrector"] == 0:
+                self.residuals[event["field"]] = event["initial"]
+            elif event["type"] == "timestep":
+                self.last_step = event
+            elif event["type"] == "cloud":
+                self.cloud.update(event["values"])
+            elif event["type"] == "alert":
+                self.alerts.append(event)
+        if self.listeners:
+            published = events + [dict(trigger, type="watchdog") for trigger in triggers]
+            for listener in self.listeners:
+                listener(line, published)
+        return events, triggers
+
+    def tick(self):
+        """Disparos periódicos do watchdog (regras de estagnação)."""
+        return self.watchdog.tick()
+
+    def metrics(self):
+        return run_metrics(self.case_path, self.parser)
+
+    def snapshot(self):
+        """Estado resumido da execução, serializável em JSON."""
+        parser = self.parser
+        return {
+            "time": parser.current_time,
+            "steps": len(parser.timestepTable),
+            "deltaT": self.last_step.get("deltaT"),
+            "courant_max": self.last_step.get("courant_max"),
+            "execution_time": parser.timingTable.last("execution_time"),
+            "clock_time": parser.timingTable.last("clock_time"),
+            "residuals": dict(self.residuals),
+            "parcels": self.cloud.get(PARCELS),
+            "max_alpha": self.cloud.get(MAX_ALPHA),
+            "alerts": [{"time": a["time"], "message": a["message"]} for a in self.alerts[-10:]],
+            "watchdog": list(self.watchdog.triggers),
+            "lines": self.lines,
+        }
+
+    def record_completion(self, history, solver, start_time, status, end_time=None, case_path=None):
+        """Registra a execução no histórico (com as métricas e as séries completas)."""
+        history.add_entry(
+            solver=solver,
+            case_path=case_path or self.case_path,
+            start_time=start_time,
+            end_time=end_time or now_string(),
+            status=status,
+            watchdog_events=self.watchdog.triggers,
+            metrics=self.metrics(),
+            store=self.parser.store
+        )
+
+
+def compact_tables(store, max_steps=2000):
+    """Cópia reduzida das tabelas do parser: no máximo 'max_steps' passos (o último sempre incluído).
+
+    Do solver só entra o primeiro corretor. Retorna {tabela: {coluna: lista}}, pronto para JSON
+    e para restore_tables().
+    """
+    compact = {}
+    timestep = store.tables.get("timestep")
+    if timestep is None or not len(timestep):
+        return compact
+    steps = timestep.column("time")
+    stride = max(1, -(-len(steps) // max_steps))
+    kept = np.union1d(steps[::stride], steps[-1:])
+    for name in SNAPSHOT_TABLES:
+        table = store.tables.get(name)
+        if table is None or not len(table):
+            continue
+        mask = np.isin(table.column("time"), kept)
+        if name == "solver":
+            mask &= table.column("corrector") == 0
+        index = np.flatnonzero(mask)
+        columns = {}
+        for column, typecode in table.columns.items():
+            values = table.data[column]
+            # Colunas de texto ficam em listas: só as linhas escolhidas são copiadas
+            columns[column] = table.column(column)[index].tolist() if typecode else [values[i] for i in index]
+        compact[name] = columns
+    return compact
+
+
+def restore_tables(store, compact):
+    """Acrescenta ao MetricsStore as tabelas de compact_tables() (tabelas já criadas pelo parser)."""
+    for name, columns in compact.items():
+        if name not in store.tables:
+            continue
+        table = store.tables[name]
+        for column, typecode in table.columns.items():
+            values = columns.get(column, [])
+            if typecode == 'd':
+                values = [float('nan') if value is None else value for value in values]
+            table.data[column].extend(values)
+
+
+def parse_log(log_path):
+    """Lê um log completo e retorna o RunMonitor com as séries (sem watchdog)."""
+    monitor = RunMonitor(os.path.dirname(os.path.abspath(log_path)), watchdog=Watchdog(enabled=False))
+    follower = LogFollower(log_path)
+    lines = follower.read_lines()
+    while lines:
+        for line in lines:
+            monitor.feed(line)
+        lines = follower.read_lines()
+    if follower.partial:
+        monitor.feed(follower.partial.decode("utf-8", "replace"))
+    return monitor
+
+
+class RunControl:
+    """Parada com checkpoint e checkpoint com pausa pelo controlDict (runTimeModifiable).
+
+    Compartilhado pelo RunJob e pela interface: os métodos alteram e restauram o controlDict
+    e dizem a quem os chama quando pausar ou encerrar o solver à força; os sinais ficam
+    com quem chama. check_stop() e check_checkpoint() devem ser chamados periodicamente;
+    os eventos do log vão para observe() e, quando ele retorna True, check_checkpoint() é
+    chamado de novo, para pausar logo após a escrita.
+    """
+
+    def __init__(self, case_path, note=print, stop_timeout=300, checkpoint_timeout=600):
+        self.case_path = os.path.abspath(case_path)
+        self.note = note
+        self.stop_timeout = stop_timeout
+        self.checkpoint_timeout = checkpoint_timeout
+        # Parada pedida (writeNow ou forçada): define o status registrado no histórico
+        self.stop_requested = False
+        # (valores anteriores do controlDict, último tempo antes do pedido, início)
+        self.pending_stop = None
+        self.pending_checkpoint = None
+        self.stop_written = False
+        # Maiores tempos vistos no log: 'Time =', ExecutionTime e resíduos (ver checkpoint_complete)
+        self.log_times = {}
+
+    @property
+    def control_path(self):
+        return os.path.join(self.case_path, "system", "controlDict")
+
+    def _restore(self, restore):
+        try:
+            foam_dict.set_entries(self.control_path, {k: v for k, v in restore.items() if v is not None})
+        except OSError as e:
+            self.note(f"Erro ao restaurar o controlDict: {e}")
+
+    def _request(self, entries):
+        """Altera o controlDict; None se runTimeModifiable estiver desativado ou a escrita falhar."""
+        try:
+            if not _modifiable(foam_dict.read(self.control_path)):
+                return None
+            restore = foam_dict.set_entries(self.control_path, entries)
+        except OSError as e:
+            self.note(f"Erro ao alterar o controlDict: {e}")
+            return None
+        return restore, self.written_time(), _time.monotonic()
+
+    def written_time(self):
+        """Último tempo escrito: em casos decompostos, o último presente em todos os processor*."""
+        if foam_case.processor_dirs(self.case_path):
+            common = foam_case.common_processor_times(self.case_path)
+            return common[-1][0] if common else None
+        return foam_case.latest_time(self.case_path)
+
+    def observe(self, events):
+        """Registra os tempos dos eventos do parser (usados para saber se a escrita terminou).
+
+        Retorna True se há um checkpoint pendente que esses eventos podem ter confirmado.
+        """
+        progress = False
+        for event in events:
+            if event["type"] in ("time", "timing", "residual") and event.get("time") is not None:
+                self.log_times[event["type"]] = max(self.log_times.get(event["type"], event["time"]), event["time"])
+                progress = True
+        return progress and self.pending_checkpoint is not None
+
+    def checkpoint_complete(self, time):
+        """O diretório do tempo aparece no início da escrita; só o log diz que ela terminou.
+
+        Serial: o ExecutionTime desse tempo (impresso após a escrita) ou o 'Time =' seguinte.
+        Decomposto: um resíduo de um tempo posterior, pois a redução global do solver só
+        acontece depois que todos os ranks terminaram de escrever.
+        """
+        logged = self.log_times
+        if foam_case.processor_dirs(self.case_path):
+            return logged.get("residual", time) > time
+        return logged.get("timing", time - 1) >= time or logged.get("time", time) > time
+
+    def request_stop(self):
+        """stopAt writeNow. Retorna False se o solver precisa ser encerrado à força."""
+        self.stop_requested = True
+        self.pending_stop = self._request({"stopAt": GRACEFUL_STOP_AT})
+        if self.pending_stop is None:
+            self.note("runTimeModifiable desativado ou controlDict ausente: parada forçada.")
+            return False
+        self.stop_written = False
+        self.note("Parando a simulação: stopAt writeNow solicitado, aguardando a escrita do último tempo...")
+        return True
+
+    def check_stop(self, running):
+        """None enquanto aguarda; 'stopped' se o solver encerrou, 'timeout' se deve ser encerrado à força.
+
+        Nos dois casos o stopAt original volta ao controlDict.
+        """
+        if self.pending_stop is None:
+            return None
+        restore, baseline, started = self.pending_stop
+        latest = foam_case.latest_time(self.case_path)
+        if not self.stop_written and latest is not None and (baseline is None or latest > baseline):
+            self.stop_written = True
+            self.note(f"Último tempo escrito: {latest}.")
+        if running and _time.monotonic() - started < self.stop_timeout:
+            return None
+        self._restore(restore)
+        self.pending_stop = None
+        if running:
+            self.note(f"O solver não encerrou em {self.stop_timeout} s: enviando SIGTERM/SIGKILL.")
+            return "timeout"
+        return "stopped"
+
+    def request_checkpoint(self):
+        """Força a escrita de um tempo (writeControl timeStep). Retorna False se é preciso pausar já, sem checkpoint.
+
+        stopAt writeNow encerraria o solver; writeControl/writeInterval são restaurados depois da escrita.
+        """
+        if self.pending_checkpoint is not None:
+            return True
+        self.log_times = {}
+        self.pending_checkpoint = self._request({"writeControl": "timeStep", "writeInterval": 1})
+        if self.pending_checkpoint is None:
+            self.note("runTimeModifiable desativado: pausando sem checkpoint.")
+            return False
+        self.note("Checkpoint solicitado; aguardando a escrita do próximo tempo...")
+        return True
+
+    def check_checkpoint(self, pause):
+        """Se o tempo foi escrito por completo (ou o prazo acabou), chama pause() e só então restaura o controlDict.
+
+        O tempo precisa existir em todos os processor* (casos decompostos) e o log precisa
+        mostrar que a escrita terminou (checkpoint_complete): pausar no meio da escrita
+        deixaria o checkpoint truncado. Pausar antes de restaurar evita que o solver grave
+        mais tempos enquanto o arquivo é reescrito. Retorna True se pausou.
+        """
+        if self.pending_checkpoint is None:
+            return False
+        restore, baseline, started = self.pending_checkpoint
+        latest = self.written_time()
+        written = (latest is not None and (baseline is None or latest > baseline)
+                   and self.checkpoint_complete(latest))
+        if not written and _time.monotonic() - started < self.checkpoint_timeout:
+            return False
+        pause()
+        self._restore(restore)
+        self.pending_checkpoint = None
+        self.note(f"Checkpoint escrito em t = {latest}." if written else "Checkpoint não apareceu a tempo.")
+        return True
+
+
+class RunJob:
+    """Execução acompanhada sem interface gráfica.
+
+    Inicia o solver (ou adota um já em execução, pelo pid ou apenas pelo log), segue o
+    log do caso e aplica as ações do watchdog. Como o ScalingStudy, é conduzida por
+    poll(). O solver roda em uma sessão própria com a saída no log do caso: encerrar
+    o monitor (ou a interface) não encerra a simulação.
+    """
+
+    def __init__(self, case_path, command=None, solver=DEFAULT_SOLVER, pid=None, log_name=LOG_FILE,
+                 history=None, shell_prefix="", watchdog=True, from_start=True, offset=None, start_time=None,
+                 stop_timeout=300, status_interval=2.0):
+        self.case_path = os.path.abspath(case_path)
+        self.command = command
+        self.solver = solver
+        self.pid = pid
+        self.log_path = os.path.join(self.case_path, log_name)
+        self.history = history
+        self.shell_prefix = shell_prefix
+        self.use_watchdog = watchdog
+        self.from_start = from_start
+        # Posição do log onde a execução começa (readoção pelo daemon continua do mesmo ponto)
+        self.offset = offset
+        self.status_interval = status_interval
+        self.process = None
+        self.log = None
+        self.monitor = RunMonitor(self.case_path)
+        self.follower = None
+        self.state = "new"
+        self.messages = deque(maxlen=50)
+        self.note_count = 0
+        self.start_time = start_time
+        self.end_time = None
+        self.control = RunControl(self.case_path, self.note, stop_timeout)
+        self.last_status = 0.0
+        self.behind = False
+
+    def note(self, message):
+        self.messages.append(f"[{now_string()}] {message}")
+        self.note_count += 1
+
+    def start(self):
+        try:
+            self.monitor.watchdog = Watchdog.load(self.case_path)
+        except (ValueError, KeyError, TypeError) as e:
+            self.note(f"Erro no watchdog.json, usando regras padrão: {e}")
+        self.monitor.watchdog.enabled = self.monitor.watchdog.enabled and self.use_watchdog
+        self.start_time = self.start_time or now_string()
+        if self.command:
+            offset = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+            full_command = f"{self.shell_prefix} && {self.command}" if self.shell_prefix else self.command
+            self.log = open(self.log_path, "ab")
+            self.process = subprocess.Popen(["bash", "-c", full_command], cwd=self.case_path, stdout=self.log,
+                                            stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                                            start_new_session=True)
+            self.pid = self.process.pid
+            self.note(f"Comando executado: {self.command} (pid {self.pid})")
+        else:
+            offset = 0 if self.from_start or not os.path.exists(self.log_path) else os.path.getsize(self.log_path)
+            self.note(f"Acompanhando {self.log_path}" + (f" (pid {self.pid})" if self.pid else ""))
+        if self.offset is None:
+            self.offset = offset
+        self.follower = LogFollower(self.log_path, self.offset)
+        self.state = "running"
+        self.write_status(force=True)
+
+    def alive(self):
+        if self.process is not None:
+            return self.process.poll() is None
+        if self.pid:
+            return pid_alive(self.pid)
+        # Sem pid: a execução termina com o 'End' do solver
+        return not self.monitor.ended
+
+    def read_log(self, max_bytes=None):
+        """Processa as linhas novas do log. Com 'max_bytes', lê no máximo esse volume e marca
+        'behind' se ainda restar conteúdo (o daemon continua no próximo ciclo)."""
+        events = []
+        start = self.follower.offset
+        self.behind = False
+        while True:
+            remaining = None
+            if max_bytes is not None:
+                remaining = max_bytes - (self.follower.offset - start)
+                if remaining <= 0:
+                    self.behind = True
+                    return events
+            lines = self.follower.read_lines(remaining)
+            if not lines:
+                return events
+            for line in lines:
+                found, triggers = self.monitor.feed(line)
+                events.extend(found)
+                if self.control.observe(found):
+                    self.control.check_checkpoint(self.pause)
+                for trigger in triggers:
+                    self.handle_trigger(trigger)
+
+    def poll(self, max_bytes=None):
+        """Lê o log, aplica o watchdog e detecta o fim da execução. Retorna o estado atual."""
+        if self.state not in ("running", "paused", "stopping"):
+            return self.status()
+        self.read_log(max_bytes)
+        if self.behind:
+            # Ainda lendo um log longo (adoção de uma execução em andamento)
+            self.write_status()
+            return self.status()
+        if self.state == "running":
+            for trigger in self.monitor.tick():
+                self.handle_trigger(trigger)
+        self.control.check_checkpoint(self.pause)
+        if self.control.check_stop(self.alive()) == "timeout":
+            self.force_stop()
+        if not self.alive():
+            self.read_log()
+            self.finish()
+        self.write_status()
+        return self.status()
+
+    def handle_trigger(self, trigger):
+        self.note(f"Watchdog [{trigger['rule']}] (t = {trigger['time']}): {trigger['message']} → {trigger['action']}")
+        if trigger["action"] == "checkpoint_pause":
+            self.request_checkpoint()
+        elif trigger["action"] == "stop":
+            self.request_stop()
+
+    def request_stop(self):
+        """Parada com checkpoint: stopAt writeNow e, após o tempo limite, SIGTERM/SIGKILL."""
+        if self.control.stop_requested or not self.alive():
+            return
+        if self.state == "paused":
+            self.resume()
+        if not self.pid:
+            self.control.stop_requested = True
+            self.note("Pid desconhecido: parada forçada.")
+        elif self.control.request_stop():
+            self.state = "stopping"
+            return
+        self.force_stop()
+
+    def force_stop(self):
+        if self.pid:
+            terminate_tree(self.pid)
+
+    def request_checkpoint(self):
+        """Força a escrita de um tempo e pausa o solver assim que ele aparecer."""
+        if self.state != "running" or not self.pid:
+            return
+        if not self.control.request_checkpoint():
+            self.pause()
+
+    def pause(self):
+        if self.pid and self.alive():
+            suspend_tree(self.pid)
+            self.state = "paused"
+            self.note("Simulação pausada.")
+            self.write_status(force=True)
+
+    def resume(self):
+        if self.pid and self.state == "paused":
+            resume_tree(self.pid)
+            self.state = "running"
+            self.note("Simulação retomada.")
+            self.write_status(force=True)
+
+    def finish(self):
+        code = self.process.returncode if self.process is not None else None
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+        if self.control.stop_requested:
+            status = "Stopped (writeNow)"
+        elif code is None:
+            status = "Finished" if self.monitor.ended else "Interrupted"
+        else:
+            status = "Finished" if code == 0 else "Interrupted"
+        self.state = "finished" if status == "Finished" else "stopped"
+        self.end_time = now_string()
+        self.note(f"Simulation {status}.")
+        if self.history is not None:
+            self.monitor.record_completion(self.history, self.solver, self.start_time, status, self.end_time)
+        self.write_status(force=True)
+
+    def poll_delay(self, interval):
+        """Espera até o próximo poll(): nenhuma com o log atrasado, curta com um checkpoint pendente."""
+        if self.behind:
+            return 0
+        if self.control.pending_checkpoint is not None:
+            return min(interval, CHECKPOINT_POLL)
+        return interval
+
+    def fail(self, error):
+        """Encerra o acompanhamento por um erro do monitor (não do solver, que continua se estiver vivo)."""
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+        self.state = "failed"
+        self.end_time = now_string()
+        self.note(f"Erro no acompanhamento: {error}" + (f" (o solver, pid {self.pid}, não foi encerrado)"
+                                                        if self.pid and self.alive() else ""))
+        try:
+            if self.history is not None:
+                self.monitor.record_completion(self.history, self.solver, self.start_time or self.end_time,
+                                               "Failed", self.end_time)
+            self.write_status(force=True)
+        except (OSError, ValueError, TypeError) as e:
+            self.note(f"Erro ao registrar a falha: {e}")
+
+    def busy(self):
+        return self.state in ("running", "paused", "stopping")
+
+    def status(self):
+        status = {
+            "case": self.case_path,
+            "state": self.state,
+            "pid": self.pid,
+            "monitor_pid": os.getpid(),
+            "solver": self.solver,
+            "command": self.command,
+            "log": self.log_path,
+            "log_offset": self.offset,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "updated": now_string(),
+            "messages": list(self.messages),
+        }
+        status.update(self.monitor.snapshot())
+        return status
+
+    def write_status(self, force=False):
+        """Grava <caso>/gafoam_status.json (no máximo a cada 'status_interval' segundos)."""
+        now = _time.monotonic()
+        if not force and now - self.last_status < self.status_interval:
+            return
+        self.last_status = now
+        path = os.path.join(self.case_path, STATUS_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.status(), f, indent=4)
+        os.replace(path + ".tmp", path)
+
+
+def read_status(case_path):
+    """Último estado gravado por um RunJob para o caso (None se não houver)."""
+    path = os.path.join(case_path, STATUS_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        status = json.load(f)
+    # O monitor pode ter sido encerrado sem atualizar o arquivo
+    if status.get("state") in ("running", "paused", "stopping") and not pid_alive(status.get("monitor_pid")):
+        status["monitor_alive"] = False
+    return status
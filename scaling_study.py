@@ -0,0 +1,276 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+from datetime import datetime
+
+import decomposition_planner
+import foam_dict
+from log_parser import DELTA_T_RE, FoamLogParser
+from run_monitor import terminate_tree
+
+SCALING_FILE = "scaling.json"
+SCALING_DIR = "scaling"
+# Passos iniciais descartados (inicialização, injeção das primeiras parcelas)
+WARMUP_FRACTION = 0.2
+# Intervalo mínimo de ClockTime (s) para usá-lo: ClockTime tem resolução de 1 s
+MIN_CLOCK_SPAN = 5
+# Final do log do caso lido para achar o último deltaT (passo de produção)
+LOG_TAIL_BYTES = 4 * 1024 * 1024
+
+STUB_SOLVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub_solver.py")
+
+
+def rank_counts(max_ranks):
+    """1, 2, 4, ... até max_ranks (incluído mesmo que não seja potência de 2)."""
+    counts = []
+    n = 1
+    while n < max_ranks:
+        counts.append(n)
+        n *= 2
+    counts.append(max(1, max_ranks))
+    return counts
+
+
+def solver_command(ranks, solver):
+    if ranks == 1:
+        return f"foamRun -solver {solver}"
+    return (f"decomposePar -force > log.decomposePar 2>&1 && "
+            f"mpirun -np {ranks} foamRun -solver {solver} -parallel")
+
+
+def stub_command(ranks, solver):
+    """Solver sintético (stub_solver.py): permite testar o estudo sem OpenFOAM."""
+    return f"{sys.executable} {STUB_SOLVER} --ranks {ranks}"
+
+
+def _link_or_copy(source, target):
+    # Hardlinks evitam duplicar a malha em cada configuração
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def benchmark_delta_t(case_path):
+    """(deltaT, origem) dos passos fixos do estudo.
+
+    Com adjustTimeStep (maxCo) o deltaT do controlDict é só o inicial e pode estar longe do
+    passo de produção; por isso vale o último deltaT do log.foamRun do caso, se houver.
+    """
+    log_path = os.path.join(case_path, "log.foamRun")
+    if os.path.exists(log_path):
+        with open(log_path, "rb") as f:
+            f.seek(max(0, os.path.getsize(log_path) - LOG_TAIL_BYTES))
+            tail = f.read().decode("utf-8", "replace")
+        for line in reversed(tail.splitlines()):
+            match = DELTA_T_RE.match(line.strip())
+            if match:
+                return float(match.group(1)), "log"
+    control = foam_dict.read(os.path.join(case_path, "system", "controlDict"))
+    return float(control.get("deltaT", 1)), "controlDict"
+
+
+def prepare_run(case_path, ranks, steps, delta_t=None):
+    """Cria '<caso>/scaling/np<N>' com 0, constant e system e um controlDict de passos fixos.
+
+    'delta_t' é o passo fixo (padrão: o deltaT do controlDict).
+    """
+    run_path = os.path.join(case_path, SCALING_DIR, f"np{ranks}")
+    shutil.rmtree(run_path, ignore_errors=True)
+    os.makedirs(run_path)
+    for name in ("0", "constant", "system"):
+        source = os.path.join(case_path, name)
+        if os.path.isdir(source):
+            shutil.copytree(source, os.path.join(run_path, name), copy_function=_link_or_copy)
+
+    control_path = os.path.join(run_path, "system", "controlDict")
+    # O controlDict é reescrito: sem isso a edição alteraria o arquivo original pelo hardlink
+    with open(control_path, "r") as f:
+        text = f.read()
+    os.remove(control_path)
+    with open(control_path, "w") as f:
+        f.write(text)
+    if delta_t is None:
+        delta_t = float(foam_dict.read(control_path).get("deltaT", 1))
+    foam_dict.set_entries(control_path, {
+        "startFrom": "startTime",
+        "startTime": 0,
+        "stopAt": "endTime",
+        "endTime": f"{steps * delta_t:.12g}",
+        "deltaT": f"{delta_t:.12g}",
+        "adjustTimeStep": "no",
+        "writeControl": "timeStep",
+        "writeInterval": steps + 1,
+    })
+
+    if ranks > 1:
+        decompose_path = os.path.join(run_path, "system", "decomposeParDict")
+        if os.path.exists(decompose_path):
+            os.remove(decompose_path)
+        method, coeffs, _ = decomposition_planner.recommend_method(case_path, ranks)
+        decomposition_planner.write_decompose_dict(run_path, ranks, method, coeffs)
+    return run_path
+
+
+def seconds_per_step(log_path):
+    """Tempo de parede médio por passo após o aquecimento, a partir de ClockTime.
+
+    ExecutionTime é o tempo de CPU do rank 0: ranks MPI que bloqueiam em vez de esperar
+    ativamente o deixam menor que o de parede e inflariam o speedup. Só é usado quando o
+    intervalo de ClockTime é curto demais (menos de MIN_CLOCK_SPAN s) para a sua resolução.
+    """
+    parser = FoamLogParser()
+    with open(log_path, "r", errors="replace") as f:
+        for line in f:
+            parser.feed(line.strip())
+    execution = parser.timingTable.column("execution_time")
+    clock = parser.timingTable.column("clock_time")
+    if len(execution) < 3:
+        return None, len(execution)
+    start = max(1, int(len(execution) * WARMUP_FRACTION))
+    steps = len(execution) - 1 - start
+    if steps <= 0:
+        start, steps = 0, len(execution) - 1
+    elapsed = clock[-1] - clock[start]
+    if elapsed < MIN_CLOCK_SPAN:
+        cpu = execution[-1] - execution[start]
+        elapsed = cpu if cpu > 0 else elapsed
+    if elapsed <= 0:
+        return None, len(execution)
+    return elapsed / steps, len(execution)
+
+
+def summarize(results):
+    """Acrescenta speedup e eficiência em relação à configuração com menos ranks."""
+    valid = [r for r in results if r.get("seconds_per_step")]
+    if not valid:
+        return results
+    base = min(valid, key=lambda r: r["ranks"])
+    for r in results:
+        if r.get("seconds_per_step"):
+            r["speedup"] = base["seconds_per_step"] / r["seconds_per_step"]
+            r["efficiency"] = r["speedup"] / (r["ranks"] / base["ranks"])
+        else:
+            r["speedup"] = None
+            r["efficiency"] = None
+    return results
+
+
+def save_results(case_path, study):
+    with open(os.path.join(case_path, SCALING_FILE), "w") as f:
+        json.dump(study, f, indent=4)
+
+
+def load_results(case_path):
+    """Resultados do último estudo de escalabilidade do caso (None se não houver)."""
+    path = os.path.join(case_path, SCALING_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def measured_throughput(study):
+    """[(ranks, células x passos / s, eficiência)] no formato do planejador de decomposição."""
+    if not study:
+        return []
+    cells = study.get("cells") or 1
+    return [(r["ranks"], cells / r["seconds_per_step"], r["efficiency"])
+            for r in study.get("results", []) if r.get("seconds_per_step")]
+
+
+class ScalingStudy:
+    """Executa o caso com poucos passos em 1, 2, 4, ... N ranks, uma configuração por vez.
+
+    Como o ReconstructionManager, é conduzido por poll(): cada chamada verifica o
+    processo atual e inicia a próxima configuração. Ao final os resultados são
+    gravados em '<caso>/scaling.json'.
+    """
+
+    def __init__(self, case_path, ranks, steps=50, solver="incompressibleDenseParticleFluid",
+                 shell_prefix="", command=solver_command):
+        self.case_path = case_path
+        self.ranks = list(ranks)
+        self.steps = steps
+        self.solver = solver
+        self.shell_prefix = shell_prefix
+        self.command = command
+        self.queue = list(self.ranks)
+        self.delta_t, self.delta_t_source = benchmark_delta_t(case_path)
+        self.current = None
+        self.results = []
+        self.saved = False
+
+    def start(self):
+        self.poll()
+
+    def _launch(self, ranks):
+        run_path = prepare_run(self.case_path, ranks, self.steps, self.delta_t)
+        command = self.command(ranks, self.solver)
+        full_command = f"{self.shell_prefix} && {command}" if self.shell_prefix else command
+        log = open(os.path.join(run_path, "log.foamRun"), "w")
+        # Sessão própria: cancel() encerra a árvore inteira (bash, mpirun e os ranks)
+        process = subprocess.Popen(["bash", "-c", full_command], cwd=run_path,
+                                   stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+        self.current = (ranks, run_path, process, log, datetime.now())
+
+    def _collect(self):
+        ranks, run_path, process, log, started = self.current
+        log.close()
+        wall = (datetime.now() - started).total_seconds()
+        per_step, steps = seconds_per_step(os.path.join(run_path, "log.foamRun"))
+        self.results.append({
+            "ranks": ranks,
+            "returncode": process.returncode,
+            "seconds_per_step": per_step,
+            "steps": steps,
+            "wall_time": wall,
+        })
+        self.current = None
+
+    def poll(self):
+        """Recolhe a configuração terminada e inicia a próxima. Retorna o progresso."""
+        if self.current is not None and self.current[2].poll() is not None:
+            self._collect()
+        if self.current is None and self.queue:
+            self._launch(self.queue.pop(0))
+        if self.current is None and not self.queue and not self.saved:
+            self.save()
+        return self.progress()
+
+    def save(self):
+        summarize(self.results)
+        save_results(self.case_path, {
+            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "solver": self.solver,
+            "steps": self.steps,
+            "deltaT": self.delta_t,
+            "deltaT_source": self.delta_t_source,
+            "cells": decomposition_planner.mesh_cell_count(self.case_path),
+            "results": self.results,
+        })
+        self.saved = True
+
+    def progress(self):
+        return {
+            "total": len(self.ranks),
+            "done": len(self.results),
+            "running": self.current[0] if self.current else None,
+            "finished": self.current is None and not self.queue,
+        }
+
+    def busy(self):
+        return self.current is not None or bool(self.queue)
+
+    def cancel(self):
+        self.queue = []
+        if self.current is not None:
+            process = self.current[2]
+            terminate_tree(process.pid)
+            process.wait()
+            self.current[3].close()
+            self.current = None
+        # Estudo cancelado: os resultados parciais não substituem o scaling.json anterior
+        self.saved = True
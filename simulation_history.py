@@ -1,9 +1,15 @@
 import json
 import os
+from datetime import datetime
+
+from cloud_stats import parse_cloud_block
+from parametric_study import read_parameters
 
 class SimulationHistory:
-    def __init__(self, history_file="simulation_history.json"):
+    def __init__(self, history_file="simulation_history.json", runs_dir=None):
         self.history_file = history_file
+        # Séries completas de cada execução (MetricsStore em .npz), lidas sob demanda
+        self.runs_dir = runs_dir or os.path.join(os.path.dirname(os.path.abspath(history_file)), "runs")
         self.history = self.load_history()
 
     def load_history(self):
@@ -14,7 +20,7 @@ class SimulationHistory:
 
     def extract_relevant_log_data(self, log_path):
         """Extrai o último bloco 'Solving 2-D cloud cloud\nCloud: cloud' do log.foamRun."""
-        if not os.path.exists(log_path):
+        if not os.path.isfile(log_path):
             return []
         with open(log_path, "r") as f:
             lines = f.readlines()
@@ -34,7 +40,8 @@ class SimulationHistory:
             return bloco
         return []
 
-    def add_entry(self, solver, case_path, start_time, end_time, status, notes=""):
+    def add_entry(self, solver, case_path, start_time, end_time, status, notes="", watchdog_events=None, metrics=None,
+                  store=None):
         log_path = os.path.join(case_path, "log.foamRun")
         log_data = self.extract_relevant_log_data(log_path)
         entry = {
@@ -44,15 +51,82 @@ class SimulationHistory:
             "end_time": end_time,
             "status": status,
             "notes": notes,
-            "log_data": log_data
+            "log_data": log_data,
+            "cloud_stats": parse_cloud_block(log_data),
+            "watchdog_events": watchdog_events or [],
+            "metrics": metrics or {}
         }
+        if store is not None:
+            # Importado aqui: a interface carrega este módulo na abertura e run_comparison só depois
+            from run_comparison import summarize_store
+            entry["metrics_file"] = self.save_run_store(store)
+            entry["summary"] = summarize_store(store)
+        # O daemon do gafoam também grava no arquivo: relê antes de acrescentar
+        self.reload()
         self.history.append(entry)
         self.save_history()
 
+    def save_run_store(self, store):
+        """Grava as séries da execução em runs/<data>.npz e retorna o nome do arquivo."""
+        name = datetime.now().strftime("%Y%m%d-%H%M%S-%f") + ".npz"
+        store.save(os.path.join(self.runs_dir, name))
+        return name
+
+    def metrics_path(self, entry):
+        """Caminho do .npz da execução (None para entradas antigas, sem séries gravadas)."""
+        name = entry.get("metrics_file")
+        if not name:
+            return None
+        path = os.path.join(self.runs_dir, name)
+        return path if os.path.exists(path) else None
+
+    @staticmethod
+    def entry_key(entry):
+        """Identifica a execução pelo caso, início e arquivo de séries (a posição muda quando o daemon grava)."""
+        return entry.get("case_path"), entry.get("start_time"), entry.get("metrics_file")
+
+    def remove_entry(self, entry):
+        """Remove a execução (e o seu .npz) do arquivo relido. Retorna False se ela não estiver mais lá."""
+        key = self.entry_key(entry)
+        # Como em add_entry: relê antes de alterar para não apagar o que o daemon gravou
+        self.reload()
+        for index, current in enumerate(self.history):
+            if self.entry_key(current) == key:
+                break
+        else:
+            return False
+        path = self.metrics_path(current)
+        if path:
+            os.remove(path)
+        del self.history[index]
+        self.save_history()
+        return True
+
+    def clear(self, entries=None):
+        """Remove as execuções indicadas (todas, se None) do arquivo relido.
+
+        As gravadas pelo daemon depois que a lista foi exibida continuam no histórico.
+        """
+        keys = None if entries is None else {self.entry_key(entry) for entry in entries}
+        self.reload()
+        kept = []
+        for entry in self.history:
+            if keys is not None and self.entry_key(entry) not in keys:
+                kept.append(entry)
+                continue
+            path = self.metrics_path(entry)
+            if path:
+                os.remove(path)
+        self.history = kept
+        self.save_history()
+
     def save_history(self):
         with open(self.history_file, "w") as file:
             json.dump(self.history, file, indent=4)
 
+    def reload(self):
+        self.history = self.load_history()
+
     def get_history(self):
         return self.history
     
@@ -74,7 +148,10 @@ class SimulationHistory:
         return params
 
     def get_ml_dataset(self):
-        """Monta um dataset com parâmetros do cloudProperties e resultados do log para cada simulação."""
+        """Monta um dataset com parâmetros do cloudProperties e resultados do log para cada simulação.
+
+        Casos gerados por um estudo paramétrico trazem também os parâmetros variados ('arquivo:chave').
+        """
         import re
         dataset = []
         for entry in self.history:
@@ -91,6 +168,6 @@ class SimulationHistory:
                 m2 = re.search(r"Linear kinetic energy\s*=\s*([0-9.eE+-]+)", line)
                 if m2:
                     kinetic_energy = float(m2.group(1))
-            row = {**params, "max_cell_volume_fraction": max_cell_vol, "kinetic_energy": kinetic_energy}
+            row = {**params, **read_parameters(case_path), "max_cell_volume_fraction": max_cell_vol, "kinetic_energy": kinetic_energy}
             dataset.append(row)
         return dataset
@@ -0,0 +1,205 @@
+from PyQt5.QtCore import QObject, QProcess, QProcessEnvironment, QTimer, pyqtSignal
+
+from run_monitor import RunControl, resume_tree, suspend_tree, terminate_tree
+
+# Intervalos (ms) de verificação da parada com checkpoint e do checkpoint com pausa
+STOP_POLL_MS = 1000
+CHECKPOINT_POLL_MS = 2000
+
+
+def openfoam_environment(version):
+    """Ambiente do sistema com FOAM_RUN e as bibliotecas da versão do OpenFOAM."""
+    env = QProcessEnvironment.systemEnvironment()
+    foam_dir = f"/opt/{version}"
+    env.insert("FOAM_RUN", foam_dir)
+    env.insert("LD_LIBRARY_PATH", f"{foam_dir}/lib:{foam_dir}/platforms/linux64GccDPInt32Opt/lib")
+    return env
+
+
+class SimulationRunner(QObject):
+    """Processo iniciado pela interface (solver ou decomposePar): início, pausa, retomada e paradas.
+
+    Contraparte Qt do RunJob: usa o mesmo RunControl para a parada com checkpoint
+    (stopAt writeNow) e o checkpoint com pausa, e os mesmos helpers de árvore de processos.
+    A interface recebe a saída e as mensagens pelos sinais e continua dona do
+    monitoramento (parser, watchdog, gráficos); os eventos do log voltam por observe().
+    """
+
+    outputLine = pyqtSignal(str)
+    errorOutput = pyqtSignal(str)
+    message = pyqtSignal(str)
+    # Fim da parada com checkpoint: 'stopped' ou 'timeout' (o solver foi encerrado à força)
+    stopFinished = pyqtSignal(str)
+
+    def __init__(self, parent=None, stop_timeout=300):
+        super().__init__(parent)
+        self.stop_timeout = stop_timeout
+        self.process = None
+        self.control = None
+        self.stopTimer = None
+        self.checkpointTimer = None
+
+    def running(self):
+        # 'Starting' também conta: evita iniciar outro processo antes deste subir
+        return self.process is not None and self.process.state() != QProcess.NotRunning
+
+    def stopping(self):
+        """Parada com checkpoint em andamento (aguardando o solver escrever e encerrar)."""
+        return self.stopTimer is not None
+
+    def start(self, command, case_path, environment, finished=None):
+        """Executa 'bash -c command' no caso; finished(código, status) é chamado ao terminar.
+
+        O status é o registrado no histórico: 'Finished', 'Interrupted' ou 'Stopped (writeNow)'.
+        """
+        # Novo controle a cada execução: o status "Stopped (writeNow)" vale só para ela
+        self.control = RunControl(case_path, self.message.emit, stop_timeout=self.stop_timeout)
+        process = QProcess(self)
+        process.setProcessEnvironment(environment)
+        process.setWorkingDirectory(case_path)
+        process.readyReadStandardOutput.connect(lambda: self._readOutput(process))
+        process.readyReadStandardError.connect(
+            lambda: self.errorOutput.emit(str(process.readAllStandardError(), 'utf-8').strip()))
+        process.finished.connect(lambda code, *_: self._finished(process, code, finished))
+        self.process = process
+        process.start("bash", ["-c", command])
+
+    def _readOutput(self, process):
+        # Saída de um processo anterior não pode cair no monitoramento da execução atual
+        if process is not self.process:
+            return
+        while process.canReadLine():
+            self.outputLine.emit(str(process.readLine(), 'utf-8').strip())
+
+    def _finished(self, process, code, finished):
+        # O restante da saída é lido antes do registro da execução
+        self._readOutput(process)
+        if process is self.process and process.bytesAvailable():
+            self.outputLine.emit(str(process.readAllStandardOutput(), 'utf-8').strip())
+        # Um checkpoint pendente continua: check_checkpoint restaura o controlDict no prazo
+        status = "Finished" if code == 0 else "Interrupted"
+        if self.control is not None and self.control.stop_requested:
+            status = "Stopped (writeNow)"
+        if finished is not None:
+            finished(code, status)
+
+    def pause(self):
+        """Pausa o solver enviando SIGSTOP para todos os processos filhos."""
+        if not self.running():
+            self.message.emit("Nenhuma simulação em execução para pausar.")
+            return
+        pid = self.process.processId()
+        if not pid:
+            self.message.emit("Não foi possível obter o PID do processo para pausar.")
+            return
+        try:
+            suspend_tree(pid)
+            self.message.emit("Simulação pausada (todos os processos).")
+        except Exception as e:
+            self.message.emit(f"Erro ao pausar a simulação: {e}")
+
+    def resume(self):
+        """Retoma o solver pausado enviando SIGCONT para todos os processos filhos."""
+        if self.process is None:
+            self.message.emit("Nenhuma simulação para retomar.")
+            return
+        pid = self.process.processId()
+        if not pid:
+            self.message.emit("Não foi possível obter o PID do processo para retomar.")
+            return
+        try:
+            resume_tree(pid)
+            self.message.emit("Simulação retomada (todos os processos).")
+        except Exception as e:
+            self.message.emit(f"Erro ao retomar a simulação: {e}")
+
+    def request_stop(self):
+        """Parada com checkpoint: stopAt writeNow no controlDict (runTimeModifiable).
+
+        Aguarda o solver escrever o último tempo e encerrar; só recorre a SIGTERM/SIGKILL
+        (force_stop) se o tempo limite for atingido. O fim é avisado por stopFinished.
+        """
+        if not self.running():
+            self.message.emit("Nenhuma simulação em execução para parar.")
+            return
+        if self.stopTimer is not None:
+            self.message.emit("Parada já solicitada; aguardando o solver escrever o último tempo...")
+            return
+        import psutil
+        try:
+            if psutil.Process(self.process.processId()).status() == psutil.STATUS_STOPPED:
+                # O solver precisa estar rodando para ler o controlDict
+                self.resume()
+        except psutil.Error:
+            pass
+        if not self.control.request_stop():
+            self.force_stop()
+            return
+        self.stopTimer = QTimer(self)
+        self.stopTimer.timeout.connect(self._checkStop)
+        self.stopTimer.start(STOP_POLL_MS)
+
+    def _checkStop(self):
+        result = self.control.check_stop(self.running())
+        if result is None:
+            return
+        self.stopTimer.stop()
+        self.stopTimer = None
+        if result == "timeout":
+            self.force_stop()
+        else:
+            self.message.emit("Simulação parada com checkpoint. Use 'Resume from latestTime' para continuar.")
+        self.stopFinished.emit(result)
+
+    def force_stop(self):
+        """Encerra o processo e todos os filhos (SIGTERM, depois SIGKILL).
+
+        Espera o QProcess terminar, para que o fim da execução já tenha sido registrado
+        quando o método retorna (o reinício pode iniciar outra logo em seguida).
+        """
+        if not self.running():
+            self.message.emit("Nenhuma simulação em execução para parar.")
+            return
+        self.message.emit("Parando a simulação...")
+        try:
+            terminate_tree(self.process.processId())
+            self.message.emit("Simulação interrompida com sucesso.")
+        except Exception as e:
+            self.message.emit(f"Erro ao encerrar o processo: {e}")
+        self.process.waitForFinished(3000)
+
+    def shutdown(self):
+        """Encerra a árvore do processo ao fechar a interface."""
+        self._stopCheckpointTimer()
+        if self.stopTimer is not None:
+            self.stopTimer.stop()
+            self.stopTimer = None
+        if self.running():
+            terminate_tree(self.process.processId())
+            if not self.process.waitForFinished(3000):
+                self.process.kill()
+
+    def checkpoint_and_pause(self):
+        """Força a escrita de um tempo no próximo passo e pausa o solver assim que ela terminar."""
+        if self.checkpointTimer is not None or not self.running():
+            return
+        if not self.control.request_checkpoint():
+            self.pause()
+            return
+        self.checkpointTimer = QTimer(self)
+        self.checkpointTimer.timeout.connect(self._checkCheckpoint)
+        self.checkpointTimer.start(CHECKPOINT_POLL_MS)
+
+    def observe(self, events):
+        """Eventos do parser: com um checkpoint pendente, pausa logo que o log confirmar a escrita."""
+        if self.control is not None and self.control.observe(events) and self.checkpointTimer is not None:
+            self._checkCheckpoint()
+
+    def _checkCheckpoint(self):
+        if self.control.check_checkpoint(self.pause):
+            self._stopCheckpointTimer()
+
+    def _stopCheckpointTimer(self):
+        if self.checkpointTimer is not None:
+            self.checkpointTimer.stop()
+            self.checkpointTimer = None
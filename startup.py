@@ -0,0 +1,121 @@
+import builtins
+import sys
+import time
+
+PROFILE_FLAG = "--profile-startup"
+
+
+class LazyModule:
+    """Módulo importado só no primeiro acesso a um atributo (ex.: pyqtgraph, psutil).
+
+    Tira da abertura da interface o custo de bibliotecas usadas apenas depois que a
+    janela aparece.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            # Via __import__, para que a importação também apareça no --profile-startup
+            __import__(self._name)
+            self._module = sys.modules[self._name]
+        return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+
+class StartupProfile:
+    """Tempos da abertura da interface: importações, etapas do construtor e primeira pintura.
+
+    Desligado por padrão (as etapas não custam nada); ativado por --profile-startup.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.enabled = False
+        self.imports = []
+        self.phases = []
+        self.depth = 0
+        self._import_depth = 0
+        self._original_import = None
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.origin = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def enable_if_requested(self, argv):
+        if PROFILE_FLAG in argv:
+            self.enable()
+
+    def stop_imports(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Só as importações externas de módulos novos: o tempo inclui as dependências
+        if level or self._import_depth or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        self._import_depth += 1
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._import_depth -= 1
+            importer = (globals or {}).get("__name__", "LazyModule")
+            self.imports.append((name, importer, time.perf_counter() - start))
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def mark(self, name):
+        """Registra um instante (ex.: primeira pintura), medido desde o início."""
+        if self.enabled:
+            self.phases.append((name, time.perf_counter() - self.origin, None, self.depth))
+
+    def report(self, imports=12):
+        total_imports = sum(duration for _, _, duration in self.imports)
+        lines = ["", "=== Inicialização (--profile-startup) ===",
+                 f"Importações: {total_imports * 1000:8.1f} ms ({len(self.imports)} módulos)"]
+        for name, importer, duration in sorted(self.imports, key=lambda item: -item[2])[:imports]:
+            lines.append(f"    {name:<32} {duration * 1000:8.1f} ms   (em {importer})")
+        lines.append("Etapas (@ = instante desde o início da medição):")
+        for name, at, duration, depth in self.phases:
+            label = "  " * (depth + 1) + name
+            if duration is None:
+                lines.append(f"{label:<36} @ {at * 1000:8.1f} ms")
+            else:
+                lines.append(f"{label:<36} {duration * 1000:10.1f} ms")
+        return "\n".join(lines)
+
+
+class _Phase:
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+        self.index = None
+
+    def __enter__(self):
+        if self.profile.enabled:
+            self.index = len(self.profile.phases)
+            self.profile.phases.append(None)
+            self.profile.depth += 1
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.index is not None:
+            self.profile.depth -= 1
+            self.profile.phases[self.index] = (self.name, None, time.perf_counter() - self.start, self.profile.depth)
+        return False
+
+
+# Perfil único do processo: main.py e gafoam.py registram nele
+profile = StartupProfile()
@@ -0,0 +1,63 @@
+"""Solver sintético para testes sem OpenFOAM.
+
+Lê endTime/deltaT do system/controlDict do diretório atual e escreve na saída um
+log no formato do foamRun (Time, Courant, resíduos, ExecutionTime/ClockTime). O
+custo por passo segue um modelo simples de escalabilidade forte:
+
+    t(n) = t1 * (serial + (1 - serial) / n) + latência * log2(n)
+
+    python stub_solver.py --ranks 4 [--cells 200000] [--sleep 0.01]
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import foam_dict  # noqa: E402
+from decomposition_planner import mesh_cell_count  # noqa: E402
+
+
+def step_cost(cells, ranks, cost_per_cell=2e-6, serial=0.05, latency=0.004):
+    t1 = cells * cost_per_cell
+    return t1 * (serial + (1 - serial) / ranks) + latency * math.log2(ranks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ranks", type=int, default=1)
+    parser.add_argument("--cells", type=int, default=None)
+    parser.add_argument("--sleep", type=float, default=0.0, help="fração do custo simulado a esperar de fato")
+    args = parser.parse_args()
+
+    control = foam_dict.read(os.path.join("system", "controlDict"))
+    delta_t = float(control.get("deltaT", 0.001))
+    end_time = float(control.get("endTime", 100 * delta_t))
+    cells = args.cells or mesh_cell_count(".") or 200000
+    cost = step_cost(cells, args.ranks)
+
+    print(f"Stub solver: {cells} cells, {args.ranks} ranks")
+    print("Starting time loop\n")
+    execution = 0.0
+    steps = int(round(end_time / delta_t))
+    for step in range(1, steps + 1):
+        # Primeiro passo mais caro (inicialização), como no solver real
+        execution += cost * (3 if step == 1 else 1)
+        print("Courant Number mean: 0.01 max: 0.2")
+        print(f"deltaT = {delta_t:g}")
+        print(f"Time = {step * delta_t:.6g}s\n")
+        for field in ("Ux", "Uy"):
+            print(f"smoothSolver:  Solving for {field}, Initial residual = {1e-3 / step:.4g}, "
+                  f"Final residual = {1e-8:.4g}, No Iterations 2")
+        print(f"GAMG:  Solving for p, Initial residual = {1e-2 / step:.4g}, "
+              f"Final residual = {1e-7:.4g}, No Iterations 8")
+        print(f"ExecutionTime = {execution:.4f} s  ClockTime = {int(execution)} s\n")
+        if args.sleep:
+            time.sleep(cost * args.sleep)
+    print("End\n")
+
+
+if __name__ == "__main__":
+    main()
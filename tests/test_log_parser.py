@@ -0,0 +1,57 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_parser import FoamLogParser  # noqa: E402
+
+
+def test_cloud_block_ends_without_blank_line():
+    lines = [
+        "Time = 0.001",
+        "Cloud: cloud",
+        "    Current number of parcels       = 120",
+        "    Current mass in system          = 0.5",
+        "GAMG:  Solving for p, Initial residual = 0.01, Final residual = 1e-05, No Iterations 4",
+        "ExecutionTime = 1.2 s  ClockTime = 2 s",
+        "Time = 0.002",
+        "GAMG:  Solving for p, Initial residual = 0.005, Final residual = 1e-05, No Iterations 3",
+        "ExecutionTime = 2.4 s  ClockTime = 3 s",
+    ]
+    parser = FoamLogParser()
+    events = parser.feed_lines(lines)
+    types = [event["type"] for event in events]
+
+    assert types.count("time") == 2
+    assert types.count("residual") == 2
+    assert types.count("timing") == 2
+    clouds = [event for event in events if event["type"] == "cloud"]
+    assert len(clouds) == 1
+    assert clouds[0]["time"] == 0.001
+    assert clouds[0]["values"]["current_number_of_parcels"] == 120
+    assert parser.current_time == 0.002
+    assert len(parser.solverTable) == 2
+    assert len(parser.timingTable) == 2
+
+
+def test_escaped_mass_is_not_counted_twice():
+    lines = [
+        "Time = 0.001",
+        "Cloud: cloud",
+        "    Current number of parcels       = 10",
+        "    Parcel fate: system (number, mass)",
+        "      - escape                      = 1, 1e-05",
+        "    Parcel fate: patch outlet (number, mass)",
+        "      - escape                      = 1, 1e-05",
+        "",
+        "Time = 0.002",
+        "Cloud: cloud",
+        "    Parcel fate: patch outlet (number, mass)",
+        "      - escape                      = 1, 1e-05",
+        "    Parcel fate: patch top (number, mass)",
+        "      - escape                      = 2, 3e-05",
+        "",
+    ]
+    events = FoamLogParser().feed_lines(lines)
+    escaped = [event["values"]["mass_escaped_total"] for event in events if event["type"] == "cloud"]
+    assert escaped == [1e-05, 4e-05]
@@ -0,0 +1,56 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run_monitor import RunControl  # noqa: E402
+
+CONTROL_DICT = """FoamFile { format ascii; class dictionary; object controlDict; }
+writeControl    adjustableRunTime;
+writeInterval   0.1;
+runTimeModifiable yes;
+"""
+
+
+def _case(tmp_path, processors=0):
+    os.makedirs(tmp_path / "system")
+    (tmp_path / "system" / "controlDict").write_text(CONTROL_DICT)
+    for rank in range(processors):
+        os.makedirs(tmp_path / f"processor{rank}" / "0")
+    if not processors:
+        os.makedirs(tmp_path / "0")
+    return str(tmp_path)
+
+
+def test_serial_checkpoint_waits_for_the_log_to_confirm_the_write(tmp_path):
+    case = _case(tmp_path)
+    control = RunControl(case, note=lambda message: None)
+    paused = []
+    assert control.request_checkpoint()
+
+    # O diretório aparece no início da escrita: ainda não pausa
+    os.makedirs(tmp_path / "0.002")
+    control.observe([{"type": "time", "time": 0.002}])
+    assert not control.check_checkpoint(lambda: paused.append(True))
+
+    # ExecutionTime do mesmo tempo: a escrita terminou
+    assert control.observe([{"type": "timing", "time": 0.002, "execution_time": 1.0, "clock_time": 1.0}])
+    assert control.check_checkpoint(lambda: paused.append(True))
+    assert paused == [True]
+    assert "adjustableRunTime" in (tmp_path / "system" / "controlDict").read_text()
+
+
+def test_decomposed_checkpoint_needs_every_processor_and_a_later_residual(tmp_path):
+    case = _case(tmp_path, processors=2)
+    control = RunControl(case, note=lambda message: None)
+    paused = []
+    assert control.request_checkpoint()
+
+    os.makedirs(tmp_path / "processor0" / "0.002")
+    control.observe([{"type": "timing", "time": 0.002}, {"type": "time", "time": 0.003},
+                     {"type": "residual", "time": 0.003}])
+    assert not control.check_checkpoint(lambda: paused.append(True))
+
+    os.makedirs(tmp_path / "processor1" / "0.002")
+    assert control.check_checkpoint(lambda: paused.append(True))
+    assert paused == [True]
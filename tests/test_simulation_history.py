@@ -0,0 +1,30 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation_history import SimulationHistory  # noqa: E402
+
+
+def _add(history, case, start):
+    history.add_entry(solver="foamRun", case_path=case, start_time=start, end_time=start, status="Finished")
+
+
+def test_remove_and_clear_keep_entries_written_by_another_process(tmp_path):
+    path = str(tmp_path / "history.json")
+    gui = SimulationHistory(path)
+    _add(gui, "/case/a", "2026-01-01 10:00:00")
+    _add(gui, "/case/b", "2026-01-01 11:00:00")
+    shown = list(gui.get_history())
+
+    # O daemon acrescenta uma execução no início da lista depois que a interface a exibiu
+    daemon = SimulationHistory(path)
+    daemon.history.insert(0, {"case_path": "/case/c", "start_time": "2026-01-01 12:00:00"})
+    daemon.save_history()
+
+    assert gui.remove_entry(shown[1])
+    assert [entry["case_path"] for entry in SimulationHistory(path).get_history()] == ["/case/c", "/case/a"]
+    assert not gui.remove_entry(shown[1])
+
+    gui.clear(shown)
+    assert [entry["case_path"] for entry in SimulationHistory(path).get_history()] == ["/case/c"]
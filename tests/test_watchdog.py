@@ -0,0 +1,27 @@
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_parser import FoamLogParser  # noqa: E402
+from watchdog import Watchdog  # noqa: E402
+
+
+def test_non_finite_courant_and_delta_t_trip_nan_rule():
+    lines = [
+        "Courant Number mean: nan max: -nan",
+        "deltaT = inf",
+        "Time = 0.001",
+    ]
+    events = FoamLogParser().feed_lines(lines)
+    steps = [event for event in events if event["type"] == "timestep"]
+    assert len(steps) == 1
+    assert math.isnan(steps[0]["courant_mean"])
+    assert math.isnan(steps[0]["courant_max"])
+    assert math.isinf(steps[0]["deltaT"])
+
+    watchdog = Watchdog([{"name": "nan", "type": "nan", "action": "stop"}])
+    triggers = [trigger for event in events for trigger in watchdog.observe(event)]
+    assert [trigger["message"] for trigger in triggers] == ["Courant/deltaT não finito"]
+    assert triggers[0]["action"] == "stop"
@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+
+import foam_dict
+
+
+def read_time_step_controls(case_path):
+    """Lê adjustTimeStep, maxCo e maxDeltaT do controlDict do caso."""
+    control = foam_dict.read(os.path.join(case_path, "system", "controlDict"))
+    adjust = str(control.get("adjustTimeStep", "no")).lower() in ("yes", "on", "true", "1")
+    max_co = control.get("maxCo")
+    max_delta_t = control.get("maxDeltaT")
+    return {
+        "adjustTimeStep": adjust,
+        "maxCo": float(max_co) if isinstance(max_co, (int, float)) else None,
+        "maxDeltaT": float(max_delta_t) if isinstance(max_delta_t, (int, float)) else None,
+    }
+
+
+def classify_limits(delta_t, courant_max, max_co=None, max_delta_t=None, tolerance=0.05):
+    """Classifica cada passo pelo limite que definiu o deltaT: 'maxDeltaT', 'maxCo' ou 'other'.
+
+    O Courant impresso no log foi calculado com o deltaT anterior, por isso é
+    reescalado para o novo deltaT antes de ser comparado com maxCo.
+    """
+    delta_t = np.asarray(delta_t, dtype=float)
+    courant_max = np.asarray(courant_max, dtype=float)
+    previous = np.concatenate(([np.nan], delta_t[:-1])) if len(delta_t) else delta_t
+    with np.errstate(invalid="ignore", divide="ignore"):
+        courant_new = np.where(np.isfinite(previous) & (previous > 0),
+                               courant_max * delta_t / previous, courant_max)
+    limits = np.full(len(delta_t), "other", dtype=object)
+    if max_co:
+        limits[courant_new >= (1 - tolerance) * max_co] = "maxCo"
+    if max_delta_t:
+        limits[delta_t >= (1 - tolerance) * max_delta_t] = "maxDeltaT"
+    return limits
+
+
+def step_costs(clock_time):
+    """Custo de parede (s) de cada passo a partir do ClockTime acumulado."""
+    clock_time = np.asarray(clock_time, dtype=float)
+    if len(clock_time) < 2:
+        return clock_time.copy()
+    return np.diff(clock_time, prepend=0.0)
+
+
+def project_speedup(delta_t, limits, factor, max_delta_t=None, cost_per_step=None):
+    """Estima o ganho de aumentar maxCo por 'factor'.
+
+    Os passos limitados por maxCo têm o deltaT multiplicado por 'factor'
+    (respeitando maxDeltaT); os demais não mudam. O número de passos necessários
+    para cobrir o mesmo tempo simulado é proporcional a deltaT_atual/deltaT_novo.
+    """
+    delta_t = np.asarray(delta_t, dtype=float)
+    new_delta_t = np.where(limits == "maxCo", delta_t * factor, delta_t)
+    if max_delta_t:
+        new_delta_t = np.minimum(new_delta_t, np.maximum(delta_t, max_delta_t))
+    valid = np.isfinite(delta_t) & (delta_t > 0)
+    steps = int(valid.sum())
+    projected_steps = float(np.sum(delta_t[valid] / new_delta_t[valid]))
+    result = {
+        "factor": factor,
+        "steps": steps,
+        "projected_steps": projected_steps,
+        "speedup": steps / projected_steps if projected_steps > 0 else 1.0,
+    }
+    if cost_per_step is not None:
+        result["cost_per_step"] = cost_per_step
+        result["wall_time"] = steps * cost_per_step
+        result["projected_wall_time"] = projected_steps * cost_per_step
+    return result
+
+
+def delta_t_histogram(delta_t, bins=30):
+    """Histograma de deltaT com classes logarítmicas. Retorna (contagens, bordas)."""
+    delta_t = np.asarray(delta_t, dtype=float)
+    delta_t = delta_t[np.isfinite(delta_t) & (delta_t > 0)]
+    if not len(delta_t):
+        return np.array([]), np.array([])
+    low, high = delta_t.min(), delta_t.max()
+    if low == high:
+        edges = np.array([low * 0.9, high * 1.1])
+    else:
+        edges = np.logspace(np.log10(low), np.log10(high), bins + 1)
+    counts, edges = np.histogram(delta_t, bins=edges)
+    return counts, edges
+
+
+def time_step_report(store, controls, factor=1.5):
+    """Monta o relatório de eficiência do passo adaptativo a partir do MetricsStore."""
+    steps = store.table("timestep")
+    delta_t = steps.column("deltaT")
+    courant_max = steps.column("courant_max")
+    limits = classify_limits(delta_t, courant_max, controls.get("maxCo"), controls.get("maxDeltaT"))
+
+    timing = store.table("timing")
+    costs = step_costs(timing.column("clock_time"))
+    cost_per_step = float(np.mean(costs[1:])) if len(costs) > 1 else (float(costs[0]) if len(costs) else None)
+
+    counts = {name: int(np.sum(limits == name)) for name in ("maxCo", "maxDeltaT", "other")}
+    finite = delta_t[np.isfinite(delta_t)]
+    return {
+        "steps": len(delta_t),
+        "limits": counts,
+        "deltaT_min": float(finite.min()) if len(finite) else None,
+        "deltaT_max": float(finite.max()) if len(finite) else None,
+        "deltaT_mean": float(finite.mean()) if len(finite) else None,
+        "courant_max": float(np.nanmax(courant_max)) if len(courant_max) and np.isfinite(courant_max).any() else None,
+        "cost_per_step": cost_per_step,
+        "projection": project_speedup(delta_t, limits, factor, controls.get("maxDeltaT"), cost_per_step),
+    }
@@ -0,0 +1,133 @@
+import json
+import math
+import os
+import time as _time
+from datetime import datetime
+
+WATCHDOG_FILE = "watchdog.json"
+
+ACTIONS = ("notify", "checkpoint_pause", "stop")
+
+DEFAULT_RULES = [
+    {"name": "residual_high", "type": "residual_above", "field": "*", "threshold": 0.5, "steps": 20, "action": "notify"},
+    {"name": "nan", "type": "nan", "action": "stop"},
+    {"name": "deltaT_collapse", "type": "deltaT_below", "threshold": 1e-9, "action": "checkpoint_pause"},
+    {"name": "packing_limit", "type": "max_alpha_above", "threshold": 0.74, "action": "checkpoint_pause"},
+    {"name": "stall", "type": "stall", "minutes": 30, "action": "notify"},
+]
+
+
+def _non_finite(value):
+    return isinstance(value, float) and not math.isfinite(value)
+
+
+class Watchdog:
+    """Avalia regras sobre o fluxo de eventos do FoamLogParser.
+
+    Cada regra dispara no máximo uma vez por execução e gera um registro
+    ('trigger') com a ação a ser executada: 'notify', 'checkpoint_pause' ou 'stop'.
+    A execução da ação fica a cargo de quem controla o processo.
+    """
+
+    def __init__(self, rules=None, enabled=True):
+        self.rules = [dict(rule) for rule in (DEFAULT_RULES if rules is None else rules)]
+        self.enabled = enabled
+        self.reset()
+
+    @classmethod
+    def config_path(cls, case_path):
+        return os.path.join(case_path, WATCHDOG_FILE)
+
+    @classmethod
+    def load(cls, case_path):
+        """Carrega as regras de <caso>/watchdog.json (ou as regras padrão)."""
+        path = cls.config_path(case_path)
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                config = json.load(f)
+            return cls(config.get("rules", []), config.get("enabled", True))
+        return cls()
+
+    def save(self, case_path):
+        with open(self.config_path(case_path), "w") as f:
+            json.dump({"enabled": self.enabled, "rules": self.rules}, f, indent=4)
+
+    def reset(self):
+        self.triggers = []
+        self.fired = set()
+        self.counters = {}
+        self.last_time = None
+        self.last_progress = _time.monotonic()
+
+    def observe(self, event):
+        """Processa um evento do parser e retorna os novos disparos."""
+        if not self.enabled:
+            return []
+        if event["type"] == "time":
+            self.last_time = event["time"]
+            self.last_progress = _time.monotonic()
+        found = []
+        for rule in self.rules:
+            if rule["name"] in self.fired:
+                continue
+            message = self._check(rule, event)
+            if message:
+                found.append(self._fire(rule, message))
+        return found
+
+    def tick(self, now=None):
+        """Verificação periódica das regras que não dependem de eventos (sem progresso)."""
+        if not self.enabled:
+            return []
+        now = _time.monotonic() if now is None else now
+        found = []
+        for rule in self.rules:
+            if rule["type"] != "stall" or rule["name"] in self.fired:
+                continue
+            idle = (now - self.last_progress) / 60.0
+            if idle >= rule.get("minutes", 30):
+                found.append(self._fire(rule, f"nenhuma linha 'Time =' há {idle:.0f} min"))
+        return found
+
+    def _check(self, rule, event):
+        kind = rule["type"]
+        if kind == "residual_above" and event["type"] == "residual" and event["corrector"] == 0:
+            field = rule.get("field", "*")
+            if field not in ("*", event["field"]):
+                return None
+            key = (rule["name"], event["field"])
+            if event["initial"] > rule["threshold"]:
+                self.counters[key] = self.counters.get(key, 0) + 1
+            else:
+                self.counters[key] = 0
+            if self.counters[key] >= rule.get("steps", 1):
+                return (f"resíduo de {event['field']} acima de {rule['threshold']:g} "
+                        f"por {self.counters[key]} passos")
+        elif kind == "nan":
+            if event["type"] == "residual" and (_non_finite(event["initial"]) or _non_finite(event["final"])):
+                return f"resíduo não finito em {event['field']}"
+            if event["type"] == "timestep" and any(_non_finite(event.get(k)) for k in ("courant_max", "deltaT")):
+                return "Courant/deltaT não finito"
+            if event["type"] == "cloud" and any(_non_finite(v) for v in event["values"].values()):
+                return f"valor não finito na nuvem {event['cloud']}"
+        elif kind == "deltaT_below" and event["type"] == "timestep":
+            delta_t = event.get("deltaT")
+            if delta_t is not None and delta_t < rule["threshold"]:
+                return f"deltaT = {delta_t:.3g} abaixo do mínimo {rule['threshold']:g}"
+        elif kind == "max_alpha_above" and event["type"] == "cloud":
+            alpha = event["values"].get("max_cell_volume_fraction")
+            if alpha is not None and alpha > rule["threshold"]:
+                return f"max(cloud:alpha) = {alpha:.4g} acima de {rule['threshold']:g}"
+        return None
+
+    def _fire(self, rule, message):
+        self.fired.add(rule["name"])
+        trigger = {
+            "rule": rule["name"],
+            "action": rule.get("action", "notify") if rule.get("action") in ACTIONS else "notify",
+            "message": message,
+            "time": self.last_time,
+            "wall_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self.triggers.append(trigger)
+        return trigger